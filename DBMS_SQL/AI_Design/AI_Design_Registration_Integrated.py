@@ -9,13 +9,107 @@
 # -------------------------------------------------------------
 
 ## FastAPI 서버 (app.py)
+import os
+import sys
+from pathlib import Path
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
 import psycopg2
 
+from encode_batcher import EncodeBatcher
+from model_lifecycle import ModelManager, ModelNotReady
+
+# 상위 DBMS_SQL 폴더의 공용 디스크 임베딩 캐시 사용 (EMBEDDING_STORE_PATH 설정 시)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from embedding_store import open_default_store  # noqa: E402
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
 app = FastAPI()
-model = SentenceTransformer('all-MiniLM-L6-v2')
+embedding_store = open_default_store()
+
+# 동시 요청의 encode 를 모아서 한 번에 처리 (마이크로 배칭)
+#  ENCODE_MAX_BATCH   : 한 번에 묶을 최대 요청 수 (1이면 사실상 배칭 끔)
+#  ENCODE_MAX_WAIT_MS : 첫 요청 이후 같은 배치로 묶기 위해 기다리는 최대 시간(ms)
+ENCODE_MAX_BATCH = int(os.getenv("ENCODE_MAX_BATCH", "32"))
+ENCODE_MAX_WAIT_MS = float(os.getenv("ENCODE_MAX_WAIT_MS", "5"))
+batcher = None
+EMBED_DIM = None
+
+# 모델 로딩 (import 시점에 로드하지 않음 → 포트를 먼저 열고 /healthz, /readyz 로 상태 보고)
+#  MODEL_LOAD=background : 서버 시작 직후 백그라운드에서 로드 + 워밍업 (기본값)
+#  MODEL_LOAD=lazy       : 첫 요청(또는 첫 /readyz)에서 로드 시작
+#  MODEL_LOAD=eager      : 서버 시작 훅에서 로드가 끝난 뒤 포트를 엶 (기존 방식과 같은 시작 순서)
+#  MODEL_WARMUP_ENCODES  : 로드 직후 더미 encode 횟수 (첫 추론 비용을 요청 전에 지불)
+#  MODEL_READY_TIMEOUT   : 준비 전 들어온 요청이 기다리는 최대 시간(초), 초과 시 503
+MODEL_LOAD = os.getenv("MODEL_LOAD", "background")
+MODEL_WARMUP_ENCODES = int(os.getenv("MODEL_WARMUP_ENCODES", "3"))
+MODEL_READY_TIMEOUT = float(os.getenv("MODEL_READY_TIMEOUT", "30"))
+
+# 모델 서버 모드 (uvicorn --workers N 에서 모델을 1벌만 메모리에, model_server.py)
+#  MODEL_SERVER_ADDRESS : 비어 있으면 워커가 직접 모델 로드 (기본값),
+#                         설정하면 그 주소의 모델 서버에 encode 요청 (예: /tmp/design-model.sock)
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "")
+
+def start_batcher(model):
+    """모델 준비 직후 1회 (워밍업이 끝난 모델로 배칭 스레드 시작)"""
+    global batcher, EMBED_DIM
+    EMBED_DIM = model.get_sentence_embedding_dimension()
+    batcher = EncodeBatcher(model, max_batch_size=ENCODE_MAX_BATCH, max_wait_ms=ENCODE_MAX_WAIT_MS)
+
+def load_model():
+    if MODEL_SERVER_ADDRESS:
+        from model_server import MODEL_SERVER_AUTHKEY, MODEL_SERVER_MAX_TEXTS, ModelClient, parse_address
+        return ModelClient(parse_address(MODEL_SERVER_ADDRESS), MODEL_SERVER_AUTHKEY,
+                           max_texts=MODEL_SERVER_MAX_TEXTS, connect_timeout=MODEL_READY_TIMEOUT)
+    # sentence_transformers(torch) import 자체도 수 초 걸리므로 로드할 때 import
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+model_manager = ModelManager(load_model, warmup_encodes=MODEL_WARMUP_ENCODES, on_ready=start_batcher)
+
+@app.on_event("startup")
+def start_model():
+    if MODEL_LOAD == "eager":
+        model_manager.load()
+    elif MODEL_LOAD == "background":
+        model_manager.start()
+
+@app.on_event("shutdown")
+def stop_batcher():
+    if batcher is not None:
+        batcher.close()
+        print(f"[SHUTDOWN] encode 배칭 통계: {batcher.stats()}")
+
+def encode_description(text: str):
+    """디스크 캐시에 있으면 그대로, 없으면 배칭 encode 후 캐시에 저장"""
+    if embedding_store is None:
+        return batcher.encode(text)
+    return embedding_store.get_or_compute(
+        MODEL_NAME, [text], EMBED_DIM, lambda texts: [batcher.encode(texts[0])]
+    )[0]
+
+def ensure_model_ready():
+    """모델이 준비될 때까지 최대 MODEL_READY_TIMEOUT 초 대기, 준비 안 되면 503"""
+    try:
+        model_manager.wait(MODEL_READY_TIMEOUT)
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+@app.get("/healthz")
+def healthz():
+    """프로세스 생존 확인 (모델 상태와 무관하게 200)"""
+    return {"status": "ok", "model": model_manager.state}
+
+@app.get("/readyz")
+def readyz():
+    """요청 처리 가능 여부 (모델 로드 + 워밍업 완료 시 200, 아니면 503)"""
+    if MODEL_LOAD == "lazy":
+        model_manager.start()
+    status = model_manager.status()
+    return JSONResponse(status_code=200 if model_manager.ready else 503, content=status)
 
 def get_db_conn():
     return psycopg2.connect(
@@ -28,10 +122,11 @@ class DesignInput(BaseModel):
 
 @app.post("/register_design")
 def register_design(data: DesignInput):
+    ensure_model_ready()
     conn = get_db_conn()
     cur = conn.cursor()
     try:
-        embedding = model.encode(data.description).tolist()
+        embedding = encode_description(data.description).tolist()
         cur.execute("BEGIN;")
         cur.execute("""
             INSERT INTO design (title, description, embedding)
@@ -0,0 +1,126 @@
+# -------------------------------------------------------------
+# 작성목적 : SentenceTransformer 인퍼런스 동적 마이크로 배칭
+#
+# 동시에 들어온 encode 요청을 최대 max_wait_ms 동안(또는 max_batch_size 개가 찰 때까지)
+# 모아서 model.encode 를 한 번만 호출하고, 결과를 기다리던 요청들에게 나눠 줍니다.
+#  - 요청 1건 = forward 1번(batch 1) 대신, 여러 건 = forward 1번(batch N) → CPU 처리량 증가
+#  - 요청이 하나뿐이면 최대 max_wait_ms 만큼만 더 기다린 뒤 바로 처리
+#
+# 사용:
+#   batcher = EncodeBatcher(model, max_batch_size=32, max_wait_ms=5)
+#   vec = batcher.encode("설명 문장")   # 여러 스레드에서 동시에 호출 가능
+#   vecs = batcher.encode_many(["문장1", "문장2"])  # 여러 건을 한 번에 맡기고 모두 기다림
+#   batcher.close()
+# -------------------------------------------------------------
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_STOP = object()  # 배칭 스레드 종료 신호
+
+
+class EncodeBatcher:
+    def __init__(self, model, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        # 통계 (모니터링/로그용)
+        self.batches = 0
+        self.items = 0
+
+        # 닫힘 확인과 큐 넣기를 한 번에 (close 가 _STOP 을 넣은 뒤에는 요청이 큐에 들어가지 않도록)
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="encode-batcher", daemon=True)
+        self._thread.start()
+
+    # -----------------------------
+    # 요청 스레드에서 호출
+    # -----------------------------
+    def submit(self, text: str) -> Future:
+        fut: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("EncodeBatcher is closed")
+            self._queue.put((text, fut))
+        return fut
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """text 1개를 임베딩 (배치가 처리될 때까지 기다렸다가 자기 결과만 받아감)"""
+        return self.submit(text).result(timeout=timeout)
+
+    def encode_many(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        """texts 를 모두 큐에 넣고 결과를 (len(texts), dim) 행렬로 반환 (다른 요청과 같은 배치로 묶일 수 있음)"""
+        futures = [self.submit(text) for text in texts]
+        return np.stack([fut.result(timeout=timeout) for fut in futures])
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """대기 중인 요청까지 처리한 뒤 배칭 스레드 종료 (이후 submit 은 RuntimeError)"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+    # -----------------------------
+    # 배칭 스레드
+    # -----------------------------
+    def _collect(self, first) -> Tuple[List, bool]:
+        """첫 요청을 받은 시점부터 max_wait 동안 / max_batch_size 개까지 모으기"""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.model.encode(texts, batch_size=len(texts))
+            except Exception as e:  # 배치가 실패하면 그 배치의 모든 요청에 같은 오류 전달
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, fut), vec in zip(batch, vectors):
+                fut.set_result(vec)
+
+        # 종료 후에 들어온 요청은 기다리지 않도록 바로 실패 처리
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("EncodeBatcher is closed"))
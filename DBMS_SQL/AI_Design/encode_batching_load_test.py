@@ -0,0 +1,72 @@
+# -------------------------------------------------------------
+# 작성목적 : encode 마이크로 배칭 부하 테스트
+#
+# 같은 SentenceTransformer 모델로
+#   [direct]  요청마다 model.encode(text)        (기존: batch 1 forward)
+#   [batched] EncodeBatcher.encode(text)        (신규: 동시 요청을 모아 batch N forward)
+# 를 동시 요청 수(스레드 수)별로 실행해 처리량(req/s)과 지연시간(p50/p99)을 비교합니다.
+# DB 연결은 필요 없습니다.
+#
+# 실행:
+#   python encode_batching_load_test.py
+# 환경변수:
+#   LOAD_REQUESTS=2000          -> 설정별 총 요청 수
+#   LOAD_CONCURRENCY=1,8,32,64  -> 동시 요청 수 목록
+#   ENCODE_MAX_BATCH=32, ENCODE_MAX_WAIT_MS=5
+# -------------------------------------------------------------
+
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sentence_transformers import SentenceTransformer
+
+from encode_batcher import EncodeBatcher
+
+LOAD_REQUESTS = int(os.getenv("LOAD_REQUESTS", "2000"))
+LOAD_CONCURRENCY = [int(x) for x in os.getenv("LOAD_CONCURRENCY", "1,8,32,64").split(",")]
+ENCODE_MAX_BATCH = int(os.getenv("ENCODE_MAX_BATCH", "32"))
+ENCODE_MAX_WAIT_MS = float(os.getenv("ENCODE_MAX_WAIT_MS", "5"))
+
+TEXTS = [f"모듈러 구조를 활용한 {i}번 설계안입니다. 빠른 시공과 유지보수를 고려했습니다." for i in range(LOAD_REQUESTS)]
+
+
+def run(encode_one, concurrency: int) -> dict:
+    def timed(text):
+        t0 = time.perf_counter()
+        encode_one(text)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        latencies = sorted(ex.map(timed, TEXTS))
+    elapsed = time.perf_counter() - t0
+    return {
+        "rps": len(TEXTS) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model.encode(TEXTS[:32])  # 첫 호출 워밍업은 측정에서 제외
+
+    print("=" * 78)
+    print(f"요청 {LOAD_REQUESTS}건, max_batch={ENCODE_MAX_BATCH}, max_wait={ENCODE_MAX_WAIT_MS}ms")
+    print(f"{'동시요청':>8} | {'direct req/s':>12} {'p99 ms':>8} | {'batched req/s':>13} {'p99 ms':>8} {'평균배치':>8} | {'배율':>6}")
+    print("-" * 78)
+    for concurrency in LOAD_CONCURRENCY:
+        direct = run(model.encode, concurrency)
+
+        batcher = EncodeBatcher(model, max_batch_size=ENCODE_MAX_BATCH, max_wait_ms=ENCODE_MAX_WAIT_MS)
+        try:
+            batched = run(batcher.encode, concurrency)
+            avg_batch = batcher.stats()["avg_batch_size"]
+        finally:
+            batcher.close()
+
+        print(f"{concurrency:>8} | {direct['rps']:>12.1f} {direct['p99_ms']:>8.1f} | "
+              f"{batched['rps']:>13.1f} {batched['p99_ms']:>8.1f} {avg_batch:>8.1f} | "
+              f"{batched['rps'] / direct['rps']:>5.2f}x")
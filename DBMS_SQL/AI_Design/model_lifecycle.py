@@ -0,0 +1,148 @@
+# -------------------------------------------------------------
+# 작성목적 : SentenceTransformer 모델 로딩/워밍업 수명주기 관리
+#
+# 모델을 import 시점에 만들지 않고, 서버가 포트를 연 뒤 백그라운드(또는 첫 사용 시)에 로드합니다.
+#  - 상태: not_loaded → loading → warming → ready  (실패 시 failed)
+#  - 워밍업: 로드 직후 더미 문장으로 encode 를 몇 번 실행 → 첫 실제 요청이 첫 추론 비용을 내지 않음
+#  - wait(): 준비될 때까지 기다렸다가 모델 반환 (시작 전이면 로드 시작 = lazy)
+#  - status(): /healthz, /readyz 응답용 상태와 소요 시간(로드, 워밍업, 첫/마지막 encode)
+#
+# 사용:
+#   manager = ModelManager(lambda: SentenceTransformer(MODEL_NAME), warmup_encodes=3, on_ready=start_batcher)
+#   manager.start()          # 백그라운드 로드 (바로 반환)
+#   model = manager.wait(30) # 준비될 때까지 최대 30초 대기
+#   manager.status()
+# -------------------------------------------------------------
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+WARMUP_TEXT = "모듈러 구조를 활용한 설계안입니다. 빠른 시공과 유지보수를 고려했습니다."
+
+
+class ModelNotReady(Exception):
+    """wait() 시간 안에 모델이 준비되지 않았거나 로드에 실패함"""
+
+
+class ModelManager:
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        warmup_encodes: int = 3,
+        on_ready: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        loader:         모델 객체를 만들어 반환 (예: lambda: SentenceTransformer(name))
+        warmup_encodes: 로드 직후 실행할 더미 encode 횟수 (0이면 워밍업 안 함)
+        on_ready:       준비 직전에 모델을 받아 1회 호출 (예: 배칭 스레드 시작), 실패하면 failed
+        """
+        self.loader = loader
+        self.warmup_encodes = max(0, int(warmup_encodes))
+        self.on_ready = on_ready
+
+        self.model = None
+        self.state = NOT_LOADED
+        self.error: Optional[str] = None
+
+        # 소요 시간 (생성 시점 기준, 초/ms)
+        self._created = time.perf_counter()
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.first_encode_ms: Optional[float] = None
+        self.last_warmup_encode_ms: Optional[float] = None
+        self.ready_after_seconds: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._started = False
+        self._done = threading.Event()
+
+    # -----------------------------
+    # 로드 시작 / 대기
+    # -----------------------------
+    def _claim(self) -> bool:
+        """로드를 맡을 스레드 1개만 True (이미 다른 곳에서 시작했으면 False)"""
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+            self.state = LOADING
+            return True
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 로드 + 워밍업 시작 (이미 시작했으면 아무것도 안 함)"""
+        if self._claim():
+            threading.Thread(target=self._load, name="model-loader", daemon=True).start()
+
+    def load(self) -> None:
+        """현재 스레드에서 로드 + 워밍업 (eager 모드는 startup 훅에서 직접 호출), 이미 시작했으면 끝날 때까지 대기"""
+        if self._claim():
+            self._load()
+        else:
+            self._done.wait()
+
+    def _load(self) -> None:
+        try:
+            t0 = time.perf_counter()
+            model = self.loader()
+            self.load_seconds = time.perf_counter() - t0
+
+            self.state = WARMING
+            t0 = time.perf_counter()
+            for i in range(self.warmup_encodes):
+                t1 = time.perf_counter()
+                model.encode([f"{WARMUP_TEXT} {i}"])
+                elapsed_ms = (time.perf_counter() - t1) * 1000
+                if self.first_encode_ms is None:
+                    self.first_encode_ms = elapsed_ms
+                self.last_warmup_encode_ms = elapsed_ms
+            self.warmup_seconds = time.perf_counter() - t0
+
+            if self.on_ready is not None:
+                self.on_ready(model)
+            self.model = model
+            self.state = READY
+            self.ready_after_seconds = time.perf_counter() - self._created
+            print(f"[MODEL] 준비 완료 (로드 {self.load_seconds:.2f}s, 워밍업 {self.warmup_encodes}회 "
+                  f"{self.warmup_seconds:.2f}s, 생성 후 {self.ready_after_seconds:.2f}s)")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.state = FAILED
+            print(f"[MODEL] 로드 실패: {self.error}")
+        finally:
+            self._done.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        """준비된 모델 반환 (아직 시작 전이면 로드 시작), 시간 초과/실패 시 ModelNotReady"""
+        if not self._done.is_set():
+            self.start()
+            if not self._done.wait(timeout):
+                raise ModelNotReady(f"모델 준비 중입니다. (state={self.state})")
+        if self.state != READY:
+            raise ModelNotReady(f"모델 로드 실패: {self.error}")
+        return self.model
+
+    # -----------------------------
+    # 상태 조회
+    # -----------------------------
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "warmup_encodes": self.warmup_encodes,
+            "warmup_seconds": self.warmup_seconds,
+            "first_encode_ms": self.first_encode_ms,
+            "last_warmup_encode_ms": self.last_warmup_encode_ms,
+            "ready_after_seconds": self.ready_after_seconds,
+        }
@@ -0,0 +1,234 @@
+# -------------------------------------------------------------
+# 작성목적 : 여러 uvicorn 워커가 함께 쓰는 모델 서버 프로세스 (SentenceTransformer 1벌만 메모리에)
+#
+# uvicorn --workers N 으로 띄우면 워커마다 모델 가중치를 따로 올려 메모리가 N배가 됩니다.
+# 이 모드에서는
+#  - 모델 서버 프로세스 1개만 모델을 로드하고 (python model_server.py)
+#  - API 워커는 ModelClient 로 로컬 IPC(multiprocessing.connection, Unix 소켓 또는 TCP)로 encode 요청
+#  - 결과 벡터는 연결마다 만든 공유 메모리(multiprocessing.shared_memory)에 써서 전달 (소켓으로는 개수만)
+#  - 서버는 EncodeBatcher 로 여러 워커의 요청을 한 배치로 묶어 encode
+#
+# 실행:
+#   python model_server.py                                              # 모델 서버
+#   MODEL_SERVER_ADDRESS=/tmp/design-model.sock uvicorn AI_Design_Registration_Integrated:app --workers 4
+# 환경변수:
+#   MODEL_SERVER_ADDRESS=/tmp/design-model.sock -> Unix 소켓 경로 또는 host:port
+#   MODEL_SERVER_AUTHKEY=design-model           -> 연결 인증 키 (서버/워커 같은 값)
+#   MODEL_SERVER_MAX_TEXTS=64                   -> 요청 1번에 보낼 최대 문장 수 (공유 메모리 크기 = 이 값 x 차원 x 4바이트)
+#   ENCODE_MAX_BATCH=32, ENCODE_MAX_WAIT_MS=5   -> 서버 쪽 배칭 (encode_batcher.py)
+#
+# 사용 (워커 쪽, SentenceTransformer 대신):
+#   model = ModelClient("/tmp/design-model.sock", b"design-model")
+#   vecs = model.encode(["문장1", "문장2"])
+# -------------------------------------------------------------
+
+import os
+import signal
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from encode_batcher import EncodeBatcher
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "/tmp/design-model.sock")
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "design-model").encode()
+MODEL_SERVER_MAX_TEXTS = int(os.getenv("MODEL_SERVER_MAX_TEXTS", "64"))
+ENCODE_MAX_BATCH = int(os.getenv("ENCODE_MAX_BATCH", "32"))
+ENCODE_MAX_WAIT_MS = float(os.getenv("ENCODE_MAX_WAIT_MS", "5"))
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(text: str) -> Address:
+    """'/tmp/x.sock' → Unix 소켓 경로, 'host:port' → TCP 주소"""
+    if "/" not in text and ":" in text:
+        host, port = text.rsplit(":", 1)
+        return host, int(port)
+    return text
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """다른 프로세스가 만든 공유 메모리에 붙기 (정리는 만든 쪽=서버가 담당)"""
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Python 3.12 이하는 붙기만 해도 resource_tracker 에 등록되어, 이 프로세스가 끝날 때 서버의
+    # 공유 메모리를 unlink 해 버림 → 붙은 직후 이 프로세스의 등록만 해제
+    shm = SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+# -----------------------------
+# 1) 서버 (모델 소유)
+# -----------------------------
+class ModelServer:
+    def __init__(self, model, address: Address, authkey: bytes,
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.dim = model.get_sentence_embedding_dimension()
+        self.batcher = EncodeBatcher(model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.listener = Listener(address, authkey=authkey)
+
+    def serve_forever(self) -> None:
+        """연결마다 스레드 1개 (워커 1개 = 연결 1개)"""
+        while True:
+            conn = self.listener.accept()
+            threading.Thread(target=self._handle, args=(conn,), name="model-client", daemon=True).start()
+
+    def close(self) -> None:
+        self.listener.close()  # Unix 소켓이면 소켓 파일도 삭제
+        self.batcher.close()
+
+    def _handle(self, conn) -> None:
+        shm: Optional[SharedMemory] = None
+        try:
+            # 1) 인사: 클라이언트가 요청당 최대 문장 수를 알려주면 그만큼 공유 메모리 생성
+            kind, max_texts = conn.recv()
+            if kind != "hello":
+                return
+            max_texts = max(1, int(max_texts))
+            shm = SharedMemory(create=True, size=max_texts * self.dim * 4)
+            out = np.ndarray((max_texts, self.dim), dtype=np.float32, buffer=shm.buf)
+            conn.send(("hello", self.dim, shm.name, max_texts))
+
+            # 2) encode 요청 처리: 결과는 공유 메모리에, 소켓으로는 개수만
+            while True:
+                kind, texts = conn.recv()
+                if kind != "encode":
+                    conn.send(("error", f"unknown request: {kind}"))
+                    continue
+                if len(texts) > max_texts:
+                    conn.send(("error", f"too many texts: {len(texts)} > {max_texts}"))
+                    continue
+                try:
+                    if texts:
+                        out[:len(texts)] = self.batcher.encode_many(texts)
+                    conn.send(("ok", len(texts)))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+        except (EOFError, OSError):
+            pass  # 워커 종료/연결 끊김
+        finally:
+            conn.close()
+            if shm is not None:
+                del out
+                shm.close()
+                shm.unlink()
+
+
+# -----------------------------
+# 2) 클라이언트 (API 워커에서 SentenceTransformer 대신 사용)
+# -----------------------------
+class ModelClient:
+    """encode / get_sentence_embedding_dimension 만 SentenceTransformer 와 같게 제공"""
+
+    def __init__(self, address: Address, authkey: bytes, max_texts: int = 64, connect_timeout: float = 60.0):
+        self.address = address
+        self.authkey = authkey
+        self.max_texts = max(1, int(max_texts))
+        self.connect_timeout = connect_timeout
+
+        self._lock = threading.Lock()  # 연결 1개 = 요청 1개씩 (공유 메모리를 응답마다 덮어씀)
+        self._conn = None
+        self._shm: Optional[SharedMemory] = None
+        self.dim = 0
+        self._connect()
+
+    def _connect(self) -> None:
+        """서버가 아직 안 떠 있으면 connect_timeout 동안 재시도"""
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                conn = Client(self.address, authkey=self.authkey)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+        conn.send(("hello", self.max_texts))
+        _, self.dim, shm_name, self.max_texts = conn.recv()
+        self._conn = conn
+        self._shm = attach_shared_memory(shm_name)
+        self._out = np.ndarray((self.max_texts, self.dim), dtype=np.float32, buffer=self._shm.buf)
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._shm is not None:
+            del self._out
+            self._shm.close()
+            self._shm = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _encode_chunk(self, texts: Sequence[str]) -> np.ndarray:
+        self._conn.send(("encode", list(texts)))
+        kind, value = self._conn.recv()
+        if kind != "ok":
+            raise RuntimeError(f"model server: {value}")
+        return self._out[:value].copy()  # 다음 요청이 덮어쓰므로 복사
+
+    def encode(self, texts, batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        chunks = []
+        with self._lock:
+            for i in range(0, len(items), self.max_texts):
+                chunk = items[i:i + self.max_texts]
+                try:
+                    chunks.append(self._encode_chunk(chunk))
+                except (EOFError, OSError):
+                    # 모델 서버 재시작 등으로 연결이 끊기면 1번 다시 연결해서 재시도
+                    self._disconnect()
+                    self._connect()
+                    chunks.append(self._encode_chunk(chunk))
+        vectors = np.concatenate(chunks) if chunks else np.zeros((0, self.dim), np.float32)
+        return vectors[0] if single else vectors
+
+
+# -----------------------------
+# 3) 서버 실행
+# -----------------------------
+def main() -> None:
+    from sentence_transformers import SentenceTransformer
+
+    address = parse_address(MODEL_SERVER_ADDRESS)
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)  # 이전 실행이 남긴 소켓 파일
+
+    t0 = time.perf_counter()
+    model = SentenceTransformer(MODEL_NAME)
+    model.encode(["워밍업"])
+    server = ModelServer(model, address, MODEL_SERVER_AUTHKEY,
+                         max_batch_size=ENCODE_MAX_BATCH, max_wait_ms=ENCODE_MAX_WAIT_MS)
+    print(f"[MODEL SERVER] {MODEL_NAME} 로드 {time.perf_counter() - t0:.2f}s, {MODEL_SERVER_ADDRESS} 에서 대기")
+
+    # SIGTERM 도 Ctrl+C 처럼 정리 후 종료
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        print(f"[MODEL SERVER] 종료 (배칭 통계: {server.batcher.stats()})")
+
+
+if __name__ == "__main__":
+    main()
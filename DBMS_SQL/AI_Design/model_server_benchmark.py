@@ -0,0 +1,137 @@
+# -------------------------------------------------------------
+# 작성목적 : 워커별 모델 로드 vs 모델 서버 공유 — 메모리와 처리량 비교
+#
+# 워커 수(1, 2, 4, 8)마다 두 방식으로 워커 프로세스를 띄우고 (uvicorn 워커처럼 spawn)
+#   [per-worker] 워커마다 SentenceTransformer 로드 + EncodeBatcher
+#   [shared]     모델 서버 프로세스 1개(model_server.ModelServer) + 워커마다 ModelClient + EncodeBatcher
+# 모든 워커가 준비된 뒤 동시에 encode 요청을 보내
+#   메모리 : 전체 프로세스의 RSS 합계 / PSS 합계(공유 페이지를 나눠 계산, /proc/<pid>/smaps_rollup)
+#   처리량 : 전체 요청 수 / 걸린 시간 (req/s)
+# 을 출력합니다. DB 연결은 필요 없습니다.
+#
+# 실행:
+#   python model_server_benchmark.py
+# 환경변수:
+#   BENCH_WORKERS=1,2,4,8       -> 워커 수 목록
+#   BENCH_REQUESTS=400          -> 워커 1개당 요청 수
+#   BENCH_THREADS=8             -> 워커 1개당 동시 요청 스레드 수
+# -------------------------------------------------------------
+
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from encode_batcher import EncodeBatcher
+from model_server import MODEL_NAME, ModelClient, ModelServer
+
+BENCH_WORKERS = [int(x) for x in os.getenv("BENCH_WORKERS", "1,2,4,8").split(",")]
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", "400"))
+BENCH_THREADS = int(os.getenv("BENCH_THREADS", "8"))
+AUTHKEY = b"model-server-benchmark"
+
+
+def memory_kb(pid: int) -> tuple:
+    """(RSS, PSS) kB — PSS 는 여러 프로세스가 공유하는 페이지를 나눠서 계산"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0])
+    return values.get("Rss", 0), values.get("Pss", 0)
+
+
+def load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+
+# -----------------------------
+# 1) 프로세스 본문 (spawn 이므로 최상위 함수)
+# -----------------------------
+def server_main(address, ready):
+    model = load_model()
+    model.encode(["워밍업"])
+    server = ModelServer(model, address, AUTHKEY)
+    ready.set()
+    try:
+        server.serve_forever()
+    except OSError:
+        pass  # 종료 시 listener 닫힘
+
+
+def worker_main(mode, address, index, ready_q, start, done, result_q):
+    model = load_model() if mode == "per-worker" else ModelClient(address, AUTHKEY)
+    batcher = EncodeBatcher(model)
+    batcher.encode("워밍업")
+    ready_q.put(os.getpid())
+    start.wait()
+
+    texts = [f"워커 {index} 의 {i}번 설계안: 모듈러 구조와 유지보수를 고려했습니다." for i in range(BENCH_REQUESTS)]
+    with ThreadPoolExecutor(max_workers=BENCH_THREADS) as ex:
+        list(ex.map(batcher.encode, texts))
+    result_q.put(time.perf_counter())
+    done.wait()  # 부모가 메모리를 잴 때까지 살아 있기
+    batcher.close()
+
+
+# -----------------------------
+# 2) 측정
+# -----------------------------
+def run(mode: str, workers: int) -> dict:
+    ctx = mp.get_context("spawn")
+    address = os.path.join(tempfile.mkdtemp(), "model.sock")
+    server = None
+    if mode == "shared":
+        ready = ctx.Event()
+        server = ctx.Process(target=server_main, args=(address, ready), daemon=True)
+        server.start()
+        ready.wait()
+
+    ready_q, result_q = ctx.Queue(), ctx.Queue()
+    start, done = ctx.Event(), ctx.Event()
+    procs = [ctx.Process(target=worker_main, args=(mode, address, i, ready_q, start, done, result_q), daemon=True)
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+    pids = [ready_q.get() for _ in procs]
+
+    t0 = time.perf_counter()
+    start.set()
+    ends = [result_q.get() for _ in procs]
+    elapsed = max(ends) - t0
+
+    # 모든 워커가 요청을 마친 상태의 메모리 (서버 포함)
+    all_pids = pids + ([server.pid] if server is not None else [])
+    rss, pss = (sum(v) for v in zip(*(memory_kb(pid) for pid in all_pids)))
+
+    done.set()
+    for p in procs:
+        p.join()
+    if server is not None:
+        server.terminate()
+        server.join()
+    return {
+        "rss_mb": rss / 1024,
+        "pss_mb": pss / 1024,
+        "rps": workers * BENCH_REQUESTS / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    results = {}
+    for workers in BENCH_WORKERS:
+        for mode in ("per-worker", "shared"):
+            r = results[(mode, workers)] = run(mode, workers)
+            print(f"[{mode}] 워커 {workers}: RSS {r['rss_mb']:.0f} MB, PSS {r['pss_mb']:.0f} MB, {r['rps']:.0f} req/s")
+
+    print("=" * 92)
+    print(f"워커당 요청 {BENCH_REQUESTS}건 / 동시 스레드 {BENCH_THREADS}개 (shared 는 모델 서버 프로세스 포함)")
+    print(f"{'워커':>4} | {'per-worker PSS MB':>17} {'req/s':>8} | {'shared PSS MB':>13} {'req/s':>8} | {'메모리 절감':>10}")
+    print("-" * 92)
+    for workers in BENCH_WORKERS:
+        a, b = results[("per-worker", workers)], results[("shared", workers)]
+        print(f"{workers:>4} | {a['pss_mb']:>17.0f} {a['rps']:>8.0f} | {b['pss_mb']:>13.0f} {b['rps']:>8.0f} | "
+              f"{a['pss_mb'] / b['pss_mb']:>9.2f}x")
@@ -0,0 +1,100 @@
+# -------------------------------------------------------------
+# 작성목적 : 서버 시작 ~ 요청 처리 가능까지 걸리는 시간 측정 (모델 로딩 방식별)
+#
+# AI_Design_Registration_Integrated:app 을 uvicorn 으로 띄우고, 프로세스 시작 시점부터
+#   포트 응답 : /healthz 가 처음 응답한 시간 (로드밸런서/헬스체크가 프로세스를 볼 수 있는 시점)
+#   준비 완료 : /readyz 가 처음 200 을 준 시간 (모델 로드 + 워밍업 완료)
+# 을 잰 뒤, /readyz 본문의 로드/워밍업 시간과 첫 encode(cold)/워밍업 후 encode 시간을 함께 출력합니다.
+#
+#   [before] MODEL_LOAD=eager, 워밍업 0회 : 모델 로드가 끝나야 포트를 엶 (기존 import 시점 로드와 같은 순서),
+#            첫 실제 요청이 첫 추론(cold) 비용을 냄
+#   [after]  MODEL_LOAD=background        : 포트를 먼저 열고 백그라운드에서 로드 + 워밍업
+# DB 연결은 필요 없습니다. (/register_design 은 호출하지 않음)
+#
+# 실행:
+#   python startup_timing.py
+# 환경변수:
+#   STARTUP_RUNS=3        -> 설정별 반복 횟수 (중앙값 출력)
+#   STARTUP_PORT=8766     -> 측정용 서버 포트
+#   MODEL_WARMUP_ENCODES=3 -> [after] 워밍업 횟수
+# -------------------------------------------------------------
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+STARTUP_RUNS = int(os.getenv("STARTUP_RUNS", "3"))
+STARTUP_PORT = int(os.getenv("STARTUP_PORT", "8766"))
+MODEL_WARMUP_ENCODES = os.getenv("MODEL_WARMUP_ENCODES", "3")
+
+BASE_URL = f"http://127.0.0.1:{STARTUP_PORT}"
+TIMEOUT_SECONDS = 300
+
+CONFIGS = [
+    ("before: eager, 워밍업 0", {"MODEL_LOAD": "eager", "MODEL_WARMUP_ENCODES": "0"}),
+    ("after: background", {"MODEL_LOAD": "background", "MODEL_WARMUP_ENCODES": MODEL_WARMUP_ENCODES}),
+]
+
+
+def poll(path: str, t0: float, ok_status=None) -> tuple:
+    """path 가 응답할 때까지(ok_status 지정 시 그 상태코드일 때까지) 10ms 간격으로 호출"""
+    while time.perf_counter() - t0 < TIMEOUT_SECONDS:
+        try:
+            resp = requests.get(BASE_URL + path, timeout=1)
+            if ok_status is None or resp.status_code == ok_status:
+                return time.perf_counter() - t0, resp
+        except requests.RequestException:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{path} 가 {TIMEOUT_SECONDS}초 안에 응답하지 않았습니다.")
+
+
+def measure_once(env_overrides: dict) -> dict:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "AI_Design_Registration_Integrated:app",
+         "--port", str(STARTUP_PORT), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, **env_overrides},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        port_s, _ = poll("/healthz", t0)
+        ready_s, resp = poll("/readyz", t0, ok_status=200)
+        return {"port_s": port_s, "ready_s": ready_s, **resp.json()}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def median(runs: list, key: str):
+    values = [r[key] for r in runs if r.get(key) is not None]
+    return statistics.median(values) if values else None
+
+
+def fmt(value, unit: str) -> str:
+    return "-" if value is None else f"{value:.2f}{unit}" if unit == "s" else f"{value:.1f}{unit}"
+
+
+if __name__ == "__main__":
+    results = {}
+    for name, env in CONFIGS:
+        runs = [measure_once(env) for _ in range(STARTUP_RUNS)]
+        results[name] = runs
+        print(f"[{name}] 포트 응답 {[round(r['port_s'], 2) for r in runs]}s, "
+              f"준비 완료 {[round(r['ready_s'], 2) for r in runs]}s")
+
+    print("=" * 96)
+    print(f"프로세스 시작 기준, {STARTUP_RUNS}회 중앙값")
+    print(f"{'설정':<26} {'포트 응답':>9} {'준비 완료':>9} {'모델 로드':>9} {'워밍업':>8} "
+          f"{'첫 encode':>10} {'워밍업 후':>10}")
+    print("-" * 96)
+    for name, runs in results.items():
+        print(f"{name:<26} {fmt(median(runs, 'port_s'), 's'):>9} {fmt(median(runs, 'ready_s'), 's'):>9} "
+              f"{fmt(median(runs, 'load_seconds'), 's'):>9} {fmt(median(runs, 'warmup_seconds'), 's'):>8} "
+              f"{fmt(median(runs, 'first_encode_ms'), 'ms'):>10} {fmt(median(runs, 'last_warmup_encode_ms'), 'ms'):>10}")
+    print("(before 는 워밍업이 없으므로 첫 encode(cold) 비용을 첫 실제 요청이 냄)")
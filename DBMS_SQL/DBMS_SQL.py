@@ -2,8 +2,40 @@
 CSV의 title/description/embedding을 읽어,
 PostgreSQL(pgvector) 테이블에 트랜잭션으로 안전 저장.
 
-- 라이브러리: psycopg(=psycopg3), pandas, python-dotenv
+- 라이브러리: psycopg(=psycopg3), pandas, numpy, python-dotenv
 - pgvector 확장 필요: CREATE EXTENSION IF NOT EXISTS vector;
+- 적재 방식(LOAD_METHOD 환경변수 또는 load_method 인자):
+    insert      -> 행마다 INSERT (기본값), 벡터는 pgvector 바이너리 파라미터로 전송
+    copy_text   -> COPY ... FROM STDIN (텍스트 포맷), 벡터는 '[...]' 문자열
+                   (텍스트 COPY 는 모든 값을 글자로 보내는 형식이라 바이너리를 섞을 수 없음 → 비교/호환용)
+    copy_binary -> COPY ... FROM STDIN (FORMAT BINARY), 벡터를 pgvector 바이너리로 전송
+  어떤 방식이든 하나의 트랜잭션이므로 실패 시 전체 ROLLBACK 됩니다.
+- 스트리밍 모드(IMPORT_CHUNKSIZE 환경변수 또는 chunksize 인자):
+    CSV를 chunksize 행씩 나눠 읽고 바로 DB로 흘려보냅니다.
+    파일 전체를 메모리에 올리지 않으므로 파일 크기와 상관없이 메모리 사용량이 일정합니다.
+- 인덱스 지연 생성(IMPORT_DEFER_INDEXES=1 또는 defer_indexes 인자):
+    대상 테이블에 이미 있는 인덱스(HNSW 벡터 인덱스, title 등, PK/UNIQUE/제약조건용 제외)를 적재 전에 지우고,
+    적재가 끝나면 maintenance_work_mem / 병렬 작업자 수를 올려 한 번에 다시 만든 뒤 ANALYZE 합니다.
+    (행마다 HNSW 그래프를 고치는 것보다 마지막에 한 번 만드는 편이 훨씬 빠름)
+    삭제 → 적재 → 재생성이 같은 트랜잭션이라 실패하면 인덱스도 그대로 돌아옵니다.
+    대신 DROP INDEX 가 테이블에 ACCESS EXCLUSIVE 잠금을 잡고 COMMIT(또는 ROLLBACK)까지 놓지 않으므로,
+    적재와 재생성이 끝날 때까지 다른 세션의 모든 조회(SELECT 포함)/쓰기가 기다립니다.
+    → 서비스 중인 테이블에는 쓰지 말고, 점검 시간이나 새 테이블에 처음 채울 때만 사용하세요.
+    IMPORT_MAINTENANCE_WORK_MEM=1GB, IMPORT_PARALLEL_WORKERS=4 (max_parallel_maintenance_workers)
+    단계별 소요 시간(인덱스 삭제/적재/인덱스별 재생성/ANALYZE)을 출력합니다.
+- 임베딩 저장 형식(EMBEDDING_STORAGE=vector|halfvec, embedding_storage.py):
+    새로 만드는 테이블의 embedding 컬럼 타입. halfvec(float16)이면 테이블/HNSW 인덱스가 약 절반 (pgvector 0.7.0 이상)
+    COPY 바이너리는 이미 있는 테이블의 컬럼 타입(vector/halfvec)에 맞춰 전송합니다.
+- Parquet / Arrow IPC 입력(arrow_input.py, pyarrow 필요):
+    파일 확장자가 .parquet / .arrow / .feather / .ipc / .arrows 이면 CSV 대신 메모리 맵으로 배치 단위로 읽습니다.
+    embedding 은 fixed_size_list<float32> 컬럼 → 문자열 파싱 없이 배치 행렬 그대로 적재 (copy_binary 권장)
+    스트리밍 모드의 청크 = 배치 행 수, 기존 CSV 는 python arrow_input.py a.csv a.parquet 로 변환
+- 병렬 적재: 여러 프로세스가 파티션을 나눠 파싱/임베딩/적재하는 버전은 parallel_import.py
+- 이어서 하기: 배치마다 SAVEPOINT/COMMIT + 체크포인트 파일 + 불량 행 격리 CSV 버전은 resumable_import.py
+- 중복 판정 해시(content_hash): 어떤 적재 방식이든 행마다 design_sql.content_hash(title, description) 를 함께 저장
+    → API(Fast_API.py, DEDUP_ENABLED=1)가 적재된 행도 같은 내용으로 찾아 기존 id 를 돌려줌
+    테이블에 content_hash 유니크 인덱스가 있으면(API 중복 방지 사용 중) 이미 있는 내용이나 파일 안의 반복 행은
+    유니크 위반으로 적재 전체가 ROLLBACK 됩니다 (resumable_import.py 는 그 행만 격리)
 
 작성자 주석: 비전공자도 읽기 쉽게 쉬운 표현으로 설명되어 있습니다.
 """
@@ -11,13 +43,22 @@ PostgreSQL(pgvector) 테이블에 트랜잭션으로 안전 저장.
 import os
 import ast
 import math
-from typing import List, Optional
+import time
+import warnings
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import psycopg
 from psycopg.rows import tuple_row
 from dotenv import load_dotenv
 
+from design_sql import row_hash
+from dummy_embedding import embedding_cache_stats, generate_embedding_from_text
+from embedding_storage import EMBEDDING_STORAGE, check_support, column_storage, column_type, vector_param
+from pgvector_adapter import register_vector_binary, to_float32, to_sql_vector
+
 # -----------------------------
 # 0) 환경 변수 로드 (.env에 DB 정보 저장해두면 편리)
 # -----------------------------
@@ -31,20 +72,31 @@ PGPASSWORD = os.getenv("PGPASSWORD", "0530")
 
 CSV_PATH = "sample_designs_500.csv"  # 파일명이 다르면 수정하세요.
 
+# 적재 방식: insert / copy_text / copy_binary
+LOAD_METHOD = os.getenv("LOAD_METHOD", "insert")
+LOAD_METHODS = ("insert", "copy_text", "copy_binary")
+
+# 스트리밍 모드: 한 번에 읽을 행 수 (0이면 파일 전체를 한 번에 읽음)
+IMPORT_CHUNKSIZE = int(os.getenv("IMPORT_CHUNKSIZE", "0"))
+
+# 인덱스 지연 생성: 적재 전에 인덱스를 지우고 적재 후 한 번에 재생성 + ANALYZE
+IMPORT_DEFER_INDEXES = os.getenv("IMPORT_DEFER_INDEXES", "0") == "1"
+IMPORT_MAINTENANCE_WORK_MEM = os.getenv("IMPORT_MAINTENANCE_WORK_MEM", "1GB")
+IMPORT_PARALLEL_WORKERS = int(os.getenv("IMPORT_PARALLEL_WORKERS", "4"))
+
+# Parquet / Arrow IPC 입력 확장자 (arrow_input.ARROW_FORMATS 와 같음)
+ARROW_SUFFIXES = (".parquet", ".arrow", ".feather", ".ipc", ".arrows")
+
+# CSV에 임베딩이 없을 때 사용할 기본 차원 (OpenAI small=1536, ada-002=1536 등)
+DEFAULT_EMBEDDING_DIM = 1536
+
 # -----------------------------
 # 1) 임베딩 생성기 (대체 가능)
 # -----------------------------
-def generate_embedding_from_text(text: str, dim: int = 1536) -> List[float]:
-    """
-    실제 서비스에선 OpenAI/HuggingFace 사용.
-    여기선 예시로 "텍스트 길이를 시드로 한 의사난수 벡터"를 생성합니다.
-    - 항상 같은 입력 텍스트 → 같은 벡터가 나오도록 간단히 고정(seed 느낌)
-    """
-    # 아주 단순한 해시 → 0~1 사이 값으로 변환
-    base = sum(ord(c) for c in (text or ""))
-    # 의사난수 생성: sin 함수를 이용해 0~1 사이 값 만들기 (학습용 예시)
-    vec = [((math.sin(base * (i + 1)) + 1) / 2.0) for i in range(dim)]
-    return vec
+# generate_embedding_from_text(text, dim): 텍스트를 시드로 한 의사난수 벡터(float32)
+# - 항상 같은 입력 텍스트 → 같은 벡터 (numpy로 한 번에 계산, 같은 설명은 LRU 캐시에서 재사용)
+# - 구현은 Fast_API.py 와 함께 쓰는 dummy_embedding.py 에 있습니다.
+# - 캐시 적중률은 import 가 끝날 때 로그로 출력됩니다.
 
 # (참고) OpenAI 사용 예시(주석)
 # from openai import OpenAI
@@ -76,103 +128,381 @@ def parse_embedding_field(value) -> Optional[List[float]]:
     return None
 
 
+def _strip_brackets(text: str) -> str:
+    body = text.strip()
+    if body[:1] in "[(" and body[-1:] in "])":
+        body = body[1:-1]
+    return body.strip()
+
+
+def _parse_floats(body: str) -> Optional[np.ndarray]:
+    """'0.1, 0.2, ...' → float32 배열. 숫자가 아닌 글자가 섞여 있으면 None."""
+    with warnings.catch_warnings():
+        # 숫자가 아닌 부분을 만나면 numpy 버전에 따라 경고 또는 ValueError → 둘 다 실패로 처리
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(body, dtype=np.float32, sep=",")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def parse_embedding_column(values, dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    embedding 컬럼 전체('[0.1, 0.2, ...]' 문자열들)를 한 번에 float32 행렬로 바꿉니다.
+    - 반환: (행렬 (n, dim), 유효 여부 마스크 (n,))
+    - 비어있음/NaN/파싱 불가 → 마스크 False (parse_embedding_field 가 None 을 주는 경우와 동일)
+      값 안에 nan/inf 가 있는 행도 False (numpy 는 'nan' 글자를 숫자로 읽지만 literal_eval 은 실패하므로)
+    - dim 을 주지 않으면 첫 번째 유효한 값의 길이를 사용, 길이가 다른 행이 있으면 ValueError
+    행마다 ast.literal_eval + float() 를 하지 않고, 모든 행을 이어 붙여 numpy 로 한 번에 파싱합니다.
+    """
+    values = list(values)
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+
+    # 1) 문자열/리스트인 행만 골라 "숫자, 숫자, ..." 본문을 준비
+    idx, bodies, lists = [], [], {}
+    for i, v in enumerate(values):
+        if isinstance(v, (list, np.ndarray)):
+            lists[i] = np.asarray(v, dtype=np.float32)
+        elif isinstance(v, str) and v.strip():
+            body = _strip_brackets(v)
+            if body:
+                idx.append(i)
+                bodies.append(body)
+
+    if dim is None:
+        if bodies:
+            dim = bodies[0].count(",") + 1
+        elif lists:
+            dim = len(next(iter(lists.values())))
+        else:
+            dim = 0
+    matrix = np.zeros((n, dim), dtype=np.float32)
+
+    # 2) 빠른 경로: 모든 행의 쉼표 수가 같으면 통째로 이어 붙여 1번에 파싱
+    fast = None
+    if bodies and all(b.count(",") + 1 == dim for b in bodies):
+        fast = _parse_floats(",".join(bodies))
+        if fast is not None and fast.size != len(bodies) * dim:
+            fast = None
+    if fast is not None:
+        matrix[idx] = fast.reshape(len(bodies), dim)
+        mask[idx] = True
+    else:
+        # 3) 느린 경로: 이상한 행이 섞여 있으면 행 단위로 파싱해서 골라냄
+        for i, body in zip(idx, bodies):
+            arr = _parse_floats(body)
+            if arr is None:
+                continue
+            lists[i] = arr
+
+    for i, arr in lists.items():
+        if arr.shape != (dim,):
+            raise ValueError(f"{i}번째 행의 embedding 길이가 {len(arr)} 입니다. (기대값: {dim})")
+        matrix[i] = arr
+        mask[i] = True
+
+    # nan/inf 가 섞인 행은 DB 가 거부하므로 파싱 실패와 같이 처리 (description 으로 새로 생성)
+    mask &= np.isfinite(matrix).all(axis=1)
+    return matrix, mask
+
+
 # -----------------------------
 # 3) pgvector 입력 포맷으로 변환
 # -----------------------------
-def to_sql_vector(values: List[float]) -> str:
-    """
-    pgvector는 '[1,2,3]' 같은 문자열을 ::vector 로 캐스팅해 넣을 수 있습니다.
-    psycopg가 자동 어댑터를 제공하긴 하지만, 환경에 따라 문자열로 넘기는 편이 안전합니다.
-    """
-    return "[" + ",".join(f"{x:.6f}" for x in values) + "]"
+# 텍스트('[1,2,3]'::vector) / 바이너리(float32 그대로) 변환은
+# Fast_API.py 등과 함께 쓰는 pgvector_adapter.py 에 모여 있습니다.
 
 
 # -----------------------------
 # 4) 테이블 생성 (없으면)
 # -----------------------------
-def ensure_table(conn, dim: int):
+def connect_db():
+    """autocommit=False 연결 (우리가 직접 commit/rollback)"""
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE, user=PGUSER, password=PGPASSWORD,
+        row_factory=tuple_row, autocommit=False
+    )
+
+
+def ensure_table(conn, dim: int, table: str = "design", storage: str = EMBEDDING_STORAGE):
     """
-    design 테이블이 없으면 생성합니다.
-    - embedding 컬럼은 vector(dim) 타입
+    design 테이블(table)이 없으면 생성합니다. (Fast_API.py 가 만드는 테이블과 같은 컬럼)
+    - embedding 컬럼은 vector(dim) 타입 (storage="halfvec" 이면 halfvec(dim))
+    - 예전에 만든 테이블에 content_hash 컬럼이 없으면 추가 (NULL 컬럼 추가라 테이블을 다시 쓰지 않음)
     """
     create_sql = f"""
-    CREATE TABLE IF NOT EXISTS design (
+    CREATE TABLE IF NOT EXISTS {table} (
         id          BIGSERIAL PRIMARY KEY,
         title       TEXT,
         description TEXT,
-        embedding   VECTOR({dim})
+        content_hash BYTEA,
+        embedding   {column_type(dim, storage)}
     );
     """
     with conn.cursor() as cur:
         # pgvector 확장 보장
         cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        check_support(conn, storage, bq=False)
         cur.execute(create_sql)
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash BYTEA;")
 
 
 # -----------------------------
-# 5) 메인 로직: CSV → DB (트랜잭션)
+# 5) 적재 방식별 함수 (INSERT / COPY 텍스트 / COPY 바이너리)
 # -----------------------------
-def import_csv_with_transaction(csv_path: str):
-    # 5-1) CSV 읽기
-    df = pd.read_csv(csv_path)
+def iter_design_rows(df: pd.DataFrame, dim: int) -> Iterator[Tuple[Optional[str], Optional[str], List[float]]]:
+    """
+    DataFrame의 각 행을 (title, description, 임베딩) 으로 하나씩 넘겨줍니다.
+    - embedding 컬럼은 parse_embedding_column 으로 청크 전체를 한 번에 파싱
+    """
+    n = len(df)
+    titles = df["title"].tolist() if "title" in df else [None] * n
+    descs = df["description"].tolist() if "description" in df else [None] * n
+
+    # 1) CSV에 embedding이 있으면 사용
+    if "embedding" in df:
+        matrix, mask = parse_embedding_column(df["embedding"], dim)
+    else:
+        matrix, mask = None, np.zeros(n, dtype=bool)
+
+    for i in range(n):
+        # 2) 없으면 description으로부터 새로 생성(예시 함수)
+        if mask[i]:
+            emb_vec = matrix[i]
+        else:
+            emb_vec = generate_embedding_from_text(descs[i] or "", dim=dim)
+
+        yield titles[i], descs[i], emb_vec
+
+
+def load_rows_insert(cur, rows: Iterable[Tuple[Optional[str], Optional[str], List[float]]],
+                     table: str = "design") -> int:
+    """기존 방식: 행마다 INSERT 1번 (벡터는 numpy 배열 그대로 바이너리 파라미터로)"""
+    register_vector_binary(cur)
+    # 벡터는 vector 로 전송 → 컬럼 타입(vector / halfvec)으로 명시적 캐스팅
+    insert_sql = f"""
+    INSERT INTO {table} (title, description, content_hash, embedding)
+    VALUES (%s, %s, %s, {vector_param(column_storage(cur, table))})
+    """
+    count = 0
+    for title, desc, emb_vec in rows:
+        # float32 배열 → pgvector 바이너리, 파라미터 바인딩으로 안전하게 INSERT
+        cur.execute(insert_sql, (title, desc, row_hash(title, desc), to_float32(emb_vec)))
+        count += 1
+    return count
+
 
-    # 5-2) 첫 행을 기준으로 임베딩 차원(d) 자동 감지
-    first_emb: Optional[List[float]] = None
+def load_rows_copy_text(cur, rows: Iterable[Tuple[Optional[str], Optional[str], List[float]]],
+                        table: str = "design") -> int:
+    """
+    COPY 텍스트 포맷: 서버와 한 번의 스트림으로 모든 행을 전송
+    텍스트 COPY 는 행 전체가 글자이므로 벡터도 '[...]' 문자열 (바이너리로 보내려면 copy_binary)
+    """
+    count = 0
+    with cur.copy(f"COPY {table} (title, description, content_hash, embedding) FROM STDIN") as copy:
+        for title, desc, emb_vec in rows:
+            copy.write_row((title, desc, row_hash(title, desc), to_sql_vector(emb_vec)))
+            count += 1
+    return count
+
+
+def load_rows_copy_binary(cur, rows: Iterable[Tuple[Optional[str], Optional[str], List[float]]],
+                          table: str = "design") -> int:
+    """COPY 바이너리 포맷: 벡터를 문자열로 바꾸지 않고 float32(halfvec 컬럼이면 float16) 그대로 전송"""
+    register_vector_binary(cur)
+    storage = column_storage(cur, table)
+    count = 0
+    with cur.copy(f"COPY {table} (title, description, content_hash, embedding) FROM STDIN (FORMAT BINARY)") as copy:
+        copy.set_types(["text", "text", "bytea", storage])
+        for title, desc, emb_vec in rows:
+            copy.write_row((title, desc, row_hash(title, desc), emb_vec))
+            count += 1
+    return count
+
+
+LOADERS = {
+    "insert": load_rows_insert,
+    "copy_text": load_rows_copy_text,
+    "copy_binary": load_rows_copy_binary,
+}
+
+
+# -----------------------------
+# 6) CSV 읽기 (한 번에 / 청크 단위 스트리밍, Parquet / Arrow 는 arrow_input.py)
+# -----------------------------
+def iter_csv_chunks(csv_path: str, chunksize: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    chunksize가 0이면 파일 전체를 DataFrame 1개로,
+    아니면 chunksize 행씩 잘라 DataFrame을 하나씩 넘겨줍니다(제너레이터).
+    """
+    if not chunksize:
+        yield pd.read_csv(csv_path)
+        return
+    with pd.read_csv(csv_path, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def is_arrow_input(path: str) -> bool:
+    """Parquet / Arrow IPC 파일인지 (확장자 기준, arrow_input.py 로 읽음)"""
+    return os.path.splitext(path)[1].lower() in ARROW_SUFFIXES
+
+
+def detect_embedding_dim(df: pd.DataFrame) -> Optional[int]:
+    """
+    DataFrame에서 처음으로 파싱되는 embedding의 길이(차원)를 돌려줍니다.
+    임베딩이 하나도 없으면 None.
+    """
     for v in df.get("embedding", []):
         first_emb = parse_embedding_field(v)
         if first_emb:
-            break
-
-    # 임베딩이 CSV에 없거나 비어 있으면, description로부터 새로 만들 계획
-    if first_emb is None:
-        # 실제 임베딩 모델 차원에 맞춰 지정 (OpenAI small=1536, ada-002=1536 등)
-        detected_dim = 1536
-    else:
-        detected_dim = len(first_emb)
+            return len(first_emb)
+    return None
 
-    print(f"[INFO] 감지된 임베딩 차원: {detected_dim}")
 
-    # 5-3) DB 연결
-    conn = psycopg.connect(
-        host=PGHOST, port=PGPORT, dbname=PGDATABASE, user=PGUSER, password=PGPASSWORD,
-        row_factory=tuple_row, autocommit=False  # autocommit=False → 우리가 직접 commit/rollback
+# -----------------------------
+# 7) 인덱스 지연 생성 (대량 적재용)
+# -----------------------------
+def list_deferrable_indexes(cur, table: str = "design") -> List[Tuple[str, str, str]]:
+    """
+    적재 동안 지워도 되는 인덱스 목록: (이름, 접근 방식(hnsw/ivfflat/btree ...), CREATE INDEX 문)
+    - PRIMARY KEY / UNIQUE 제약조건이 쓰는 인덱스는 제외 (제약조건과 함께 지워야 하므로 그대로 둠)
+    - 제약조건 없이 만든 UNIQUE 인덱스(content_hash 등)도 제외: 지운 채 적재하면 중복 행이 들어가
+      재생성이 실패하고, 그동안 ON CONFLICT 중복 방지도 동작하지 않음
+    - 큰 인덱스(HNSW 등)부터
+    """
+    cur.execute(
+        """
+        SELECT c.relname, am.amname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE i.indrelid = to_regclass(%s)
+          AND NOT i.indisprimary
+          AND NOT i.indisunique
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid)
+        ORDER BY pg_relation_size(i.indexrelid) DESC, c.relname;
+        """,
+        (table,),
     )
+    return cur.fetchall()
 
-    try:
-        # 5-4) 스키마 보장
-        ensure_table(conn, detected_dim)
 
-        # 5-5) 하나의 트랜잭션으로 전체 배치를 처리
-        with conn.cursor() as cur:
-            insert_sql = """
-            INSERT INTO design (title, description, embedding)
-            VALUES (%s, %s, %s::vector)
-            """
+def drop_indexes(cur, indexes: List[Tuple[str, str, str]]) -> None:
+    for name, _, _ in indexes:
+        cur.execute(f'DROP INDEX "{name}";')
 
-            # DataFrame의 각 행을 순회하면서 INSERT 준비
-            for idx, row in df.iterrows():
-                title = row.get("title", None)
-                desc = row.get("description", None)
 
-                # 1) CSV에 embedding이 있으면 사용
-                emb_vec = parse_embedding_field(row.get("embedding", None))
+def rebuild_indexes(cur, indexes: List[Tuple[str, str, str]],
+                    maintenance_work_mem: str = IMPORT_MAINTENANCE_WORK_MEM,
+                    parallel_workers: int = IMPORT_PARALLEL_WORKERS) -> List[Tuple[str, float]]:
+    """
+    지웠던 인덱스를 원래 정의(pg_get_indexdef) 그대로 다시 생성, (이름, 소요 초) 목록 반환
+    - SET LOCAL: 이 트랜잭션 안에서만 maintenance_work_mem / 병렬 작업자 수를 올림
+      (HNSW 는 그래프가 maintenance_work_mem 안에 들어가야 빠르게 만들어짐,
+       병렬 생성은 btree 와 pgvector 0.7+ 의 HNSW/IVFFlat 에서 사용)
+    """
+    cur.execute("SELECT set_config('maintenance_work_mem', %s, true);", (maintenance_work_mem,))
+    cur.execute("SELECT set_config('max_parallel_maintenance_workers', %s, true);", (str(int(parallel_workers)),))
+    timings = []
+    for name, _, definition in indexes:
+        t0 = time.perf_counter()
+        cur.execute(definition)
+        timings.append((name, time.perf_counter() - t0))
+    return timings
+
+
+def analyze_table(conn, table: str = "design") -> float:
+    t0 = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(f"ANALYZE {table};")
+    conn.commit()
+    return time.perf_counter() - t0
 
-                # 2) 없으면 description으로부터 새로 생성(예시 함수)
-                if emb_vec is None:
-                    emb_vec = generate_embedding_from_text(desc or "", dim=detected_dim)
 
-                # 3) 문자열 포맷으로 변환하여 ::vector 캐스팅
-                emb_sql = to_sql_vector(emb_vec)
+# -----------------------------
+# 8) 메인 로직: CSV(또는 Parquet / Arrow) → DB (트랜잭션)
+# -----------------------------
+def import_csv_with_transaction(csv_path: str, load_method: str = LOAD_METHOD, chunksize: int = IMPORT_CHUNKSIZE,
+                                table: str = "design", defer_indexes: bool = IMPORT_DEFER_INDEXES):
+    if load_method not in LOADERS:
+        raise ValueError(f"load_method는 {LOAD_METHODS} 중 하나여야 합니다: {load_method!r}")
+
+    if is_arrow_input(csv_path):
+        # 8-1) Parquet / Arrow 읽기: 차원은 스키마(fixed_size_list 길이)에서, 배치는 메모리 맵에서 하나씩
+        from arrow_input import iter_batch_rows, open_arrow_input  # pyarrow 는 이 형식일 때만 필요
+
+        arrow_dim, chunks = open_arrow_input(csv_path, chunksize)
+        detected_dim = arrow_dim or DEFAULT_EMBEDDING_DIM
+        to_rows = iter_batch_rows
+        mode = f"{os.path.splitext(csv_path)[1]} 배치({chunksize or '파일 기본'}행씩)"
+    else:
+        # 8-1) CSV 읽기 (스트리밍 모드면 첫 번째 비어있지 않은 청크만 먼저 읽음)
+        chunks = iter_csv_chunks(csv_path, chunksize)
+        first_chunk = next((c for c in chunks if not c.empty), pd.DataFrame())
+
+        # 8-2) 첫 (청크의) 임베딩을 기준으로 차원(d) 자동 감지
+        #      임베딩이 CSV에 없거나 비어 있으면, description로부터 새로 만들 계획
+        detected_dim = detect_embedding_dim(first_chunk) or DEFAULT_EMBEDDING_DIM
+
+        chunks = chain([first_chunk], chunks)
+        first_chunk = None  # 참조를 chunks에만 남겨서, 다 쓴 청크는 바로 해제되도록
+        to_rows = iter_design_rows
+        mode = f"스트리밍({chunksize}행씩)" if chunksize else "전체 읽기"
 
-                # 4) 파라미터 바인딩으로 안전하게 INSERT
-                cur.execute(insert_sql, (title, desc, emb_sql))
+    print(f"[INFO] 감지된 임베딩 차원: {detected_dim}, 적재 방식: {load_method}, {mode}")
 
-        # 5-6) 모두 성공했다면 COMMIT
+    # 8-3) DB 연결
+    conn = connect_db()  # autocommit=False → 우리가 직접 commit/rollback
+
+    try:
+        # 8-4) 스키마 보장
+        ensure_table(conn, detected_dim, table)
+
+        # 8-5) 하나의 트랜잭션으로 전체 배치를 처리 (COPY 도중 실패해도 아래에서 전체 ROLLBACK)
+        #      청크를 다 쓰면 바로 버리므로, 메모리에는 항상 청크 1개만 남습니다.
+        #      인덱스 지연 생성이면 적재 전에 인덱스를 지우고, 적재 후 같은 트랜잭션에서 다시 만듦
+        timings = {}
+        loaded = 0
+        with conn.cursor() as cur:
+            deferred = list_deferrable_indexes(cur, table) if defer_indexes else []
+            if deferred:
+                t0 = time.perf_counter()
+                drop_indexes(cur, deferred)
+                timings["drop_indexes"] = time.perf_counter() - t0
+                print(f"[INFO] 인덱스 지연 생성: {', '.join(f'{n}({am})' for n, am, _ in deferred)} 삭제 후 적재")
+
+            t0 = time.perf_counter()
+            for chunk in chunks:
+                loaded += LOADERS[load_method](cur, to_rows(chunk, detected_dim), table)
+                if chunksize:
+                    print(f"[INFO] 누적 {loaded}행 전송")
+            timings["load"] = time.perf_counter() - t0
+
+            if deferred:
+                t0 = time.perf_counter()
+                timings["rebuild_indexes"] = dict(rebuild_indexes(cur, deferred))
+                timings["rebuild_total"] = time.perf_counter() - t0
+
+        # 8-6) 모두 성공했다면 COMMIT (+ 인덱스 지연 생성이면 통계 갱신)
         conn.commit()
-        print("[SUCCESS] 전체 COMMIT 완료 (모든 데이터 저장됨)")
+        print(f"[SUCCESS] 전체 COMMIT 완료 (모든 데이터 저장됨: {loaded}행)")
+        if defer_indexes:
+            timings["analyze"] = analyze_table(conn, table)
+            rebuilt = ", ".join(f"{n} {sec:.2f}s" for n, sec in timings.get("rebuild_indexes", {}).items())
+            print(f"[TIMING] 인덱스 삭제 {timings.get('drop_indexes', 0):.2f}s, 적재 {timings['load']:.2f}s, "
+                  f"인덱스 재생성 {timings.get('rebuild_total', 0):.2f}s ({rebuilt or '없음'}), "
+                  f"ANALYZE {timings['analyze']:.2f}s")
+        stats = embedding_cache_stats()
+        print(f"[INFO] 임베딩 캐시: hit {stats['hits']} / miss {stats['misses']} "
+              f"(적중률 {stats['hit_rate']:.1%}, 보관 {stats['size']}/{stats['maxsize']})")
+        if "store" in stats:
+            disk = stats["store"]
+            print(f"[INFO] 디스크 임베딩 캐시: hit {disk['hits']} / miss {disk['misses']} "
+                  f"(적중률 {disk['hit_rate']:.1%}, {disk['entries']}개, {disk['bytes'] / 1e6:.1f}MB)")
 
     except Exception as e:
-        # 5-7) 하나라도 실패하면 전체 ROLLBACK
+        # 8-7) 하나라도 실패하면 전체 ROLLBACK
         conn.rollback()
         print("[ERROR] 예외 발생, ROLLBACK 처리:", e)
         raise
@@ -181,9 +511,11 @@ def import_csv_with_transaction(csv_path: str):
         conn.close()
         print("[INFO] DB 연결 종료")
 
+    return timings
+
 
 # -----------------------------
-# 6) 실행부
+# 9) 실행부
 # -----------------------------
 if __name__ == "__main__":
     import_csv_with_transaction(CSV_PATH)
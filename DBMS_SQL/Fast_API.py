@@ -3,7 +3,7 @@ FastAPI 기반 /register_design API
 A안 반영: 서버 시작 시 design 테이블을 384차원(pgvector)로 '깨끗하게' 재생성
 - DROP TABLE IF EXISTS design;
 - CREATE EXTENSION IF NOT EXISTS vector;
-- CREATE TABLE design (... embedding VECTOR(384));
+- CREATE TABLE design (... embedding VECTOR(384));  (EMBEDDING_STORAGE=halfvec 이면 HALFVEC(384))
 
 실행:
   uvicorn Fast_API:app --reload
@@ -11,20 +11,107 @@ A안 반영: 서버 시작 시 design 테이블을 384차원(pgvector)로 '깨
   PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
 옵션:
   INIT_RESET=1  -> 서버 시작 시 테이블 드롭 후 재생성 (기본값: 1)
-  INIT_RESET=0  -> 드롭/재생성 하지 않음 (운영 권장)
+  INIT_RESET=0  -> 드롭하지 않고 기존 테이블을 마이그레이션 (운영 권장, schema_migration.py)
+                   빠진 컬럼 추가 (embedding 타입/차원 변환은 테이블 전체를 잠그고 다시 쓰므로 시작 시에는 거부하고 로그,
+                   점검 시간에 python schema_migration.py 384 또는 MIGRATE_EMBEDDING_TYPE=1 로 시작)
+  인덱스(HNSW, title)는 어느 쪽이든 시작 후 백그라운드에서 CREATE INDEX CONCURRENTLY 로 생성
+  (생성되는 동안에도 API 는 요청을 처리, 진행 상태는 /metrics 의 design_api_index_ready)
+  GET /readyz: 인덱스 생성이 실패했거나 중복 방지 인덱스가 준비되지 않았으면 503 (로드밸런서 준비 확인용)
+커넥션 풀(psycopg_pool):
+  PGPOOL_MIN_SIZE=2      -> 풀이 항상 유지하는 최소 연결 수
+  PGPOOL_MAX_SIZE=10     -> 동시에 빌려줄 수 있는 최대 연결 수
+  PGPOOL_TIMEOUT=5       -> 연결을 빌릴 때 최대 대기 시간(초), 초과 시 503
+  PGPOOL_MAX_IDLE=300    -> 유휴 연결을 닫기까지의 시간(초)
+중복 등록 방지(content_hash):
+  DEDUP_ENABLED=0        -> 1이면 같은 title/description 이 이미 있으면 임베딩/INSERT 없이 기존 id 반환
+                            (content_hash 유니크 인덱스 + ON CONFLICT DO NOTHING)
+                            기본값: 0 → 기존처럼 요청마다 새로 INSERT
+                            1이면 유니크 인덱스를 요청 처리 전에(시작 시 동기로) 만들고,
+                            만들지 못하면(이미 중복 행이 있는 등) 등록 요청은 503, /readyz 도 503
+그룹 커밋(/register_design, /register_design_binary, group_commit.py):
+  GROUP_COMMIT=0               -> 1이면 동시 요청의 INSERT 를 모아 한 트랜잭션/한 번의 COMMIT 으로 저장 (기본값: 0)
+  GROUP_COMMIT_MAX_ROWS=64     -> 한 번에 COMMIT 할 최대 행 수
+  GROUP_COMMIT_MAX_WAIT_MS=5   -> 첫 요청 후 다른 요청을 기다리는 최대 시간(ms)
+  GROUP_COMMIT_WRITERS=2       -> 그룹을 저장하는 쓰기 스레드(=풀 연결) 수
+  GROUP_COMMIT_TIMEOUT=30      -> 요청이 자기 그룹의 COMMIT 을 기다리는 최대 시간(초), 초과 시 504
+  (이 모드에서는 저장 전 중복 조회를 생략하고 ON CONFLICT 로만 중복을 처리)
+입장 제어(/register_design, /register_design_binary, admission.py):
+  임베딩 생성과 DB 작업 앞에 각각 게이트 → 동시 실행 수 제한 + 길이 제한이 있는 대기열
+  ADMIT_DB_CONCURRENCY=10      -> DB 작업 동시 실행 수 (기본값: PGPOOL_MAX_SIZE,
+                                  그룹 커밋이면 GROUP_COMMIT_MAX_ROWS x GROUP_COMMIT_WRITERS, 0이면 제한 없음)
+  ADMIT_DB_QUEUE=200           -> DB 게이트 대기열 길이 (가득 차면 429)
+  ADMIT_EMBED_CONCURRENCY=4    -> 임베딩 생성 동시 실행 수 (0이면 제한 없음)
+  ADMIT_EMBED_QUEUE=200        -> 임베딩 게이트 대기열 길이 (가득 차면 429)
+  ADMIT_QUEUE_TIMEOUT=2        -> 대기열에서 기다리는 최대 시간(초), 초과 시 503
+  ADMIT_RETRY_AFTER=1          -> 429/503 응답의 Retry-After(초) (풀 대기시간 초과 503 에도 붙음)
+임베딩 전송 형식 (/register_design, /register_designs):
+  embedding      -> JSON 숫자 배열 (기존)
+  embedding_b64  -> little-endian float32 바이트의 base64 문자열 (JSON 배열보다 훨씬 작고 검증이 빠름)
+  /register_design_binary?title=..&description=..  -> 본문 자체가 float32 바이트 (application/octet-stream)
+대량 등록(/register_designs):
+  BULK_MAX_ITEMS=10000   -> 한 요청에 받을 수 있는 최대 항목 수 (초과 시 413)
+임베딩 저장 형식(embedding_storage.py, halfvec/이진 양자화는 pgvector 0.7.0 이상):
+  EMBEDDING_STORAGE=vector   -> vector(float32) / halfvec(float16, 테이블과 HNSW 인덱스 약 절반)
+                                halfvec 이면 입력 embedding 값의 절댓값이 65504(float16 최댓값)를 넘을 때 422
+  EMBEDDING_BQ_INDEX=0       -> 1이면 벡터 HNSW 대신 이진 양자화(binary_quantize) HNSW 인덱스 (인덱스 1/32)
+  EMBEDDING_BQ_RERANK=4      -> 이진 양자화 검색 시 K x 이 값 만큼 후보를 뽑아 원래 벡터로 다시 정렬
+  INIT_RESET=0 이면 기존 인덱스를 이 설정에 맞게 정리 (컬럼 타입 변환은 python schema_migration.py, 같은 설정으로 실행)
+유사도 검색(/search_designs, HNSW 인덱스):
+  HNSW_M=16                -> 인덱스 각 노드의 최대 연결 수 (시작 시 인덱스 생성에 사용)
+  HNSW_EF_CONSTRUCTION=64  -> 인덱스 생성 시 탐색 깊이
+  HNSW_EF_SEARCH=40        -> 검색 시 기본 탐색 깊이 (요청마다 ef_search 로 변경 가능, 후보 수보다 작으면 후보 수로)
+메트릭(/metrics, Prometheus 텍스트 형식):
+  라우트별 요청 수/지연시간, 단계별(pool_wait, embed, insert, commit ...) 지연시간,
+  롤백 수, 커넥션 풀 상태(대기 횟수/대기 시간/타임아웃),
+  입장 제어 게이트별 실행 중/대기 중 요청 수와 거절 수
+프로파일링(opt-in, profiling.py):
+  PROFILE_SAMPLE_RATE=0  -> 0~1, 이 비율의 요청을 cProfile 로 기록 (0이면 샘플링 안 함)
+  PROFILE_TOKEN=         -> 설정하면 'X-Debug-Profile: <토큰>' 헤더가 붙은 요청은 항상 기록
+  PROFILE_DIR=profiles, PROFILE_MAX_FILES=200  -> 저장 위치 / 보관 개수 (오래된 것부터 삭제)
+  기록 범위: 임베딩 생성, 벡터 변환, DB 작업(중복 조회, INSERT/COPY, 검색) 함수
+  목록: GET /debug/profiles, 요약: GET /debug/profiles/{file}, 원본(.prof): ?raw=true
+    PROFILE_TOKEN 이 있으면 같은 디버그 헤더가 있어야 하고, 없으면 로컬(127.0.0.1, ::1) 접속만 허용 (아니면 403)
+  둘 다 비어 있으면(기본값) 미들웨어와 /debug/profiles 라우트를 등록하지 않음
 """
 
 import os
-import math
-from typing import List, Optional
+import json
+import time
+import base64
+import binascii
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import psycopg
 from psycopg.rows import tuple_row
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field, validator
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool, PoolTimeout
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, field_validator, model_validator
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 
+import design_sql
+import metrics
+import profiling
+from profiling import profiled
+from admission import AdmissionGate, AdmissionRejected, admission_metrics, admission_rejected_handler
+from design_sql import content_hash, plan_bulk_inserts
+from dummy_embedding import generate_embedding_from_text, generate_embeddings_batch
+from embedding_storage import (
+    EMBEDDING_BQ_INDEX, StorageNotSupported, candidate_count, check_range, check_support, column_type,
+    search_sql,
+)
+from pgvector_adapter import from_float32_bytes, register_vector_binary, to_float32
+from group_commit import GroupCommitWriter
+from schema_migration import (
+    CONTENT_HASH_INDEX, IndexBuilder, SchemaMigrationError, design_indexes, migrate_design_table,
+)
+
 # -----------------------------
 # 0) 환경변수(.env) 로드
 # -----------------------------
@@ -42,23 +129,55 @@ EMBEDDING_DIM = 384
 # 서버 시작 시 테이블을 드롭/재생성할지 여부 (A안 기본: 켜짐)
 INIT_RESET = os.getenv("INIT_RESET", "1") == "1"
 
+# 커넥션 풀 크기/대기시간 (요청마다 connect 하지 않고 풀에서 빌려 씀)
+PGPOOL_MIN_SIZE = int(os.getenv("PGPOOL_MIN_SIZE", "2"))
+PGPOOL_MAX_SIZE = int(os.getenv("PGPOOL_MAX_SIZE", "10"))
+PGPOOL_TIMEOUT = float(os.getenv("PGPOOL_TIMEOUT", "5"))
+PGPOOL_MAX_IDLE = float(os.getenv("PGPOOL_MAX_IDLE", "300"))
+
+# 같은 내용(title, description) 재등록 시 기존 id 반환
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "0") == "1"
+
+# 그룹 커밋(opt-in): 동시 요청의 INSERT 를 모아 COMMIT 1번으로 저장
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_ROWS = int(os.getenv("GROUP_COMMIT_MAX_ROWS", "64"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", "5"))
+GROUP_COMMIT_WRITERS = int(os.getenv("GROUP_COMMIT_WRITERS", "2"))
+GROUP_COMMIT_TIMEOUT = float(os.getenv("GROUP_COMMIT_TIMEOUT", "30"))
+
+# 입장 제어: 게이트별 동시 실행 수 / 대기열 길이
+ADMIT_DB_CONCURRENCY = int(os.getenv(
+    "ADMIT_DB_CONCURRENCY",
+    str(GROUP_COMMIT_MAX_ROWS * GROUP_COMMIT_WRITERS if GROUP_COMMIT else PGPOOL_MAX_SIZE),
+))
+ADMIT_DB_QUEUE = int(os.getenv("ADMIT_DB_QUEUE", "200"))
+ADMIT_EMBED_CONCURRENCY = int(os.getenv("ADMIT_EMBED_CONCURRENCY", "4"))
+ADMIT_EMBED_QUEUE = int(os.getenv("ADMIT_EMBED_QUEUE", "200"))
+ADMIT_QUEUE_TIMEOUT = float(os.getenv("ADMIT_QUEUE_TIMEOUT", "2"))
+ADMIT_RETRY_AFTER = float(os.getenv("ADMIT_RETRY_AFTER", "1"))
+
+# 대량 등록 1회 요청당 최대 항목 수
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+# HNSW 인덱스 파라미터 (MLOps_Python/sentecnetransformer.py 의 review_vectors 인덱스와 같은 기본값)
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+SEARCH_SQL = search_sql(EMBEDDING_DIM)
+
+# startup 훅에서 생성, shutdown 훅에서 종료
+pool: Optional[ConnectionPool] = None
+index_builder: Optional[IndexBuilder] = None
+group_writer: Optional[GroupCommitWriter] = None
+
 # -----------------------------
 # 1) 임베딩 유틸 (학습용 더미 구현)
 # -----------------------------
-def generate_embedding_from_text(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
-    """
-    실제 서비스에서는 OpenAI/HuggingFace 모델 사용.
-    여기선 '항상 같은 텍스트 -> 같은 벡터'가 되도록 간단 의사난수 벡터 생성.
-    """
-    base = sum(ord(c) for c in (text or ""))
-    return [((math.sin(base * (i + 1)) + 1) / 2.0) for i in range(dim)]
+# generate_embedding_from_text(text, dim) → float32 배열 (numpy 벡터화 + LRU 캐시)
+# generate_embeddings_batch(texts, dim)   → (n, dim) float32 행렬
+# 구현은 DBMS_SQL.py 와 함께 쓰는 dummy_embedding.py 에 있습니다.
 
-def to_sql_vector(values: List[float]) -> str:
-    """
-    pgvector는 문자열 "[1,2,3]" 형태를 ::vector 로 캐스팅해 저장 가능.
-    환경 의존도 낮추기 위해 문자열 캐스팅 방식 사용.
-    """
-    return "[" + ",".join(f"{x:.6f}" for x in values) + "]"
+# 중복 판정용 content_hash 와 design 등록 SQL 은 Fast_API_async.py 와 함께 쓰는 design_sql.py 에 있습니다.
 
 # -----------------------------
 # 2) 스키마 초기화(A안)
@@ -74,22 +193,161 @@ def reset_schema_drop_and_create(conn, dim: int):
         id          BIGSERIAL PRIMARY KEY,
         title       TEXT,
         description TEXT,
-        embedding   VECTOR({dim})
+        content_hash BYTEA,
+        embedding   {column_type(dim)}
     );
     """
     with conn.cursor() as cur:
         cur.execute(ddl)
 
-def ensure_extension_only(conn):
+# INIT_RESET=0: 테이블 점검/마이그레이션은 schema_migration.migrate_design_table
+# 인덱스(HNSW 등)는 schema_migration.IndexBuilder 가 시작 후 백그라운드에서 CONCURRENTLY 로 생성
+
+# -----------------------------
+# 2-1) 커넥션 풀
+# -----------------------------
+def conninfo() -> str:
+    """
+    psycopg/psycopg_pool 공용 접속 문자열 (특수문자가 있어도 안전하게 조합)
+    """
+    return make_conninfo(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE, user=PGUSER, password=PGPASSWORD
+    )
+
+def configure_connection(conn):
+    """
+    풀이 새 연결을 만들 때마다 1회 실행: numpy 벡터를 pgvector 바이너리로 보내도록 등록
+    (등록 시 타입 조회 트랜잭션이 열리므로 닫아서 풀에 idle 상태로 돌려줌)
+    """
+    register_vector_binary(conn)
+    conn.commit()
+
+def create_pool() -> ConnectionPool:
+    """
+    요청 처리용 커넥션 풀 생성
+    - configure: 연결마다 pgvector 바이너리 어댑터 등록
+    - check: 빌려주기 직전에 연결이 살아있는지 확인(죽은 연결은 교체)
+    - autocommit=False: 라우트에서 commit/rollback 을 직접 제어
+    """
+    return ConnectionPool(
+        conninfo(),
+        min_size=PGPOOL_MIN_SIZE,
+        max_size=PGPOOL_MAX_SIZE,
+        timeout=PGPOOL_TIMEOUT,
+        max_idle=PGPOOL_MAX_IDLE,
+        kwargs={"row_factory": tuple_row, "autocommit": False},
+        configure=configure_connection,
+        check=ConnectionPool.check_connection,
+        name="design-api",
+        open=False,
+    )
+
+RETRY_AFTER_HEADERS = {"Retry-After": str(max(1, round(ADMIT_RETRY_AFTER)))}
+
+# 등록 라우트 입장 제어 게이트 (Fast_API_async.py 도 같은 인스턴스 사용)
+db_gate = AdmissionGate("db", ADMIT_DB_CONCURRENCY, ADMIT_DB_QUEUE, ADMIT_QUEUE_TIMEOUT, ADMIT_RETRY_AFTER)
+embed_gate = AdmissionGate("embed", ADMIT_EMBED_CONCURRENCY, ADMIT_EMBED_QUEUE, ADMIT_QUEUE_TIMEOUT, ADMIT_RETRY_AFTER)
+
+@contextmanager
+def borrow_connection():
     """
-    INIT_RESET=0 인 경우: 확장만 보장 (테이블 드롭/생성은 하지 않음)
+    라우트 공용: 풀에서 연결을 빌리고, 블록이 끝나면 자동 반납
+    - 풀이 없거나(시작 실패) 대기시간 초과 시 503
+    - 빌리는 데 걸린 시간은 pool_wait 단계로 기록
     """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="DB 커넥션 풀이 준비되지 않았습니다.")
+    t0 = time.perf_counter()
+    try:
+        with pool.connection() as conn:
+            metrics.observe_stage("pool_wait", time.perf_counter() - t0)
+            yield conn
+    except PoolTimeout as e:
+        metrics.observe_stage("pool_wait", time.perf_counter() - t0)
+        raise HTTPException(status_code=503, detail=f"DB 연결 대기 시간 초과: {e}", headers=RETRY_AFTER_HEADERS)
+
+def find_designs_by_hash(conn, hashes: Sequence[Optional[bytes]]) -> Dict[bytes, int]:
+    """content_hash → 이미 저장된 design id (없는 해시는 결과에 없음)"""
+    args = design_sql.hash_lookup_args(hashes)
+    if args is None:
+        return {}
     with conn.cursor() as cur:
-        cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        cur.execute(design_sql.FIND_BY_HASH_SQL, args)
+        return design_sql.hash_ids(cur.fetchall())
+
+DEDUP_HITS = metrics.registry.register(metrics.Counter(
+    "design_api_dedup_hits_total", "Registrations answered with an existing id instead of a new row."))
+
+def pool_metrics() -> List[str]:
+    return format_pool_stats(pool.get_stats()) if pool is not None else []
+
+def format_pool_stats(stats: Dict[str, int]) -> List[str]:
+    """
+    /metrics 스크레이프 시점의 커넥션 풀 상태 (psycopg_pool get_stats 값은 누적치, 동기/비동기 풀 공용)
+    - pool_waits: 남는 연결이 없어 줄을 서야 했던 요청 수
+    - pool_timeouts: 대기시간 초과(503)로 실패한 요청 수
+    """
+    lines: List[str] = []
+    for name, kind, help_text, value in (
+        ("design_api_pool_size", "gauge", "Connections currently managed by the pool.", stats.get("pool_size", 0)),
+        ("design_api_pool_available", "gauge", "Idle connections in the pool.", stats.get("pool_available", 0)),
+        ("design_api_pool_requests_waiting", "gauge", "Requests currently waiting for a connection.",
+         stats.get("requests_waiting", 0)),
+        ("design_api_pool_requests_total", "counter", "Connections requested from the pool.",
+         stats.get("requests_num", 0)),
+        ("design_api_pool_waits_total", "counter", "Connection requests that had to wait in the queue.",
+         stats.get("requests_queued", 0)),
+        ("design_api_pool_wait_seconds_total", "counter", "Total time spent waiting in the queue in seconds.",
+         stats.get("requests_wait_ms", 0) / 1000.0),
+        ("design_api_pool_timeouts_total", "counter", "Connection requests that timed out.",
+         stats.get("requests_errors", 0)),
+    ):
+        lines.extend(metrics.format_sample(name, kind, help_text, value))
+    return lines
+
+def index_metrics() -> List[str]:
+    """백그라운드 인덱스 생성 상태 (1=사용 가능, 0=생성 중/실패)"""
+    if index_builder is None:
+        return []
+    return metrics.format_labeled_samples(
+        "design_api_index_ready", "gauge", "Whether each design index has been built (1) or not (0).",
+        "index", {name: int(index_builder.is_ready(name)) for name in index_builder.status},
+    )
+
+def group_commit_metrics() -> List[str]:
+    """그룹 커밋 모드 통계 (평균 그룹 크기 = rows / groups)"""
+    if group_writer is None:
+        return []
+    stats = group_writer.stats()
+    lines: List[str] = []
+    for name, help_text, value in (
+        ("design_api_group_commit_groups_total", "Group transactions committed.", stats["groups"]),
+        ("design_api_group_commit_rows_total", "Rows written through group commit.", stats["rows"]),
+        ("design_api_group_commit_failed_rows_total", "Rows that failed inside group commit.", stats["failed_rows"]),
+        ("design_api_group_commit_fallbacks_total", "Groups retried row by row after the batch write failed.",
+         stats["fallbacks"]),
+    ):
+        lines.extend(metrics.format_sample(name, "counter", help_text, value))
+    return lines
+
+metrics.registry.add_collector(pool_metrics)
+metrics.registry.add_collector(index_metrics)
+metrics.registry.add_collector(group_commit_metrics)
+metrics.registry.add_collector(lambda: admission_metrics([db_gate, embed_gate]))
 
 # -----------------------------
 # 3) 요청/응답 모델
 # -----------------------------
+def decode_embedding_b64(text: str):
+    """base64 → little-endian float32 바이트 → numpy 배열 (디코딩된 바이트를 복사 없이 그대로 사용, 읽기 전용)"""
+    try:
+        raw = base64.b64decode(text, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"embedding_b64 is not valid base64: {e}")
+    vec = from_float32_bytes(raw, EMBEDDING_DIM)
+    check_range(vec)
+    return vec
+
 class RegisterDesignRequest(BaseModel):
     title: str = Field(..., description="디자인 제목")
     description: str = Field(..., description="디자인 설명")
@@ -98,19 +356,99 @@ class RegisterDesignRequest(BaseModel):
         description=f"선택 입력. 제공 시 길이는 {EMBEDDING_DIM} 이어야 함."
     )
 
-    @validator("embedding")
+    embedding_b64: Optional[str] = Field(
+        default=None,
+        description=f"선택 입력. embedding 대신 little-endian float32 {EMBEDDING_DIM}개({EMBEDDING_DIM * 4}바이트)의 base64"
+    )
+
+    @field_validator("embedding")
+    @classmethod
     def validate_embedding(cls, v):
         if v is None:
             return v
         if len(v) != EMBEDDING_DIM:
             raise ValueError(f"embedding length must be {EMBEDDING_DIM}, got {len(v)}")
+        check_range(v)
         return [float(x) for x in v]
 
+    # 검증 때 디코딩한 embedding_b64 배열 (저장 단계에서 다시 디코딩하지 않도록, 요청 객체와 함께 사라짐)
+    _embedding_array: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def validate_embedding_b64(self):
+        if self.embedding_b64 is None:
+            return self
+        if self.embedding is not None:
+            raise ValueError("embedding 과 embedding_b64 중 하나만 입력하세요.")
+        self._embedding_array = decode_embedding_b64(self.embedding_b64)  # 길이/디코딩 오류를 여기서 422 로
+        return self
+
+    @profiled
+    def embedding_vector(self):
+        """입력된 임베딩 → float32 배열 (둘 다 없으면 None)"""
+        if self._embedding_array is not None:
+            return self._embedding_array
+        if self.embedding is not None:
+            return to_float32(self.embedding)
+        return None
+
 class RegisterDesignResponse(BaseModel):
     id: int
     title: str
     description: str
     dim: int = EMBEDDING_DIM
+    deduplicated: bool = Field(default=False, description="같은 내용이 이미 있어 기존 id 를 돌려준 경우 true")
+
+class SearchDesignsRequest(BaseModel):
+    query: Optional[str] = Field(default=None, description="검색 문장 (query 또는 embedding 중 하나)")
+    embedding: Optional[List[float]] = Field(
+        default=None,
+        description=f"검색 벡터 (query 대신 직접 입력, 길이 {EMBEDDING_DIM})"
+    )
+    k: int = Field(default=5, ge=1, le=100, description="상위 K개")
+    ef_search: Optional[int] = Field(
+        default=None, ge=1, le=1000,
+        description=f"HNSW 검색 탐색 깊이 (기본 {HNSW_EF_SEARCH}, K보다 작으면 K로 올림)"
+    )
+
+    @field_validator("embedding")
+    @classmethod
+    def validate_embedding(cls, v):
+        if v is not None and len(v) != EMBEDDING_DIM:
+            raise ValueError(f"embedding length must be {EMBEDDING_DIM}, got {len(v)}")
+        if v is not None:
+            check_range(v)
+        return v
+
+    @model_validator(mode="after")
+    def validate_query_or_embedding(self):
+        # query / embedding 둘 중 정확히 하나만 (모델 전체 오류로 보고, 특정 필드에 붙이지 않음)
+        has_query = bool((self.query or "").strip())
+        has_embedding = self.embedding is not None
+        if has_query == has_embedding:
+            raise ValueError("query 와 embedding 중 정확히 하나만 입력하세요.")
+        return self
+
+class SearchHit(BaseModel):
+    id: int
+    title: Optional[str]
+    similarity: float
+
+class SearchDesignsResponse(BaseModel):
+    results: List[SearchHit]
+    k: int
+    ef_search: int
+
+class BulkItemError(BaseModel):
+    index: int = Field(..., description="입력 목록에서의 위치(0부터)")
+    error: str
+
+class RegisterDesignsResponse(BaseModel):
+    ids: List[Optional[int]] = Field(..., description="입력 순서 그대로의 신규 id (실패 항목은 null)")
+    inserted: int
+    duplicates: int = Field(default=0, description="같은 내용이 이미 있어(또는 요청 안에서 반복되어) 기존 id 를 돌려준 항목 수")
+    errors: List[BulkItemError] = Field(default_factory=list)
+    dim: int = EMBEDDING_DIM
 
 # -----------------------------
 # 4) FastAPI 앱 & CORS
@@ -126,12 +464,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 요청 수/지연시간 + 라우트 안 단계별 지연시간 수집
+app.add_middleware(metrics.MetricsMiddleware)
+
+# 입장 제어 게이트에서 거절된 요청 → 429/503 + Retry-After
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+
+# 요청 단위 프로파일링 (PROFILE_SAMPLE_RATE / PROFILE_TOKEN 설정 시에만)
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 # -----------------------------
-# 5) 앱 시작 시(A안) 스키마 초기화
+# 5) 앱 시작 시(A안) 스키마 초기화 + 커넥션 풀 오픈
 # -----------------------------
-@app.on_event("startup")
-def on_startup():
-    # DB 연결 시도
+def prepare_schema():
+    """
+    스키마 준비 (Fast_API_async.py 와 공용): autocommit 전용 연결로 1회 실행
+    - INIT_RESET=1: 드롭 후 재생성 / INIT_RESET=0: 기존 테이블 마이그레이션
+    """
     try:
         conn = psycopg.connect(
             host=PGHOST,
@@ -145,68 +495,562 @@ def on_startup():
     except Exception as e:
         # 시작 단계에서 실패하면 서버 자체가 쓸모 없으니 로그를 올리고 통과(엔드포인트 호출 시 다시 실패)
         print(f"[STARTUP] DB 연결 실패: {e}")
-        return
+        conn = None
 
-    try:
-        if INIT_RESET:
-            print("[STARTUP] INIT_RESET=1 → A안 적용: design 테이블 드롭 후 재생성")
-            reset_schema_drop_and_create(conn, EMBEDDING_DIM)
+    if conn is not None:
+        try:
+            conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+            check_support(conn)
+            print(f"[STARTUP] embedding 저장 형식: {column_type(EMBEDDING_DIM).lower()}"
+                  + (f", 이진 양자화 인덱스(후보 K x {candidate_count(1)})" if EMBEDDING_BQ_INDEX else ""))
+            if INIT_RESET:
+                print("[STARTUP] INIT_RESET=1 → A안 적용: design 테이블 드롭 후 재생성")
+                reset_schema_drop_and_create(conn, EMBEDDING_DIM)
+            else:
+                print("[STARTUP] INIT_RESET=0 → 드롭/재생성 생략, 기존 테이블 마이그레이션")
+                for action in migrate_design_table(conn, EMBEDDING_DIM) or ["변경 없음"]:
+                    print(f"[STARTUP]   - {action}")
+            print("[STARTUP] 스키마 준비 완료")
+        except (SchemaMigrationError, StorageNotSupported) as e:
+            print(f"[STARTUP] [ERROR] 마이그레이션 불가(데이터는 그대로 유지): {e}")
+        except Exception as e:
+            print(f"[STARTUP] 스키마 초기화 중 오류: {e}")
+        finally:
+            conn.close()
+
+def start_index_builder() -> IndexBuilder:
+    """
+    인덱스는 요청을 막지 않도록 백그라운드에서 CREATE INDEX CONCURRENTLY
+    - DEDUP_ENABLED=1 이면 content_hash 유니크 인덱스만 먼저 여기서 생성 (없으면 ON CONFLICT 가 중복을 막지 못함)
+    """
+    builder = IndexBuilder(conninfo(), design_indexes(EMBEDDING_DIM, HNSW_M, HNSW_EF_CONSTRUCTION, DEDUP_ENABLED))
+    if DEDUP_ENABLED:
+        if builder.build_now(CONTENT_HASH_INDEX):
+            print(f"[STARTUP] 중복 방지 인덱스 준비 완료 ({CONTENT_HASH_INDEX})")
         else:
-            print("[STARTUP] INIT_RESET=0 → 드롭/재생성 생략, 확장만 보장")
-            ensure_extension_only(conn)
-        print("[STARTUP] 스키마 준비 완료")
-    except Exception as e:
-        print(f"[STARTUP] 스키마 초기화 중 오류: {e}")
-    finally:
-        conn.close()
+            print(f"[STARTUP] [ERROR] 중복 방지 인덱스를 만들지 못했습니다 → 등록 요청과 /readyz 는 503 "
+                  f"({builder.status[CONTENT_HASH_INDEX]})")
+    builder.start()
+    print(f"[STARTUP] 백그라운드 인덱스 생성 시작 ({'이진 양자화 ' if EMBEDDING_BQ_INDEX else ''}HNSW m={HNSW_M}, ef_construction={HNSW_EF_CONSTRUCTION})")
+    return builder
+
+def require_dedup_index(builder: Optional[IndexBuilder]) -> None:
+    """DEDUP_ENABLED=1 인데 content_hash 유니크 인덱스가 없으면 503 (중복 행이 쌓이지 않도록 등록을 받지 않음)"""
+    if DEDUP_ENABLED and (builder is None or not builder.is_ready(CONTENT_HASH_INDEX)):
+        state = builder.status.get(CONTENT_HASH_INDEX, "pending") if builder is not None else "not started"
+        raise HTTPException(
+            status_code=503,
+            detail=f"중복 방지 인덱스({CONTENT_HASH_INDEX})가 준비되지 않았습니다: {state}",
+            headers=RETRY_AFTER_HEADERS,
+        )
+
+def readiness(builder: Optional[IndexBuilder]) -> Tuple[bool, Dict[str, Any]]:
+    """/readyz 본문: 인덱스 생성 실패 또는 (DEDUP_ENABLED=1 인데) 중복 방지 인덱스 미준비면 준비 안 됨"""
+    status = dict(builder.status) if builder is not None else {}
+    ready = builder is not None and not builder.failed()
+    if DEDUP_ENABLED:
+        ready = ready and builder.is_ready(CONTENT_HASH_INDEX)
+    return ready, {"ready": ready, "dedup_enabled": DEDUP_ENABLED, "indexes": status}
+
+@app.on_event("startup")
+def on_startup():
+    global pool, index_builder, group_writer
+
+    # 5-1) 스키마 준비는 autocommit 전용 연결로 1회 실행
+    prepare_schema()
+
+    # 5-2) 요청 처리용 커넥션 풀 오픈 (DB가 아직 안 떠 있어도 풀이 백그라운드에서 재시도)
+    pool = create_pool()
+    pool.open(wait=False)
+    print(f"[STARTUP] 커넥션 풀 오픈 (min={PGPOOL_MIN_SIZE}, max={PGPOOL_MAX_SIZE})")
+
+    if GROUP_COMMIT:
+        group_writer = GroupCommitWriter(
+            pool.connection, write_design_item,
+            max_rows=GROUP_COMMIT_MAX_ROWS, max_wait_ms=GROUP_COMMIT_MAX_WAIT_MS,
+            write_many=write_design_items, writers=GROUP_COMMIT_WRITERS,
+        )
+        print(f"[STARTUP] 그룹 커밋 사용 (max_rows={GROUP_COMMIT_MAX_ROWS}, "
+              f"max_wait={GROUP_COMMIT_MAX_WAIT_MS}ms, writers={GROUP_COMMIT_WRITERS})")
+
+    # 5-3) 인덱스는 요청을 막지 않도록 백그라운드에서 CREATE INDEX CONCURRENTLY
+    index_builder = start_index_builder()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    global pool, index_builder, group_writer
+    # 버퍼에 남은 등록 요청을 먼저 모두 COMMIT (풀을 닫기 전에)
+    if group_writer is not None:
+        group_writer.close(timeout=PGPOOL_TIMEOUT * 2)
+        print(f"[SHUTDOWN] 그룹 커밋 버퍼 비움 ({group_writer.stats()})")
+        group_writer = None
+    # 생성 중인 인덱스는 취소 (INVALID 로 남으면 다음 시작 때 다시 생성)
+    if index_builder is not None:
+        index_builder.stop()
+        index_builder = None
+    # 진행 중인 요청이 연결을 반납할 때까지 최대 PGPOOL_TIMEOUT 초 기다린 뒤 풀 종료
+    if pool is not None:
+        pool.close(timeout=PGPOOL_TIMEOUT)
+        pool = None
+        print("[SHUTDOWN] 커넥션 풀 종료")
 
 # -----------------------------
-# 6) 라우트: /register_design
+# 6) 라우트: /register_design, /register_design_binary
 # -----------------------------
-@app.post("/register_design", response_model=RegisterDesignResponse)
-def register_design(payload: RegisterDesignRequest):
+def insert_design_row(conn, title: str, description: str, digest: Optional[bytes], emb_vec) -> Tuple[int, bool]:
     """
-    1) DB 연결
-    2) 임베딩 결정(입력 없으면 description으로 생성)
-    3) 트랜잭션 시작 → INSERT → COMMIT
-      - 예외 발생 시 ROLLBACK
+    1행 INSERT → (id, 중복 여부)
+    - 다른 요청이 같은 내용을 먼저 저장했으면 그 행의 id (design_sql.INSERT_ROW_SQL 참고)
     """
-    # 6-1) DB 연결
-    try:
-        conn = psycopg.connect(
-            host=PGHOST,
-            port=PGPORT,
-            dbname=PGDATABASE,
-            user=PGUSER,
-            password=PGPASSWORD,
-            row_factory=tuple_row,
-            autocommit=False,  # 트랜잭션 수동 제어
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB 연결 실패: {e}")
+    with conn.cursor() as cur:
+        cur.execute(design_sql.INSERT_ROW_SQL, (title, description, digest, emb_vec))
+        row = cur.fetchone()
+    if row is not None:
+        return row[0], False
+    DEDUP_HITS.inc()
+    return find_designs_by_hash(conn, [digest])[digest], True
 
-    try:
-        # 6-2) 임베딩 결정
-        emb = payload.embedding or generate_embedding_from_text(payload.description, EMBEDDING_DIM)
-        emb_sql = to_sql_vector(emb)
-
-        # 6-3) INSERT (트랜잭션)
-        with conn.cursor() as cur:
-            insert_sql = """
-            INSERT INTO design (title, description, embedding)
-            VALUES (%s, %s, %s::vector)
-            RETURNING id;
-            """
-            cur.execute(insert_sql, (payload.title, payload.description, emb_sql))
-            new_id = cur.fetchone()[0]
-
-        conn.commit()  # 성공 시 확정 저장
-        return RegisterDesignResponse(id=new_id, title=payload.title, description=payload.description)
+def write_design_item(conn, item) -> Tuple[int, bool]:
+    """그룹 커밋 쓰기 스레드용: item = (title, description, digest, emb_vec)"""
+    return insert_design_row(conn, *item)
 
+def write_design_items(conn, items: List[Tuple]) -> List[Tuple[int, bool]]:
+    """
+    그룹 커밋 쓰기 스레드용: 여러 행을 executemany 한 번으로 (파이프라인 모드, 왕복 1번 수준)
+    - 행마다 RETURNING 결과가 따로 나오므로 입력 순서대로 id 를 맞춤 (비어 있으면 중복)
+    """
+    with conn.cursor() as cur:
+        cur.executemany(design_sql.INSERT_ROW_SQL, items, returning=True)
+        rows = []
+        while True:
+            rows.append(cur.fetchone())
+            if not cur.nextset():
+                break
+    results: List[Tuple[int, bool]] = []
+    conflicts = [item[2] for item, row in zip(items, rows) if row is None]
+    known = find_designs_by_hash(conn, conflicts) if conflicts else {}
+    for item, row in zip(items, rows):
+        if row is not None:
+            results.append((row[0], False))
+        else:
+            DEDUP_HITS.inc()
+            results.append((known[item[2]], True))
+    return results
+
+@profiled
+def find_existing_design(title: str, description: str, digest: bytes) -> Optional[RegisterDesignResponse]:
+    """재전송(같은 title/description)이면 기존 id 로 응답, 없으면 None"""
+    with borrow_connection() as conn:
+        try:
+            with metrics.stage("dedup_lookup"):
+                existing_id = find_designs_by_hash(conn, [digest]).get(digest)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            metrics.count_rollback()
+            raise HTTPException(status_code=500, detail=f"중복 조회 실패: {type(e).__name__}: {e}")
+    if existing_id is None:
+        return None
+    DEDUP_HITS.inc()
+    return RegisterDesignResponse(id=existing_id, title=title, description=description, deduplicated=True)
+
+@profiled
+def embed_description(description: str):
+    with metrics.stage("embed"):
+        return generate_embedding_from_text(description, EMBEDDING_DIM)
+
+def store_design_grouped(title: str, description: str, digest: Optional[bytes], emb_vec) -> RegisterDesignResponse:
+    """
+    GROUP_COMMIT=1: INSERT 는 그룹 커밋 버퍼에 맡김
+    - 자기 행이 들어간 그룹이 COMMIT 되면 id 를 받음
+    """
+    try:
+        with metrics.stage("group_commit"):
+            new_id, deduplicated = group_writer.write(
+                (title, description, digest, emb_vec), timeout=GROUP_COMMIT_TIMEOUT
+            )
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"DB 연결 대기 시간 초과: {e}", headers=RETRY_AFTER_HEADERS)
+    except FutureTimeout:
+        raise HTTPException(status_code=504, detail=f"그룹 커밋 대기 시간 초과 ({GROUP_COMMIT_TIMEOUT:g}초)")
+    except RuntimeError as e:  # 종료 중 (버퍼가 닫힘)
+        raise HTTPException(status_code=503, detail=f"서버 종료 중: {e}", headers=RETRY_AFTER_HEADERS)
     except Exception as e:
-        conn.rollback()  # 문제 발생 시 되돌리기
-        # 개발 중 원인 파악을 돕기 위해 상세 메시지 노출(운영에서는 일반화 권장)
+        metrics.count_rollback()
         raise HTTPException(status_code=500, detail=f"등록 실패(롤백됨): {type(e).__name__}: {e}")
+    return RegisterDesignResponse(id=new_id, title=title, description=description, deduplicated=deduplicated)
+
+@profiled
+def store_design(title: str, description: str, digest: Optional[bytes], emb_vec) -> RegisterDesignResponse:
+    """
+    트랜잭션 시작 → INSERT ... ON CONFLICT DO NOTHING → COMMIT
+    - 동시에 같은 내용이 먼저 저장되면 그 id 반환
+    - 예외 발생 시 ROLLBACK
+    """
+    if group_writer is not None:
+        return store_design_grouped(title, description, digest, emb_vec)
+
+    # DB 연결 (블록을 벗어나면 풀로 자동 반납)
+    with borrow_connection() as conn:
+        try:
+            with metrics.stage("insert"):
+                new_id, deduplicated = insert_design_row(conn, title, description, digest, emb_vec)
+
+            with metrics.stage("commit"):
+                conn.commit()  # 성공 시 확정 저장
+            return RegisterDesignResponse(
+                id=new_id, title=title, description=description, deduplicated=deduplicated
+            )
+
+        except Exception as e:
+            conn.rollback()  # 문제 발생 시 되돌리기
+            metrics.count_rollback()
+            # 개발 중 원인 파악을 돕기 위해 상세 메시지 노출(운영에서는 일반화 권장)
+            raise HTTPException(status_code=500, detail=f"등록 실패(롤백됨): {type(e).__name__}: {e}")
+
+async def save_design(title: str, description: str, emb_vec) -> RegisterDesignResponse:
+    """
+    /register_design, /register_design_binary 공용 저장 로직
+    1) [db 게이트] 같은 title/description 이 이미 있으면 기존 id 반환 (임베딩/INSERT 생략, 그룹 커밋이면 생략)
+    2) [embed 게이트] 임베딩 결정 (emb_vec 가 None 이면 description으로 생성)
+    3) [db 게이트] INSERT ... ON CONFLICT DO NOTHING → COMMIT
+    - 게이트를 통과한 요청만 스레드풀에서 블로킹 작업 실행 (한도 초과 시 429/503 + Retry-After)
+    - 임베딩을 만드는 동안에는 DB 연결을 잡고 있지 않음
+    """
+    require_dedup_index(index_builder)
+    digest = content_hash(title, description) if DEDUP_ENABLED else None
+
+    if digest is not None and group_writer is None:
+        async with db_gate.admit():
+            existing = await run_in_threadpool(find_existing_design, title, description, digest)
+        if existing is not None:
+            return existing
+
+    # float32 배열 → pgvector 바이너리로 전송, 문자열 변환 없음
+    if emb_vec is None:
+        async with embed_gate.admit():
+            emb_vec = await run_in_threadpool(embed_description, description)
+
+    async with db_gate.admit():
+        return await run_in_threadpool(store_design, title, description, digest, emb_vec)
+
+@app.post("/register_design", response_model=RegisterDesignResponse)
+async def register_design(payload: RegisterDesignRequest):
+    """
+    JSON 본문으로 1건 등록 (embedding: 숫자 배열, embedding_b64: float32 바이트 base64, 둘 다 없으면 생성)
+    """
+    emb_vec = None
+    if payload.embedding is not None or payload.embedding_b64 is not None:
+        with metrics.stage("vector_format"):
+            emb_vec = payload.embedding_vector()
+    return await save_design(payload.title, payload.description, emb_vec)
+
+@app.post("/register_design_binary", response_model=RegisterDesignResponse)
+async def register_design_binary(request: Request, title: str, description: str):
+    """
+    본문이 임베딩 원본 바이트인 1건 등록 (JSON/base64 변환 없음)
+    - Content-Type: application/octet-stream
+    - 본문: little-endian float32 x EMBEDDING_DIM (= 1536 바이트)
+    - title, description 은 쿼리 파라미터
+    """
+    if "application/octet-stream" not in request.headers.get("content-type", ""):
+        raise HTTPException(status_code=415, detail="Content-Type 은 application/octet-stream 이어야 합니다.")
+    body = await request.body()
+    with metrics.stage("vector_format"):
+        try:
+            emb_vec = from_float32_bytes(body, EMBEDDING_DIM)
+            check_range(emb_vec)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    return await save_design(title, description, emb_vec)
+
+# -----------------------------
+# 7) 라우트: /register_designs (대량 등록)
+# -----------------------------
+def format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(x) for x in err['loc']) or 'item'}: {err['msg']}" for err in e.errors()
+    )
+
+def validate_bulk_items(raw_items: List[Any]) -> Tuple[List[Tuple[int, RegisterDesignRequest]], List[BulkItemError]]:
+    """
+    항목별로 검증 → (정상 항목 목록, 실패 항목 목록)
+    - 하나가 틀려도 나머지는 계속 검증 (에러를 한 번에 모아서 돌려줌)
+    """
+    valid, errors = [], []
+    for idx, raw in enumerate(raw_items):
+        if isinstance(raw, BulkItemError):  # NDJSON 줄 단위 JSON 파싱 실패
+            errors.append(raw)
+            continue
+        if not isinstance(raw, dict):
+            errors.append(BulkItemError(index=idx, error="item must be a JSON object"))
+            continue
+        try:
+            valid.append((idx, RegisterDesignRequest(**raw)))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=idx, error=format_validation_error(e)))
+    return valid, errors
+
+async def read_bulk_items(request: Request) -> List[Any]:
+    """
+    요청 본문 → 항목 목록
+    - Content-Type 이 application/x-ndjson(또는 jsonl)이면 줄 단위로 스트리밍 파싱
+    - 그 외에는 JSON 배열([ {...}, {...} ])
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items: List[Any] = []
+        buf = b""
+
+        def take_line(line: bytes):
+            if not line.strip():
+                return
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(BulkItemError(index=len(items), error=f"invalid JSON line: {e}"))
+
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                take_line(line)
+            if len(items) > BULK_MAX_ITEMS:
+                break
+        take_line(buf)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"본문이 올바른 JSON 이 아닙니다: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="본문은 JSON 배열이어야 합니다.")
+
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {BULK_MAX_ITEMS}건까지 등록할 수 있습니다.")
+    return items
+
+def insert_designs_copy(
+    conn, designs: List[RegisterDesignRequest], hashes: List[Optional[bytes]], embeddings: List[Any]
+) -> List[int]:
+    """
+    한 트랜잭션 안에서 COPY(바이너리) 로 여러 행을 한 번에 저장 → 입력 순서대로 새 id
+    - id 예약 / 행 구성은 design_sql.py, 중복은 호출하는 쪽에서 미리 걸러서 넘김
+    """
+    with conn.cursor() as cur:
+        cur.execute(design_sql.RESERVE_IDS_SQL, (len(designs),))
+        ids = design_sql.reserved_ids(cur.fetchall())
+
+        with cur.copy(design_sql.COPY_SQL) as copy:
+            copy.set_types(design_sql.copy_types())
+            for row in design_sql.copy_rows(ids, designs, hashes, embeddings):
+                copy.write_row(row)
+    return ids
+
+def check_bulk_items(raw_items: List[Any], all_or_nothing: bool):
+    """항목별 검증 → (정상 항목, 실패 항목, 정상 항목별 content_hash) / all_or_nothing 이면 422"""
+    with metrics.stage("validate"):
+        valid, errors = validate_bulk_items(raw_items)
+    if errors and all_or_nothing:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "검증 실패 항목이 있어 전체 등록을 취소했습니다.",
+                    "errors": [e.dict() for e in errors]},
+        )
+    digests: List[Optional[bytes]] = [
+        content_hash(d.title, d.description) if DEDUP_ENABLED else None for _, d in valid
+    ]
+    return valid, errors, digests
+
+def bulk_embeddings(designs: List[RegisterDesignRequest], pending: List[int]) -> List[Any]:
+    """pending 항목의 임베딩 (입력이 없는 항목만 모아서 한 번에 생성)"""
+    embeddings: List[Any] = [designs[i].embedding_vector() for i in pending]
+    missing = [j for j, emb in enumerate(embeddings) if emb is None]
+    if missing:
+        generated = generate_embeddings_batch([designs[pending[j]].description for j in missing], EMBEDDING_DIM)
+        for j, emb in zip(missing, generated):
+            embeddings[j] = emb
+    return embeddings
+
+def bulk_response(
+    total: int, valid, errors: List[BulkItemError], digests: List[Optional[bytes]],
+    inserted: Dict[int, int], known: Dict[bytes, int],
+) -> RegisterDesignsResponse:
+    """입력 순서대로 id 채우기 (새로 저장한 항목은 새 id, 중복은 기존 id, 실패 항목은 null)"""
+    for i, new_id in inserted.items():
+        if digests[i] is not None:
+            known[digests[i]] = new_id
+    ids: List[Optional[int]] = [None] * total
+    duplicates = 0
+    for i, (idx, _) in enumerate(valid):
+        if i in inserted:
+            ids[idx] = inserted[i]
+        else:
+            ids[idx] = known[digests[i]]
+            duplicates += 1
+    if duplicates:
+        DEDUP_HITS.inc(amount=duplicates)
+    return RegisterDesignsResponse(ids=ids, inserted=len(inserted), duplicates=duplicates, errors=errors)
+
+@profiled
+def register_designs_batch(raw_items: List[Any], all_or_nothing: bool) -> RegisterDesignsResponse:
+    # 7-1) 항목별 검증
+    valid, errors, digests = check_bulk_items(raw_items, all_or_nothing)
+    if not valid:
+        return bulk_response(len(raw_items), valid, errors, digests, {}, {})
+    designs = [d for _, d in valid]
+
+    # 7-2) 이미 저장된 내용은 기존 id 사용 (임베딩/COPY 대상에서 제외)
+    known: Dict[bytes, int] = {}
+    if DEDUP_ENABLED:
+        with borrow_connection() as conn, metrics.stage("dedup_lookup"):
+            known = find_designs_by_hash(conn, digests)
+            conn.commit()
+    pending = plan_bulk_inserts(digests, known)
+
+    # 7-3) 임베딩이 없는 항목만 모아서 한 번에 생성
+    with metrics.stage("embed"):
+        embeddings = bulk_embeddings(designs, pending)
+
+    # 7-4) 하나의 트랜잭션으로 COPY → COMMIT (DB 오류 시 전체 ROLLBACK)
+    #  - 확인 이후 다른 요청이 같은 내용을 먼저 저장했으면(유니크 위반) 다시 확인 후 1번 재시도
+    inserted: Dict[int, int] = {}
+    with borrow_connection() as conn:
+        for attempt in (1, 2):
+            rows = design_sql.pending_rows(pending, digests, known)
+            try:
+                with metrics.stage("copy"):
+                    new_ids = insert_designs_copy(
+                        conn, *design_sql.copy_batch(designs, digests, embeddings, pending, rows)
+                    )
+                with metrics.stage("commit"):
+                    conn.commit()
+                inserted = design_sql.inserted_ids(pending, rows, new_ids)
+                break
+            except psycopg.errors.UniqueViolation as e:
+                conn.rollback()
+                metrics.count_rollback()
+                if attempt == 2:
+                    raise HTTPException(status_code=500, detail=f"대량 등록 실패(롤백됨): {type(e).__name__}: {e}")
+                with metrics.stage("dedup_lookup"):
+                    known.update(find_designs_by_hash(conn, design_sql.conflict_hashes(digests, pending, rows)))
+                    conn.commit()
+            except Exception as e:
+                conn.rollback()
+                metrics.count_rollback()
+                raise HTTPException(status_code=500, detail=f"대량 등록 실패(롤백됨): {type(e).__name__}: {e}")
+
+    return bulk_response(len(raw_items), valid, errors, digests, inserted, known)
+
+@app.post("/register_designs", response_model=RegisterDesignsResponse)
+async def register_designs(request: Request, all_or_nothing: bool = False):
+    """
+    여러 디자인을 한 요청으로 등록
+    - 본문: JSON 배열 또는 NDJSON(Content-Type: application/x-ndjson)
+    - 검증 실패 항목은 errors 로 알려주고 나머지는 저장 (all_or_nothing=true 면 422 로 전체 취소)
+    - 응답 ids 는 입력 순서와 같음 (실패 항목 자리는 null)
+    - 이미 저장된 내용(또는 요청 안의 반복)은 새로 저장하지 않고 기존 id 를 돌려줌 (duplicates)
+    """
+    require_dedup_index(index_builder)
+    with metrics.stage("read_body"):
+        raw_items = await read_bulk_items(request)
+    # DB/임베딩 작업은 블로킹이므로 스레드풀에서 실행
+    return await run_in_threadpool(register_designs_batch, raw_items, all_or_nothing)
+
+# -----------------------------
+# 8) 라우트: /search_designs (코사인 유사도 Top-K)
+# -----------------------------
+@app.post("/search_designs", response_model=SearchDesignsResponse)
+@profiled
+def search_designs(payload: SearchDesignsRequest):
+    """
+    1) 검색 벡터 결정 (query 문장을 임베딩 하거나, 입력 벡터를 그대로 사용)
+    2) 이번 트랜잭션에만 hnsw.ef_search 적용 (SET LOCAL 과 같음)
+    3) embedding <=> 검색벡터 (코사인 거리) 가까운 순 K개 → 유사도 = 1 - 거리
+       (이진 양자화 인덱스면 해밍 거리로 후보를 뽑은 뒤 코사인 거리로 다시 정렬, embedding_storage.search_sql)
+    """
+    if payload.embedding is not None:
+        with metrics.stage("vector_format"):
+            q_vec = to_float32(payload.embedding)
+    else:
+        with metrics.stage("embed"):
+            q_vec = generate_embedding_from_text(payload.query, EMBEDDING_DIM)
+    # HNSW 는 ef_search 개까지만 후보를 돌려주므로 후보 수(K, 이진 양자화면 K x 배수)보다 작으면 올림
+    ef_search = max(payload.ef_search or HNSW_EF_SEARCH, candidate_count(payload.k))
+
+    with borrow_connection() as conn:
+        try:
+            with conn.cursor() as cur, metrics.stage("search"):
+                cur.execute("SELECT set_config('hnsw.ef_search', %s, true);", (str(ef_search),))
+                cur.execute(
+                    SEARCH_SQL,
+                    {"q": q_vec, "k": payload.k, "candidates": candidate_count(payload.k)},
+                )
+                rows = cur.fetchall()
+            with metrics.stage("commit"):
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            metrics.count_rollback()
+            raise HTTPException(status_code=500, detail=f"검색 실패: {type(e).__name__}: {e}")
+
+    return SearchDesignsResponse(
+        results=[SearchHit(id=rid, title=title, similarity=sim) for rid, title, sim in rows],
+        k=payload.k,
+        ef_search=ef_search,
+    )
+
+# -----------------------------
+# 9) 라우트: /metrics (Prometheus 스크레이프), /readyz
+# -----------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus 텍스트 형식 메트릭
+    - design_api_request_seconds / design_api_requests_total: 라우트별 지연시간, 상태코드별 요청 수
+    - design_api_stage_seconds: 라우트 안 단계별 지연시간 (pool_wait, embed, insert, copy, search, commit ...)
+    - design_api_rollbacks_total: 롤백 수
+    - design_api_pool_*: 커넥션 풀 상태 (대기 횟수, 대기 시간, 타임아웃)
+    """
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/readyz")
+def readyz():
+    """준비 확인: 인덱스 생성이 실패했거나 중복 방지 인덱스가 없으면 503 (본문에 인덱스별 상태)"""
+    ready, body = readiness(index_builder)
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+# -----------------------------
+# 10) 라우트: /debug/profiles (프로파일 목록/요약, 프로파일링이 켜져 있을 때만 등록)
+# -----------------------------
+def check_profile_access(request: Request) -> None:
+    """PROFILE_TOKEN 이 있으면 디버그 헤더, 없으면 로컬 접속만 허용"""
+    host = request.client.host if request.client else None
+    if not profiling.access_allowed(request.headers.get(profiling.PROFILE_HEADER), host):
+        raise HTTPException(status_code=403, detail="프로파일 조회 권한이 없습니다.")
+
+def get_profiles():
+    """저장된 프로파일 목록 (최신순, 응답 헤더 X-Profile-Id 의 id 로 찾기)"""
+    return {"dir": profiling.PROFILE_DIR, "profiles": profiling.list_profiles()}
+
+def get_profile(name: str, sort: str = "cumulative", limit: int = 40, raw: bool = False):
+    """
+    프로파일 1개
+    - 기본: 상위 limit 개 함수 텍스트 요약 (sort: cumulative, tottime, calls ...)
+    - raw=true: .prof 원본 (snakeviz / python -m pstats 로 열기)
+    """
+    path = profiling.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일이 없습니다.")
+    if raw:
+        return FileResponse(path, media_type="application/octet-stream", filename=name)
+    try:
+        return PlainTextResponse(profiling.profile_summary(path, sort=sort, limit=limit))
+    except KeyError:
+        raise HTTPException(status_code=422, detail=f"지원하지 않는 정렬 기준: {sort}")
 
-    finally:
-        conn.close()
+if profiling.enabled():
+    app.add_api_route("/debug/profiles", get_profiles, methods=["GET"],
+                      dependencies=[Depends(check_profile_access)])
+    app.add_api_route("/debug/profiles/{name}", get_profile, methods=["GET"],
+                      dependencies=[Depends(check_profile_access)])
@@ -0,0 +1,382 @@
+"""
+FastAPI 비동기 버전 (Fast_API.py 와 같은 라우트/요청·응답/테이블)
+
+Fast_API.py 는 모든 라우트가 동기 def + 블로킹 psycopg 라서 FastAPI 기본 스레드풀(약 40개)에서
+실행되고, 스레드가 모두 DB 를 기다리는 중이면 나머지 요청은 처리되지 못하고 줄을 섭니다.
+이 버전은
+- 라우트가 async def, DB 는 psycopg 비동기 연결(AsyncConnectionPool) → 대기 중인 요청이 스레드를 차지하지 않음
+- CPU 작업(임베딩 생성, 대량 등록 검증)은 전용 스레드풀(EMBED_WORKERS)에서 실행 → 이벤트 루프를 막지 않음
+- 스키마 준비/마이그레이션, 백그라운드 인덱스 생성, 중복 등록 방지, 입장 제어(ADMIT_*), /metrics 는 Fast_API.py 와 공용
+- 그룹 커밋(GROUP_COMMIT)은 동기 버전 전용
+
+실행:
+  uvicorn Fast_API_async:app
+환경변수: Fast_API.py 와 동일 + 아래
+  EMBED_WORKERS=4  -> 임베딩 생성 전용 스레드 수 (0이면 이벤트 루프에서 바로 계산)
+  ※ 동기 버전은 스레드풀 크기만큼만 풀 연결을 기다리지만, 이 버전은 동시에 들어온 요청이
+    모두 풀 연결을 기다립니다. 수천 건을 동시에 받을 때는 PGPOOL_TIMEOUT 을 대기 시간에 맞게
+    늘려야 503 이 나지 않습니다.
+부하 테스트(동기 버전과 비교): python async_load_test.py
+"""
+
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psycopg
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+import design_sql
+import metrics
+from admission import AdmissionRejected, admission_rejected_handler
+from Fast_API import (
+    DEDUP_ENABLED, DEDUP_HITS, EMBEDDING_DIM, HNSW_EF_SEARCH,
+    PGPOOL_MAX_IDLE, PGPOOL_MAX_SIZE, PGPOOL_MIN_SIZE, PGPOOL_TIMEOUT, RETRY_AFTER_HEADERS,
+    RegisterDesignRequest, RegisterDesignResponse, RegisterDesignsResponse,
+    SearchDesignsRequest, SearchDesignsResponse, SearchHit,
+    bulk_embeddings, bulk_response, check_bulk_items, conninfo, db_gate, embed_gate, format_pool_stats,
+    SEARCH_SQL, generate_embedding_from_text, prepare_schema, read_bulk_items, readiness, require_dedup_index,
+    start_index_builder,
+)
+from design_sql import content_hash, plan_bulk_inserts
+from embedding_storage import candidate_count, check_range
+from pgvector_adapter import from_float32_bytes, register_vector_binary_async, to_float32
+from schema_migration import IndexBuilder
+
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "4"))
+
+# startup 훅에서 생성, shutdown 훅에서 종료
+pool: Optional[AsyncConnectionPool] = None
+index_builder: Optional[IndexBuilder] = None
+embed_executor: Optional[ThreadPoolExecutor] = None
+
+# -----------------------------
+# 1) 커넥션 풀 / CPU 작업 실행기
+# -----------------------------
+async def configure_connection(conn):
+    """풀이 새 연결을 만들 때마다 1회: numpy 벡터를 pgvector 바이너리로 보내도록 등록"""
+    await register_vector_binary_async(conn)
+    await conn.commit()
+
+def create_pool() -> AsyncConnectionPool:
+    """Fast_API.create_pool 의 비동기 버전 (같은 크기/대기시간 설정)"""
+    return AsyncConnectionPool(
+        conninfo(),
+        min_size=PGPOOL_MIN_SIZE,
+        max_size=PGPOOL_MAX_SIZE,
+        timeout=PGPOOL_TIMEOUT,
+        max_idle=PGPOOL_MAX_IDLE,
+        kwargs={"row_factory": tuple_row, "autocommit": False},
+        configure=configure_connection,
+        check=AsyncConnectionPool.check_connection,
+        name="design-api-async",
+        open=False,
+    )
+
+@asynccontextmanager
+async def borrow_connection():
+    """
+    라우트 공용: 풀에서 연결을 빌리고, 블록이 끝나면 자동 반납
+    - 연결을 기다리는 동안 이벤트 루프는 다른 요청을 처리
+    - 풀이 없거나(시작 실패) 대기시간 초과 시 503
+    """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="DB 커넥션 풀이 준비되지 않았습니다.")
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    try:
+        async with pool.connection() as conn:
+            metrics.observe_stage("pool_wait", loop.time() - t0)
+            yield conn
+    except PoolTimeout as e:
+        metrics.observe_stage("pool_wait", loop.time() - t0)
+        raise HTTPException(status_code=503, detail=f"DB 연결 대기 시간 초과: {e}", headers=RETRY_AFTER_HEADERS)
+
+async def run_cpu(fn, *args):
+    """
+    CPU 작업을 전용 스레드풀에서 실행 (EMBED_WORKERS=0 이면 바로 실행)
+    - contextvars 를 복사해 넘기므로 스레드 안의 metrics.stage 도 같은 요청으로 기록
+    """
+    if embed_executor is None:
+        return fn(*args)
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(embed_executor, ctx.run, fn, *args)
+
+# -----------------------------
+# 2) DB 작업 (SQL / 행 구성은 design_sql.py, 여기는 await 만)
+# -----------------------------
+async def find_designs_by_hash(conn, hashes: Sequence[Optional[bytes]]) -> Dict[bytes, int]:
+    args = design_sql.hash_lookup_args(hashes)
+    if args is None:
+        return {}
+    cur = await conn.execute(design_sql.FIND_BY_HASH_SQL, args)
+    return design_sql.hash_ids(await cur.fetchall())
+
+async def insert_design_row(conn, title: str, description: str, digest: Optional[bytes], emb_vec) -> Tuple[int, bool]:
+    cur = await conn.execute(design_sql.INSERT_ROW_SQL, (title, description, digest, emb_vec))
+    row = await cur.fetchone()
+    if row is not None:
+        return row[0], False
+    DEDUP_HITS.inc()
+    return (await find_designs_by_hash(conn, [digest]))[digest], True
+
+async def insert_designs_copy(
+    conn, designs: List[RegisterDesignRequest], hashes: List[Optional[bytes]], embeddings: List[Any]
+) -> List[int]:
+    async with conn.cursor() as cur:
+        await cur.execute(design_sql.RESERVE_IDS_SQL, (len(designs),))
+        ids = design_sql.reserved_ids(await cur.fetchall())
+
+        async with cur.copy(design_sql.COPY_SQL) as copy:
+            copy.set_types(design_sql.copy_types())
+            for row in design_sql.copy_rows(ids, designs, hashes, embeddings):
+                await copy.write_row(row)
+    return ids
+
+# -----------------------------
+# 3) FastAPI 앱 & CORS & 메트릭
+# -----------------------------
+app = FastAPI(title="Design API (A안, async)", version="1.0.0")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],   # 개발용: 전체 허용 (운영에서는 특정 도메인만)
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+
+def pool_metrics() -> List[str]:
+    return format_pool_stats(pool.get_stats()) if pool is not None else []
+
+def index_metrics() -> List[str]:
+    if index_builder is None:
+        return []
+    return metrics.format_labeled_samples(
+        "design_api_index_ready", "gauge", "Whether each design index has been built (1) or not (0).",
+        "index", {name: int(index_builder.is_ready(name)) for name in index_builder.status},
+    )
+
+metrics.registry.add_collector(pool_metrics)
+metrics.registry.add_collector(index_metrics)
+# 입장 제어 게이트(db_gate, embed_gate)와 그 메트릭은 Fast_API.py 의 것을 그대로 사용 (프로세스당 앱 1개)
+
+# -----------------------------
+# 4) 앱 시작/종료
+# -----------------------------
+@app.on_event("startup")
+async def on_startup():
+    global pool, index_builder, embed_executor
+
+    # 4-1) 스키마 준비 (동기 DDL, 시작 시 1회라 스레드에서 실행)
+    await asyncio.to_thread(prepare_schema)
+
+    # 4-2) 비동기 커넥션 풀 + 임베딩 전용 스레드풀
+    pool = create_pool()
+    await pool.open(wait=False)
+    if EMBED_WORKERS > 0:
+        embed_executor = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed")
+    print(f"[STARTUP] 비동기 커넥션 풀 오픈 (min={PGPOOL_MIN_SIZE}, max={PGPOOL_MAX_SIZE}), "
+          f"임베딩 스레드 {EMBED_WORKERS}개")
+
+    # 4-3) 백그라운드 인덱스 생성 (DEDUP_ENABLED=1 이면 중복 방지 인덱스는 먼저 동기로 생성하므로 스레드에서)
+    index_builder = await asyncio.to_thread(start_index_builder)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    global pool, index_builder, embed_executor
+    if index_builder is not None:
+        await asyncio.to_thread(index_builder.stop)
+        index_builder = None
+    if pool is not None:
+        await pool.close(timeout=PGPOOL_TIMEOUT)
+        pool = None
+        print("[SHUTDOWN] 비동기 커넥션 풀 종료")
+    if embed_executor is not None:
+        embed_executor.shutdown(wait=True)
+        embed_executor = None
+
+# -----------------------------
+# 5) 라우트: /register_design, /register_design_binary
+# -----------------------------
+async def find_existing_design(title: str, description: str, digest: bytes) -> Optional[RegisterDesignResponse]:
+    async with borrow_connection() as conn:
+        try:
+            with metrics.stage("dedup_lookup"):
+                existing_id = (await find_designs_by_hash(conn, [digest])).get(digest)
+            await conn.commit()
+        except Exception as e:
+            await conn.rollback()
+            metrics.count_rollback()
+            raise HTTPException(status_code=500, detail=f"중복 조회 실패: {type(e).__name__}: {e}")
+    if existing_id is None:
+        return None
+    DEDUP_HITS.inc()
+    return RegisterDesignResponse(id=existing_id, title=title, description=description, deduplicated=True)
+
+async def store_design(title: str, description: str, digest: Optional[bytes], emb_vec) -> RegisterDesignResponse:
+    async with borrow_connection() as conn:
+        try:
+            with metrics.stage("insert"):
+                new_id, deduplicated = await insert_design_row(conn, title, description, digest, emb_vec)
+            with metrics.stage("commit"):
+                await conn.commit()
+            return RegisterDesignResponse(
+                id=new_id, title=title, description=description, deduplicated=deduplicated
+            )
+        except Exception as e:
+            await conn.rollback()
+            metrics.count_rollback()
+            raise HTTPException(status_code=500, detail=f"등록 실패(롤백됨): {type(e).__name__}: {e}")
+
+async def save_design(title: str, description: str, emb_vec) -> RegisterDesignResponse:
+    """Fast_API.save_design 과 같은 순서 ([db] 중복 확인 → [embed] 임베딩 → [db] INSERT ... ON CONFLICT → COMMIT)"""
+    require_dedup_index(index_builder)
+    digest = content_hash(title, description) if DEDUP_ENABLED else None
+
+    if digest is not None:
+        async with db_gate.admit():
+            existing = await find_existing_design(title, description, digest)
+        if existing is not None:
+            return existing
+
+    if emb_vec is None:
+        async with embed_gate.admit():
+            with metrics.stage("embed"):
+                emb_vec = await run_cpu(generate_embedding_from_text, description, EMBEDDING_DIM)
+
+    async with db_gate.admit():
+        return await store_design(title, description, digest, emb_vec)
+
+@app.post("/register_design", response_model=RegisterDesignResponse)
+async def register_design(payload: RegisterDesignRequest):
+    emb_vec = None
+    if payload.embedding is not None or payload.embedding_b64 is not None:
+        with metrics.stage("vector_format"):
+            emb_vec = payload.embedding_vector()
+    return await save_design(payload.title, payload.description, emb_vec)
+
+@app.post("/register_design_binary", response_model=RegisterDesignResponse)
+async def register_design_binary(request: Request, title: str, description: str):
+    if "application/octet-stream" not in request.headers.get("content-type", ""):
+        raise HTTPException(status_code=415, detail="Content-Type 은 application/octet-stream 이어야 합니다.")
+    body = await request.body()
+    with metrics.stage("vector_format"):
+        try:
+            emb_vec = from_float32_bytes(body, EMBEDDING_DIM)
+            check_range(emb_vec)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    return await save_design(title, description, emb_vec)
+
+# -----------------------------
+# 6) 라우트: /register_designs (대량 등록)
+# -----------------------------
+@app.post("/register_designs", response_model=RegisterDesignsResponse)
+async def register_designs(request: Request, all_or_nothing: bool = False):
+    """Fast_API.register_designs_batch 와 같은 순서 (검증 → 중복 확인 → 임베딩 → COPY → COMMIT)"""
+    require_dedup_index(index_builder)
+    with metrics.stage("read_body"):
+        raw_items = await read_bulk_items(request)
+
+    # 항목 검증(최대 BULK_MAX_ITEMS 건)은 CPU 작업이므로 전용 스레드에서
+    valid, errors, digests = await run_cpu(check_bulk_items, raw_items, all_or_nothing)
+    if not valid:
+        return bulk_response(len(raw_items), valid, errors, digests, {}, {})
+    designs = [d for _, d in valid]
+
+    known: Dict[bytes, int] = {}
+    if DEDUP_ENABLED:
+        async with borrow_connection() as conn:
+            with metrics.stage("dedup_lookup"):
+                known = await find_designs_by_hash(conn, digests)
+                await conn.commit()
+    pending = plan_bulk_inserts(digests, known)
+
+    with metrics.stage("embed"):
+        embeddings = await run_cpu(bulk_embeddings, designs, pending)
+
+    inserted: Dict[int, int] = {}
+    async with borrow_connection() as conn:
+        for attempt in (1, 2):
+            rows = design_sql.pending_rows(pending, digests, known)
+            try:
+                with metrics.stage("copy"):
+                    new_ids = await insert_designs_copy(
+                        conn, *design_sql.copy_batch(designs, digests, embeddings, pending, rows)
+                    )
+                with metrics.stage("commit"):
+                    await conn.commit()
+                inserted = design_sql.inserted_ids(pending, rows, new_ids)
+                break
+            except psycopg.errors.UniqueViolation as e:
+                await conn.rollback()
+                metrics.count_rollback()
+                if attempt == 2:
+                    raise HTTPException(status_code=500, detail=f"대량 등록 실패(롤백됨): {type(e).__name__}: {e}")
+                with metrics.stage("dedup_lookup"):
+                    known.update(await find_designs_by_hash(conn, design_sql.conflict_hashes(digests, pending, rows)))
+                    await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                metrics.count_rollback()
+                raise HTTPException(status_code=500, detail=f"대량 등록 실패(롤백됨): {type(e).__name__}: {e}")
+
+    return bulk_response(len(raw_items), valid, errors, digests, inserted, known)
+
+# -----------------------------
+# 7) 라우트: /search_designs
+# -----------------------------
+@app.post("/search_designs", response_model=SearchDesignsResponse)
+async def search_designs(payload: SearchDesignsRequest):
+    if payload.embedding is not None:
+        with metrics.stage("vector_format"):
+            q_vec = to_float32(payload.embedding)
+    else:
+        with metrics.stage("embed"):
+            q_vec = await run_cpu(generate_embedding_from_text, payload.query, EMBEDDING_DIM)
+    ef_search = max(payload.ef_search or HNSW_EF_SEARCH, candidate_count(payload.k))
+
+    async with borrow_connection() as conn:
+        try:
+            async with conn.cursor() as cur:
+                with metrics.stage("search"):
+                    await cur.execute("SELECT set_config('hnsw.ef_search', %s, true);", (str(ef_search),))
+                    await cur.execute(
+                        SEARCH_SQL,
+                        {"q": q_vec, "k": payload.k, "candidates": candidate_count(payload.k)},
+                    )
+                    rows = await cur.fetchall()
+            with metrics.stage("commit"):
+                await conn.commit()
+        except Exception as e:
+            await conn.rollback()
+            metrics.count_rollback()
+            raise HTTPException(status_code=500, detail=f"검색 실패: {type(e).__name__}: {e}")
+
+    return SearchDesignsResponse(
+        results=[SearchHit(id=rid, title=title, similarity=sim) for rid, title, sim in rows],
+        k=payload.k,
+        ef_search=ef_search,
+    )
+
+# -----------------------------
+# 8) 라우트: /metrics, /readyz
+# -----------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/readyz")
+async def readyz():
+    ready, body = readiness(index_builder)
+    return JSONResponse(body, status_code=200 if ready else 503)
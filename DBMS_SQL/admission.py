@@ -0,0 +1,142 @@
+"""
+입장 제어(admission control): 동시 실행 수 제한 + 길이 제한이 있는 대기열
+
+부하가 몰리면 요청을 모두 받아 두었다가 커넥션 풀/임베딩이 밀려 한꺼번에 타임아웃되는 대신,
+자원별 게이트 앞에서
+ - 동시 실행 수(limit)까지는 바로 통과
+ - 그 이상은 대기열(max_queue)에서 먼저 온 순서대로 대기
+ - 대기열이 가득 차면 바로 429, queue_timeout 안에 차례가 오지 않으면 503 (둘 다 Retry-After)
+→ 받아들인 요청의 지연시간은 (limit + max_queue) 만큼으로 제한되고, 나머지는 빨리 거절됨
+
+이벤트 루프 안에서 사용 (스레드풀로 넘기기 전에 게이트를 통과 → 스레드풀이 숨은 대기열이 되지 않음)
+
+사용:
+  gate = AdmissionGate("db", limit=10, max_queue=200, queue_timeout=2, retry_after=1)
+  async with gate.admit():
+      await run_in_threadpool(...)
+  app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+  metrics.registry.add_collector(lambda: admission_metrics([gate]))
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, List, Sequence
+
+from fastapi.responses import JSONResponse
+
+import metrics
+
+REJECTED_TOTAL = metrics.registry.register(metrics.Counter(
+    "design_api_admission_rejected_total",
+    "Requests rejected by admission control by gate and reason (queue_full=429, queue_timeout=503).",
+    ("gate", "reason"),
+))
+
+
+class AdmissionRejected(Exception):
+    """게이트에서 거절됨 → status_code(429/503) + Retry-After 로 응답"""
+
+    def __init__(self, gate: str, reason: str, status_code: int, retry_after: float):
+        super().__init__(f"{gate} 처리 한도 초과 ({reason}), {retry_after:g}초 후 다시 시도하세요.")
+        self.gate = gate
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float, retry_after: float = 1.0):
+        """
+        limit:         동시에 실행할 수 있는 요청 수 (0 이하이면 제한 없음)
+        max_queue:     limit 초과 시 기다릴 수 있는 요청 수 (0이면 대기 없이 바로 429)
+        queue_timeout: 대기열에서 기다리는 최대 시간(초), 초과 시 503
+        retry_after:   거절 응답의 Retry-After(초)
+        """
+        self.name = name
+        self.limit = int(limit)
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout = max(0.0, float(queue_timeout))
+        self.retry_after = retry_after
+
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str, status_code: int) -> AdmissionRejected:
+        REJECTED_TOTAL.inc(self.name, reason)
+        return AdmissionRejected(self.name, reason, status_code, self.retry_after)
+
+    async def _acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", 429)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done():
+                # 시간 초과/취소와 동시에 차례를 넘겨받음 → 자리를 다음 대기자에게 돌려줌
+                self._release()
+            else:
+                fut.cancel()
+                self._waiters.remove(fut)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject("queue_timeout", 503) from None
+
+    def _release(self) -> None:
+        # 대기자가 있으면 자리를 그대로 넘겨줌 (active 유지, 먼저 온 순서)
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        """블록 실행 동안 자리 1개 사용 (limit 0 이하이면 그냥 통과)"""
+        if self.limit <= 0:
+            yield
+            return
+        with metrics.stage(f"admission_{self.name}"):
+            await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+
+async def admission_rejected_handler(request, exc: AdmissionRejected):
+    """FastAPI 예외 핸들러: 429/503 + Retry-After"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+def admission_metrics(gates: Sequence[AdmissionGate]) -> List[str]:
+    """게이트별 실행 중/대기 중 요청 수 (gauge)"""
+    return (
+        metrics.format_labeled_samples(
+            "design_api_admission_in_flight", "gauge", "Requests currently admitted by each gate.",
+            "gate", {g.name: g.active for g in gates},
+        )
+        + metrics.format_labeled_samples(
+            "design_api_admission_queue_depth", "gauge", "Requests waiting in each gate queue.",
+            "gate", {g.name: g.queued for g in gates},
+        )
+        + metrics.format_labeled_samples(
+            "design_api_admission_limit", "gauge", "Concurrency limit of each gate (0 = unlimited).",
+            "gate", {g.name: max(0, g.limit) for g in gates},
+        )
+    )
@@ -0,0 +1,98 @@
+"""
+입력 형식 벤치마크: CSV('[...]' 문자열) vs Parquet vs Arrow IPC (arrow_input.py)
+
+- 합성 CSV(BENCH_ROWS 행, 10행마다 빈 embedding)를 만들고 같은 내용을 Parquet / Arrow IPC 로 변환한 뒤
+    [읽기]  파일 → (title, description, 임베딩) 행까지만 (DB 없이, 파싱/디코딩 비용)
+    [적재]  import_csv_with_transaction 으로 측정용 테이블(design_arrow_bench)에 적재
+  을 형식별로 측정해 파일 크기, 읽기 rows/s, 적재 rows/s 를 비교합니다.
+- 빈 embedding 은 description 으로 생성되므로 형식과 상관없는 비용이 조금 섞여 있습니다.
+
+실행:
+  python arrow_import_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_ROWS=20000       -> 행 수
+  BENCH_DIM=1536         -> 벡터 차원
+  BENCH_CHUNKSIZE=5000   -> 청크(배치) 행 수
+  LOAD_METHOD            -> 적재 방식 (기본 insert, 형식 차이를 보려면 copy_binary 권장)
+"""
+
+import os
+import tempfile
+import time
+
+from DBMS_SQL import (
+    DEFAULT_EMBEDDING_DIM, LOAD_METHOD, connect_db, detect_embedding_dim, import_csv_with_transaction,
+    iter_csv_chunks, iter_design_rows,
+)
+from arrow_input import convert_csv, iter_batch_rows, open_arrow_input
+from parallel_import_benchmark import make_csv
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+BENCH_DIM = int(os.getenv("BENCH_DIM", "1536"))
+BENCH_CHUNKSIZE = int(os.getenv("BENCH_CHUNKSIZE", "5000"))
+
+BENCH_TABLE = "design_arrow_bench"
+
+FORMATS = ("csv", "parquet", "arrow")
+
+
+def read_rows(path: str) -> float:
+    """DB 없이 행 단위까지만 읽는 데 걸린 시간"""
+    t0 = time.perf_counter()
+    count = 0
+    if path.endswith(".csv"):
+        dim = None
+        for chunk in iter_csv_chunks(path, BENCH_CHUNKSIZE):
+            dim = dim or detect_embedding_dim(chunk) or DEFAULT_EMBEDDING_DIM
+            count += sum(1 for _ in iter_design_rows(chunk, dim))
+    else:
+        dim, batches = open_arrow_input(path, BENCH_CHUNKSIZE)
+        for batch in batches:
+            count += sum(1 for _ in iter_batch_rows(batch, dim or DEFAULT_EMBEDDING_DIM))
+    assert count == BENCH_ROWS, "읽은 행 수가 다릅니다."
+    return time.perf_counter() - t0
+
+
+def drop_table() -> None:
+    conn = connect_db()
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_rows(path: str) -> float:
+    drop_table()
+    t0 = time.perf_counter()
+    import_csv_with_transaction(path, chunksize=BENCH_CHUNKSIZE, table=BENCH_TABLE)
+    elapsed = time.perf_counter() - t0
+    conn = connect_db()
+    try:
+        assert conn.execute(f"SELECT count(*) FROM {BENCH_TABLE};").fetchone()[0] == BENCH_ROWS, "적재된 행 수가 다릅니다."
+    finally:
+        conn.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: os.path.join(tmp, f"designs.{fmt}") for fmt in FORMATS}
+        make_csv(paths["csv"], BENCH_ROWS, BENCH_DIM)
+        for fmt in FORMATS[1:]:
+            convert_csv(paths["csv"], paths[fmt])
+
+        try:
+            results = {fmt: (os.path.getsize(p), read_rows(p), load_rows(p)) for fmt, p in paths.items()}
+        finally:
+            drop_table()
+
+    print("=" * 72)
+    print(f"{BENCH_ROWS}행, {BENCH_DIM}차원, 청크 {BENCH_CHUNKSIZE}행, 적재 방식 {LOAD_METHOD}")
+    print(f"{'형식':<8} | {'파일 MB':>8} | {'읽기 rows/s':>12} | {'적재 rows/s':>12} {'(CSV 대비)':>10}")
+    print("-" * 72)
+    csv_load = results["csv"][2]
+    for fmt, (size, read_s, load_s) in results.items():
+        print(f"{fmt:<8} | {size / 1e6:>8.1f} | {BENCH_ROWS / read_s:>12,.0f} | "
+              f"{BENCH_ROWS / load_s:>12,.0f} {csv_load / load_s:>9.2f}x")
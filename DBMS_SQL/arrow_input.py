@@ -0,0 +1,253 @@
+"""
+Parquet / Arrow IPC 입력 (DBMS_SQL.py 의 import_csv_with_transaction 이 파일 확장자로 골라 사용)
+
+CSV 의 embedding 은 '[0.1, 0.2, ...]' 문자열이라 적재할 때마다 수백만 개의 숫자를 글자에서 다시 파싱합니다.
+Parquet / Arrow 파일은 embedding 을 float32 고정 길이 리스트(fixed_size_list<float32>[dim]) 컬럼으로 저장하므로
+- 숫자 파싱이 없고, 배치의 embedding 값 버퍼를 그대로 numpy (행 수, dim) 행렬로 봅니다 (파이썬 float 객체 없음)
+- 파일은 메모리 맵으로 열고 배치 단위로 읽으므로 파일 크기와 상관없이 메모리에는 배치 1개만 올라옴
+    .arrow / .feather / .ipc : Arrow IPC 파일 포맷 (압축하지 않았다면 배치가 메모리 맵을 복사 없이 가리킴)
+    .arrows                  : Arrow IPC 스트림 포맷
+    .parquet                 : Parquet (row group 을 배치로 디코딩)
+- 컬럼: title, description (문자열, 없어도 됨), embedding (없거나 null 인 행은 description 으로 생성)
+    list<float> / float64 리스트도 읽지만, 모든 행의 길이가 같아야 함 (다르면 ValueError)
+- 행렬은 배치마다 한 번에 big-endian 으로 바꿔 두므로, COPY 바이너리가 행마다 바이트 순서를 바꾸지 않음
+    (LOAD_METHOD=copy_binary 권장, insert 도 바이너리 파라미터, copy_text 만 값을 글자로 바꿔 전송)
+
+기존 CSV 변환:
+  python arrow_input.py designs.csv designs.parquet     # 또는 designs.arrow
+
+필요 패키지: pyarrow (CSV 만 쓴다면 필요 없음)
+"""
+
+import os
+import sys
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from DBMS_SQL import DEFAULT_EMBEDDING_DIM, detect_embedding_dim, iter_csv_chunks, parse_embedding_column
+from dummy_embedding import generate_embedding_from_text
+
+ARROW_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+    ".arrows": "ipc_stream",
+}
+
+# Parquet 을 배치로 나눌 때 기본 행 수 (chunksize=0)
+PARQUET_BATCH_ROWS = 65536
+
+COLUMNS = ("title", "description", "embedding")
+
+
+def input_format(path: str) -> Optional[str]:
+    """확장자로 본 입력 형식 (parquet / ipc / ipc_stream), CSV 등 그 밖의 파일이면 None"""
+    return ARROW_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+# -----------------------------
+# 1) 배치 읽기 (메모리 맵)
+# -----------------------------
+def iter_arrow_batches(path: str, chunksize: int = 0) -> Iterator[pa.RecordBatch]:
+    """
+    파일을 RecordBatch 로 하나씩 넘겨줍니다(제너레이터).
+    - chunksize 가 0이면 파일에 저장된 배치 단위(Parquet 은 PARQUET_BATCH_ROWS 행)
+    - 아니면 chunksize 행 이하로 잘라서 (IPC 는 slice 라 복사 없음)
+    """
+    fmt = input_format(path)
+    if fmt == "parquet":
+        pf = pq.ParquetFile(path, memory_map=True)
+        columns = [c for c in COLUMNS if c in pf.schema_arrow.names]
+        yield from pf.iter_batches(batch_size=chunksize or PARQUET_BATCH_ROWS, columns=columns)
+        return
+    if fmt is None:
+        raise ValueError(f"Parquet/Arrow 파일이 아닙니다: {path} (확장자: {', '.join(ARROW_FORMATS)})")
+
+    with pa.memory_map(path, "r") as source:
+        if fmt == "ipc":
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        else:
+            batches = pa.ipc.open_stream(source)
+        for batch in batches:
+            if not chunksize:
+                yield batch
+                continue
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize)
+
+
+def embedding_dim(schema: pa.Schema) -> Optional[int]:
+    """스키마만 보고 알 수 있는 차원 (fixed_size_list 일 때), 아니면 None"""
+    if "embedding" not in schema.names:
+        return None
+    field_type = schema.field("embedding").type
+    if pa.types.is_fixed_size_list(field_type):
+        return field_type.list_size
+    return None
+
+
+def detect_batch_dim(batch: pa.RecordBatch) -> Optional[int]:
+    """배치에서 처음으로 값이 있는 embedding 의 길이 (list<float> 처럼 스키마에 차원이 없을 때)"""
+    dim = embedding_dim(batch.schema)
+    if dim is not None or "embedding" not in batch.schema.names:
+        return dim
+    for value in batch.column("embedding"):
+        if value.is_valid:
+            return len(value)
+    return None
+
+
+def open_arrow_input(path: str, chunksize: int = 0) -> Tuple[Optional[int], Iterator[pa.RecordBatch]]:
+    """
+    (차원, 배치 제너레이터) — 차원은 스키마에서, 스키마에 없으면 첫 배치들을 보고 감지
+    (감지에 쓴 배치도 제너레이터에 그대로 포함)
+    """
+    batches = iter_arrow_batches(path, chunksize)
+    peeked: List[pa.RecordBatch] = []
+    dim = None
+    for batch in batches:
+        peeked.append(batch)
+        dim = detect_batch_dim(batch)
+        if dim is not None or "embedding" not in batch.schema.names:
+            break
+    return dim, chain(peeked, batches)
+
+
+# -----------------------------
+# 2) embedding 컬럼 → float32 행렬 (복사 최소화)
+# -----------------------------
+def embedding_matrix(column: pa.Array, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    리스트 컬럼 → (행렬 (n, dim) float32, 유효 여부 마스크 (n,))  [parse_embedding_column 과 같은 반환]
+    - null 행, 값에 null/NaN 이 있는 행 → 마스크 False
+    - fixed_size_list<float32> 이고 null 이 없으면 값 버퍼를 그대로 reshape (복사 없음)
+    """
+    n = len(column)
+    field_type = column.type
+    if not (pa.types.is_fixed_size_list(field_type) or pa.types.is_list(field_type)
+            or pa.types.is_large_list(field_type)):
+        raise ValueError(f"embedding 컬럼은 실수 리스트여야 합니다. (got {field_type})")
+    if not pa.types.is_floating(field_type.value_type):
+        raise ValueError(f"embedding 값은 실수(float16/32/64)여야 합니다. (got {field_type.value_type})")
+
+    valid = np.ones(n, dtype=bool) if column.null_count == 0 else np.array(column.is_valid(), dtype=bool)
+    if pa.types.is_fixed_size_list(field_type):
+        if field_type.list_size != dim:
+            raise ValueError(f"embedding 길이가 {field_type.list_size} 입니다. (기대값: {dim})")
+    else:
+        lengths = column.value_lengths().to_numpy(zero_copy_only=False)
+        bad = np.flatnonzero(valid & (lengths != dim))
+        if bad.size:
+            raise ValueError(f"{bad[0]}번째 행의 embedding 길이가 {int(lengths[bad[0]])} 입니다. (기대값: {dim})")
+
+    # flatten 은 slice 오프셋과 null 행을 건너뛰고 값만 이어 붙임 (null 이 없으면 복사 없음)
+    values = column.flatten()
+    flat = np.asarray(values.to_numpy(zero_copy_only=False), dtype=np.float32)
+    rows = flat.reshape(-1, dim) if dim else np.zeros((int(valid.sum()), 0), dtype=np.float32)
+
+    if valid.all():
+        matrix = rows
+    else:
+        matrix = np.zeros((n, dim), dtype=np.float32)
+        matrix[valid] = rows
+    if values.null_count or not np.isfinite(rows).all():
+        valid &= np.isfinite(matrix).all(axis=1)
+    return matrix, valid
+
+
+def _strings(batch: pa.RecordBatch, name: str) -> list:
+    if name not in batch.schema.names:
+        return [None] * batch.num_rows
+    return batch.column(name).to_pylist()
+
+
+def iter_batch_rows(batch: pa.RecordBatch, dim: int) -> Iterator[Tuple[Optional[str], Optional[str], np.ndarray]]:
+    """
+    RecordBatch 의 각 행을 (title, description, 임베딩) 으로 하나씩 넘겨줍니다. (iter_design_rows 의 Arrow 판)
+    - 임베딩은 배치 행렬의 한 행 (big-endian float32, numpy 배열 그대로 COPY 바이너리로 전송)
+    """
+    n = batch.num_rows
+    titles = _strings(batch, "title")
+    descs = _strings(batch, "description")
+
+    if "embedding" in batch.schema.names:
+        matrix, mask = embedding_matrix(batch.column("embedding"), dim)
+        # 배치 전체를 한 번에 big-endian 으로 (to_pgvector_binary 가 행마다 바꾸지 않도록)
+        matrix = matrix.astype(">f4")
+    else:
+        matrix, mask = None, np.zeros(n, dtype=bool)
+
+    for i in range(n):
+        if mask[i]:
+            emb_vec = matrix[i]
+        else:
+            emb_vec = generate_embedding_from_text(descs[i] or "", dim=dim)
+
+        yield titles[i], descs[i], emb_vec
+
+
+# -----------------------------
+# 3) CSV → Parquet / Arrow 변환
+# -----------------------------
+def design_batch(titles, descs, matrix: np.ndarray, mask: np.ndarray) -> pa.RecordBatch:
+    """(title, description, embedding fixed_size_list<float32>[dim]) 배치, mask False 인 행의 embedding 은 null"""
+    dim = matrix.shape[1]
+    values = pa.array(np.ascontiguousarray(matrix, dtype=np.float32).reshape(-1))
+    embedding = pa.FixedSizeListArray.from_arrays(values, dim, mask=pa.array(~mask))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(titles, pa.string()), pa.array(descs, pa.string()), embedding], names=list(COLUMNS)
+    )
+
+
+def convert_csv(csv_path: str, out_path: str, chunksize: int = 10000) -> int:
+    """기존 CSV 를 Parquet / Arrow IPC 로 변환 (out_path 확장자로 형식 결정), 변환한 행 수 반환"""
+    fmt = input_format(out_path)
+    if fmt is None:
+        raise ValueError(f"출력 확장자는 {', '.join(ARROW_FORMATS)} 중 하나여야 합니다: {out_path}")
+
+    writer = None
+    dim = None
+    count = 0
+    try:
+        for df in iter_csv_chunks(csv_path, chunksize):
+            n = len(df)
+            # 차원은 import_csv_with_transaction 과 같이 첫 청크 기준 (임베딩이 없으면 기본 차원, 전부 null)
+            dim = dim or detect_embedding_dim(df) or DEFAULT_EMBEDDING_DIM
+            matrix, mask = parse_embedding_column(df["embedding"] if "embedding" in df else [None] * n, dim)
+            batch = design_batch(_text_column(df, "title"), _text_column(df, "description"), matrix, mask)
+            if writer is None:
+                if fmt == "parquet":
+                    writer = pq.ParquetWriter(out_path, batch.schema)
+                elif fmt == "ipc":
+                    writer = pa.ipc.new_file(out_path, batch.schema)
+                else:
+                    writer = pa.ipc.new_stream(out_path, batch.schema)
+            writer.write_batch(batch)
+            count += n
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def _text_column(df, name: str) -> list:
+    """DataFrame 컬럼 → 문자열 목록 (비어 있으면 None, 컬럼이 없으면 모두 None)"""
+    if name not in df:
+        return [None] * len(df)
+    return [None if pd.isna(v) else str(v) for v in df[name]]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("사용법: python arrow_input.py <입력.csv> <출력.parquet|.arrow|.arrows>")
+        sys.exit(1)
+    rows = convert_csv(sys.argv[1], sys.argv[2])
+    print(f"[INFO] {rows}행 변환 완료: {sys.argv[2]} ({os.path.getsize(sys.argv[2]) / 1e6:.1f}MB)")
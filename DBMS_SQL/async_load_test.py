@@ -0,0 +1,151 @@
+"""
+부하 테스트: 동기 서버(Fast_API.py) vs 비동기 서버(Fast_API_async.py)
+
+- 두 서버를 차례로 uvicorn 워커 1개로 띄우고, 같은 부하를 보내 비교합니다.
+    요청: POST /register_design (매번 다른 description → 서버에서 임베딩 생성 + INSERT + COMMIT)
+    동시성: LOAD_CONCURRENCY 의 각 값만큼 요청을 동시에 보냄 (in-flight 요청 수)
+- 동시성별 처리량(req/s), 지연시간(p50/p99), 상태코드/오류 건수를 나란히 출력합니다.
+- 서버는 INIT_RESET=1 로 시작하므로 design 테이블이 초기화됩니다. (테스트용 DB 에서 실행)
+
+실행:
+  python async_load_test.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD  -> 서버에 그대로 전달
+  LOAD_REQUESTS=2000            -> 동시성 단계별 총 요청 수
+  LOAD_CONCURRENCY=100,1000,2000 -> 동시 요청 수 (쉼표로 여러 단계)
+  LOAD_PORT=8765                -> 서버 포트
+  LOAD_TIMEOUT=120              -> 요청 1건 타임아웃(초)
+"""
+
+import asyncio
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+LOAD_REQUESTS = int(os.getenv("LOAD_REQUESTS", "2000"))
+LOAD_CONCURRENCY = [int(x) for x in os.getenv("LOAD_CONCURRENCY", "100,1000,2000").split(",") if x.strip()]
+LOAD_PORT = int(os.getenv("LOAD_PORT", "8765"))
+LOAD_TIMEOUT = float(os.getenv("LOAD_TIMEOUT", "120"))
+
+SERVERS = [
+    ("sync", "Fast_API:app"),
+    ("async", "Fast_API_async:app"),
+]
+
+BASE_URL = f"http://127.0.0.1:{LOAD_PORT}"
+
+# -----------------------------
+# 1) 서버 실행 / 종료
+# -----------------------------
+def start_server(app_path: str) -> subprocess.Popen:
+    env = {**os.environ, "INIT_RESET": "1"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path, "--port", str(LOAD_PORT),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+    # /metrics 가 응답하면 준비 완료 (startup 훅까지 끝난 상태)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{app_path} 서버가 시작 중 종료되었습니다. (exit {proc.returncode})")
+        try:
+            if httpx.get(f"{BASE_URL}/metrics", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{app_path} 서버가 60초 안에 준비되지 않았습니다.")
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+# -----------------------------
+# 2) 부하 생성 / 측정
+# -----------------------------
+async def run_load(name: str, concurrency: int) -> dict:
+    """concurrency 개의 요청을 동시에 유지하며 LOAD_REQUESTS 건 전송"""
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    next_i = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=LOAD_TIMEOUT) as client:
+        async def worker():
+            nonlocal next_i
+            while next_i < LOAD_REQUESTS:
+                i = next_i
+                next_i += 1
+                payload = {"title": f"load-{name}-{concurrency}-{i}",
+                           "description": f"부하 테스트 설계 {name} {concurrency} {i}"}
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.post("/register_design", json=payload)
+                    outcomes[str(resp.status_code)] += 1
+                except httpx.HTTPError as e:
+                    outcomes[type(e).__name__] += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    ok = outcomes.get("200", 0)
+    return {
+        "rps": ok / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else float("nan"),
+        "outcomes": dict(outcomes),
+        "elapsed": elapsed,
+    }
+
+def format_outcomes(outcomes: Dict[str, int]) -> str:
+    return ", ".join(f"{k}:{v}" for k, v in sorted(outcomes.items()))
+
+
+if __name__ == "__main__":
+    # 동시 연결 수만큼 파일 디스크립터가 필요 (클라이언트 + 서버)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = max(LOAD_CONCURRENCY) * 2 + 256
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+    results: Dict[str, Dict[int, dict]] = {}
+    for name, app_path in SERVERS:
+        proc = start_server(app_path)
+        try:
+            results[name] = {}
+            for concurrency in LOAD_CONCURRENCY:
+                r = asyncio.run(run_load(name, concurrency))
+                results[name][concurrency] = r
+                print(f"[{name}] 동시 {concurrency}: {r['rps']:.1f} req/s, "
+                      f"p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms ({format_outcomes(r['outcomes'])})")
+        finally:
+            stop_server(proc)
+
+    print("=" * 100)
+    print(f"POST /register_design, 동시성 단계별 {LOAD_REQUESTS}건, uvicorn 워커 1개")
+    print(f"{'동시':>6} | {'sync req/s':>10} {'p50 ms':>9} {'p99 ms':>9} | "
+          f"{'async req/s':>11} {'p50 ms':>9} {'p99 ms':>9} | 응답(sync / async)")
+    print("-" * 100)
+    for concurrency in LOAD_CONCURRENCY:
+        s, a = results["sync"][concurrency], results["async"][concurrency]
+        print(f"{concurrency:>6} | {s['rps']:>10.1f} {s['p50_ms']:>9.1f} {s['p99_ms']:>9.1f} | "
+              f"{a['rps']:>11.1f} {a['p50_ms']:>9.1f} {a['p99_ms']:>9.1f} | "
+              f"{format_outcomes(s['outcomes'])} / {format_outcomes(a['outcomes'])}")
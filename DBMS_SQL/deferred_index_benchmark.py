@@ -0,0 +1,107 @@
+"""
+인덱스 지연 생성 벤치마크: 인덱스를 둔 채 적재 vs 지우고 적재 후 재생성 + ANALYZE
+
+- 측정용 테이블(design_index_bench)에 Fast_API 와 같은 인덱스(HNSW 벡터 인덱스 + title btree)를 만들고
+- 같은 합성 CSV 를 적재 방식(BENCH_METHODS)별로
+    [immediate] 인덱스를 그대로 둔 채 적재 (행마다 HNSW 그래프 갱신)
+    [deferred]  import_csv_with_transaction(defer_indexes=True): 삭제 → 적재 → 재생성 → ANALYZE
+  으로 적재해 단계별 시간과 전체 시간을 비교합니다.
+- 테이블에 이미 행이 많고 이번에 넣는 행이 적으면, 재생성이 기존 행까지 다시 처리하므로 지연 생성이 오히려 느릴 수 있습니다.
+  (BENCH_BASE_ROWS 로 기존 행 수를 바꿔 확인)
+
+실행:
+  python deferred_index_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_ROWS=5000                   -> 적재할 행 수
+  BENCH_BASE_ROWS=0                 -> 적재 전에 테이블에 미리 넣어 둘 행 수
+  BENCH_DIM=384                     -> 벡터 차원
+  BENCH_METHODS=insert,copy_binary  -> 비교할 적재 방식
+  IMPORT_MAINTENANCE_WORK_MEM, IMPORT_PARALLEL_WORKERS -> 재생성 설정 (DBMS_SQL.py)
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from DBMS_SQL import connect_db, ensure_table, import_csv_with_transaction, load_rows_copy_binary
+from parallel_import_benchmark import make_csv
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "5000"))
+BENCH_BASE_ROWS = int(os.getenv("BENCH_BASE_ROWS", "0"))
+BENCH_DIM = int(os.getenv("BENCH_DIM", "384"))
+BENCH_METHODS = os.getenv("BENCH_METHODS", "insert,copy_binary").split(",")
+
+BENCH_TABLE = "design_index_bench"
+
+
+def prepare_table() -> None:
+    """테이블 새로 만들기 + 기존 행(BENCH_BASE_ROWS) + 인덱스"""
+    conn = connect_db()
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        ensure_table(conn, BENCH_DIM, BENCH_TABLE)
+        if BENCH_BASE_ROWS:
+            rng = np.random.default_rng(1)
+            mat = rng.uniform(-1, 1, size=(BENCH_BASE_ROWS, BENCH_DIM)).astype(np.float32)
+            with conn.cursor() as cur:
+                load_rows_copy_binary(cur, ((f"기존 {i}", "기존 설계", v) for i, v in enumerate(mat)), BENCH_TABLE)
+        conn.execute(f"CREATE INDEX {BENCH_TABLE}_embedding_hnsw ON {BENCH_TABLE} "
+                     f"USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);")
+        conn.execute(f"CREATE INDEX {BENCH_TABLE}_title_idx ON {BENCH_TABLE} (title);")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def drop_table() -> None:
+    conn = connect_db()
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def check_indexes() -> int:
+    conn = connect_db()
+    try:
+        rows = conn.execute(f"SELECT count(*) FROM {BENCH_TABLE};").fetchone()[0]
+        valid = conn.execute(
+            "SELECT count(*) FROM pg_index WHERE indrelid = to_regclass(%s) AND indisvalid;", (BENCH_TABLE,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert rows == BENCH_BASE_ROWS + BENCH_ROWS, "적재된 행 수가 다릅니다."
+    assert valid == 3, "인덱스(PK + HNSW + title)가 모두 있어야 합니다."
+    return rows
+
+
+def run(path: str, method: str, defer: bool) -> dict:
+    prepare_table()
+    t0 = time.perf_counter()
+    timings = import_csv_with_transaction(path, load_method=method, table=BENCH_TABLE, defer_indexes=defer)
+    timings["total"] = time.perf_counter() - t0
+    check_indexes()
+    return timings
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "designs.csv")
+        make_csv(path, BENCH_ROWS, BENCH_DIM)
+        try:
+            results = {(m, d): run(path, m, d) for m in BENCH_METHODS for d in (False, True)}
+        finally:
+            drop_table()
+
+    print("=" * 92)
+    print(f"적재 {BENCH_ROWS}행 (기존 {BENCH_BASE_ROWS}행), {BENCH_DIM}차원, 인덱스: HNSW(m=16, ef_construction=64) + title")
+    print(f"{'방식':<12} {'인덱스':<10} | {'삭제 s':>7} {'적재 s':>8} {'재생성 s':>9} {'ANALYZE s':>10} | {'전체 s':>8} {'rows/s':>8}")
+    print("-" * 92)
+    for (method, defer), t in results.items():
+        print(f"{method:<12} {'deferred' if defer else 'immediate':<10} | {t.get('drop_indexes', 0):>7.2f} "
+              f"{t['load']:>8.2f} {t.get('rebuild_total', 0):>9.2f} {t.get('analyze', 0):>10.2f} | "
+              f"{t['total']:>8.2f} {BENCH_ROWS / t['total']:>8,.0f}")
@@ -0,0 +1,111 @@
+"""
+design 등록용 SQL + CPU 쪽 준비 (Fast_API.py / Fast_API_async.py 공용, content_hash 는 DBMS_SQL.py 적재도 사용)
+
+동기 API 와 비동기 API 가 같은 SQL, 같은 전처리를 쓰도록 여기에 모으고,
+각 API 파일에는 연결을 빌려 실행하는 부분(동기 호출 / await)만 둡니다.
+- 중복 판정: content_hash, hash_lookup_args → FIND_BY_HASH_SQL → hash_ids
+- 1건 등록: INSERT_ROW_SQL (ON CONFLICT DO NOTHING RETURNING id)
+- 대량 등록: plan_bulk_inserts → pending_rows → RESERVE_IDS_SQL → reserved_ids → COPY_SQL + copy_rows
+    UniqueViolation 이면 conflict_hashes 로 다시 확인 후 1번 재시도
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from embedding_storage import EMBEDDING_STORAGE, vector_param
+
+# -----------------------------
+# 1) 중복 판정
+# -----------------------------
+def content_hash(title: str, description: str) -> bytes:
+    """
+    중복 판정용 해시 (title, description 이 모두 같으면 같은 값)
+    - JSON 배열로 묶어서 해시 → 구분자가 내용에 섞여도 다른 쌍과 겹치지 않음
+    """
+    return hashlib.sha256(json.dumps([title, description], ensure_ascii=False).encode("utf-8")).digest()
+
+def row_hash(title, description) -> Optional[bytes]:
+    """적재용: title, description 이 둘 다 문자열이면 content_hash, 아니면(CSV 빈 칸 등) None"""
+    if isinstance(title, str) and isinstance(description, str):
+        return content_hash(title, description)
+    return None
+
+FIND_BY_HASH_SQL = "SELECT content_hash, id FROM design WHERE content_hash = ANY(%s);"
+
+def hash_lookup_args(hashes: Sequence[Optional[bytes]]) -> Optional[Tuple[List[bytes]]]:
+    """FIND_BY_HASH_SQL 파라미터 (None 제외, 중복 제거), 찾을 해시가 없으면 None → 조회 생략"""
+    wanted = list({h for h in hashes if h is not None})
+    return (wanted,) if wanted else None
+
+def hash_ids(rows) -> Dict[bytes, int]:
+    """FIND_BY_HASH_SQL 결과 → content_hash → 이미 저장된 design id"""
+    return {bytes(h): rid for h, rid in rows}
+
+# -----------------------------
+# 2) 1건 등록
+# -----------------------------
+# 충돌 대상을 지정하지 않은 ON CONFLICT DO NOTHING: 유니크 인덱스가 아직 백그라운드에서 생성 중이어도 오류 없이 동작
+# RETURNING 이 비어 있으면 다른 요청이 같은 내용을 먼저 저장한 것 → FIND_BY_HASH_SQL 로 그 id 조회
+# 임베딩은 vector 로 전송되므로 EMBEDDING_STORAGE 타입으로 명시적 캐스팅 (halfvec 이면 %s::halfvec)
+INSERT_ROW_SQL = f"""
+    INSERT INTO design (title, description, content_hash, embedding)
+    VALUES (%s, %s, %s, {vector_param()})
+    ON CONFLICT DO NOTHING
+    RETURNING id;
+"""
+
+# -----------------------------
+# 3) 대량 등록 (COPY)
+# -----------------------------
+# COPY 는 RETURNING 이 없으므로, 시퀀스에서 id 를 먼저 n개 받아 입력 순서대로 지정
+# COPY 에는 ON CONFLICT 가 없으므로 중복은 plan_bulk_inserts 로 미리 걸러서 넘김
+RESERVE_IDS_SQL = "SELECT nextval(pg_get_serial_sequence('design', 'id')) FROM generate_series(1, %s)"
+COPY_SQL = "COPY design (id, title, description, content_hash, embedding) FROM STDIN (FORMAT BINARY)"
+
+def copy_types(storage: str = EMBEDDING_STORAGE) -> List[str]:
+    """COPY_SQL 의 set_types (embedding 은 vector / halfvec)"""
+    return ["int8", "text", "text", "bytea", storage]
+
+def reserved_ids(rows) -> List[int]:
+    """RESERVE_IDS_SQL 결과 → 오름차순 id (입력 순서대로 붙이면 id 순서 = 입력 순서)"""
+    return sorted(row[0] for row in rows)
+
+def copy_rows(ids: Sequence[int], designs, hashes: Sequence[Optional[bytes]], embeddings) -> Iterator[Tuple]:
+    """COPY_SQL 로 보낼 행 (id, title, description, content_hash, embedding)"""
+    for new_id, d, digest, emb in zip(ids, designs, hashes, embeddings):
+        yield new_id, d.title, d.description, digest, emb
+
+def plan_bulk_inserts(digests: List[Optional[bytes]], known: Dict[bytes, int]) -> List[int]:
+    """새로 저장할 항목 위치: DB 에 없는 내용 중 요청 안에서 처음 나온 것만"""
+    pending: List[int] = []
+    seen = set()
+    for i, digest in enumerate(digests):
+        if digest is None:
+            pending.append(i)
+        elif digest not in known and digest not in seen:
+            seen.add(digest)
+            pending.append(i)
+    return pending
+
+def pending_rows(pending: List[int], digests: List[Optional[bytes]], known: Dict[bytes, int]) -> List[int]:
+    """이번 시도에 COPY 할 pending 안의 위치 (재시도면 그 사이 다른 요청이 저장한 내용은 제외)"""
+    return [j for j, i in enumerate(pending) if digests[i] is None or digests[i] not in known]
+
+def copy_batch(
+    designs, digests: List[Optional[bytes]], embeddings: List[Any], pending: List[int], rows: List[int]
+) -> Tuple[List[Any], List[Optional[bytes]], List[Any]]:
+    """pending_rows 위치의 (항목, content_hash, 임베딩) 목록 → insert_designs_copy 인자"""
+    return (
+        [designs[pending[j]] for j in rows],
+        [digests[pending[j]] for j in rows],
+        [embeddings[j] for j in rows],
+    )
+
+def conflict_hashes(digests: List[Optional[bytes]], pending: List[int], rows: List[int]) -> List[Optional[bytes]]:
+    """UniqueViolation 뒤 다시 확인할 해시 (이번 시도에 넣으려던 행들)"""
+    return [digests[pending[j]] for j in rows]
+
+def inserted_ids(pending: List[int], rows: List[int], new_ids: List[int]) -> Dict[int, int]:
+    """정상 항목 위치 → 새 id"""
+    return {pending[j]: new_id for j, new_id in zip(rows, new_ids)}
@@ -0,0 +1,83 @@
+"""
+학습용 더미 임베딩 생성기 (Fast_API.py / DBMS_SQL.py 공용)
+
+- '항상 같은 텍스트 -> 같은 벡터'가 되도록 sin 함수로 만든 의사난수 벡터
+    값[i] = (sin(base * (i + 1)) + 1) / 2,  base = 텍스트 글자 코드의 합
+- 차원 전체를 numpy 로 한 번에 계산하고 float32 배열로 돌려줍니다.
+- (text, dim) 기준 LRU 캐시: 같은 설명이 반복되면 다시 계산하지 않습니다.
+  캐시된 배열은 공유되므로 읽기 전용입니다. (수정하려면 .copy())
+- 메모리 캐시에 없으면 디스크 캐시(embedding_store.py, 설정 시)를 먼저 찾아봅니다.
+
+환경변수:
+  EMBEDDING_CACHE_SIZE=4096  -> 캐시에 보관할 최대 벡터 수 (0이면 캐시 끔)
+  EMBEDDING_STORE_PATH       -> 디스크 캐시 파일 경로 (embedding_store.py 참고)
+"""
+
+import os
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from embedding_store import open_default_store
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+# 디스크 캐시 키에 쓰이는 모델 이름 (계산식을 바꾸면 이름도 바꿔야 예전 벡터와 섞이지 않음)
+DUMMY_MODEL_NAME = "dummy-sin-v1"
+
+
+def _compute(text: str, dim: int) -> np.ndarray:
+    # 글자 코드 합: 파이썬 for 문 대신 UTF-32 바이트를 정수 배열로 보고 한 번에 합산
+    base = int(np.frombuffer(text.encode("utf-32-le"), dtype="<u4").sum(dtype=np.int64))
+    return ((np.sin(base * np.arange(1, dim + 1, dtype=np.float64)) + 1) / 2.0).astype(np.float32)
+
+
+@lru_cache(maxsize=EMBEDDING_CACHE_SIZE)
+def _embedding_for(text: str, dim: int) -> np.ndarray:
+    store = open_default_store()
+    if store is not None:
+        vec = store.get_or_compute(DUMMY_MODEL_NAME, [text], dim, lambda ts: [_compute(ts[0], dim)])[0]
+    else:
+        vec = _compute(text, dim)
+    vec.setflags(write=False)
+    return vec
+
+
+def generate_embedding_from_text(text: str, dim: int) -> np.ndarray:
+    """
+    실제 서비스에서는 OpenAI/HuggingFace 모델 사용.
+    여기선 텍스트를 시드로 한 의사난수 벡터(float32, 길이 dim)를 만듭니다.
+    """
+    return _embedding_for(text or "", dim)
+
+
+def generate_embeddings_batch(texts: List[str], dim: int) -> np.ndarray:
+    """여러 텍스트를 한 번에 임베딩 → (len(texts), dim) float32 행렬"""
+    if not texts:
+        return np.empty((0, dim), dtype=np.float32)
+    return np.stack([generate_embedding_from_text(t, dim) for t in texts])
+
+
+def embedding_cache_stats() -> dict:
+    """
+    메모리 LRU 캐시 적중/미스 통계 (import 로그, 모니터링용)
+    디스크 캐시를 쓰는 경우 "store" 에 디스크 캐시 통계가 함께 들어갑니다.
+    """
+    info = _embedding_for.cache_info()
+    total = info.hits + info.misses
+    stats = {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
+    store = open_default_store()
+    if store is not None:
+        stats["store"] = store.stats()
+    return stats
+
+
+def clear_embedding_cache() -> None:
+    _embedding_for.cache_clear()
@@ -0,0 +1,85 @@
+"""
+embedding 컬럼 파서 마이크로 벤치마크
+- 기존: parse_embedding_field (행마다 ast.literal_eval + float() 리스트 컴프리헨션)
+- 신규: parse_embedding_column (컬럼 전체를 numpy 로 한 번에 float32 행렬로 파싱)
+
+두 결과가 같은지(NaN/빈 값 처리 포함) 먼저 확인한 뒤 시간을 비교합니다.
+DB 연결은 필요 없습니다.
+
+실행:
+  python embedding_parser_benchmark.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from DBMS_SQL import CSV_PATH, parse_embedding_column, parse_embedding_field
+
+REPEAT = 5
+
+
+def make_synthetic_column(rows: int, dim: int) -> list:
+    """'[0.123456, ...]' 문자열 컬럼 + 중간중간 NaN/빈 문자열/nan·inf 가 든 값 섞기"""
+    rng = np.random.default_rng(0)
+    mat = rng.uniform(-1, 1, size=(rows, dim))
+    col = ["[" + ", ".join(f"{x:.6f}" for x in row) + "]" for row in mat]
+    for i in range(0, rows, 50):
+        col[i] = float("nan")
+    for i in range(25, rows, 50):
+        col[i] = "   "
+    for i in range(10, rows, 100):
+        col[i] = col[i].replace(", ", ", nan, ", 1).rsplit(",", 1)[0] + "]"
+    for i in range(60, rows, 100):
+        col[i] = "[inf" + col[i][col[i].index(","):]
+    return col
+
+
+def run_old(col) -> list:
+    return [parse_embedding_field(v) for v in col]
+
+
+def run_new(col):
+    return parse_embedding_column(col)
+
+
+def best_of(fn, col) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(col)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def check_same(col):
+    old = run_old(col)
+    matrix, mask = run_new(col)
+    assert [v is not None for v in old] == mask.tolist(), "NaN/빈 값 처리 결과가 다릅니다."
+    expected = np.array([v for v in old if v is not None], dtype=np.float32)
+    assert np.array_equal(matrix[mask], expected), "파싱된 값이 다릅니다."
+
+
+# 경계 사례: 값 안의 nan/inf, 숫자가 아닌 글자 (모두 parse_embedding_field 와 같아야 함)
+EDGE_CASES = ["[1, nan, 2]", "[inf, 1, 2]", "[1, 2, -inf]", "[1, 2, 3]", "[1, x, 2]", float("nan"), ""]
+
+
+def report(title: str, col):
+    check_same(col)
+    t_old = best_of(run_old, col)
+    t_new = best_of(run_new, col)
+    print("-" * 70)
+    print(title)
+    print(f"  기존(literal_eval) : {t_old * 1000:9.2f} ms")
+    print(f"  신규(numpy 일괄)   : {t_new * 1000:9.2f} ms")
+    print(f"  속도 향상          : {t_old / t_new:9.1f} 배")
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(f"embedding 파서 비교 (각 {REPEAT}회 중 최솟값)")
+    check_same(EDGE_CASES)
+    print("경계 사례(nan/inf/빈 값/깨진 값) 결과 일치")
+    report(f"{CSV_PATH} (384차원)", pd.read_csv(CSV_PATH)["embedding"].tolist())
+    report("합성 데이터 2,000행 x 1536차원 (NaN/빈 값 4%, nan·inf 가 든 값 2% 포함)", make_synthetic_column(2000, 1536))
@@ -0,0 +1,72 @@
+"""
+임베딩 전송 형식 벤치마크: JSON 숫자 배열 vs base64(float32) vs octet-stream(float32 원본)
+
+- /register_design 이 본문을 받아 float32 배열을 만들기까지의 작업만 비교합니다.
+    JSON 배열 : json.loads → RegisterDesignRequest 검증(원소별 float) → float32 배열
+    base64    : json.loads → RegisterDesignRequest 검증(base64 디코딩) → float32 배열
+    binary    : 본문 바이트 → float32 배열 (복사 없음)
+- 요청 본문 크기(bytes)와 요청 1건당 CPU 시간(us)을 출력합니다.
+DB 연결은 필요 없습니다.
+
+실행:
+  python embedding_payload_benchmark.py
+환경변수:
+  BENCH_REPEAT=5000  -> 형식별 반복 횟수
+"""
+
+import base64
+import json
+import os
+import time
+
+import numpy as np
+
+from Fast_API import EMBEDDING_DIM, RegisterDesignRequest, decode_embedding_b64
+from pgvector_adapter import from_float32_bytes
+
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "5000"))
+
+
+def make_bodies(vec: np.ndarray) -> dict:
+    base = {"title": "모듈러 주택", "description": "빠른 시공과 유지보수를 고려한 설계"}
+    return {
+        "JSON 배열": json.dumps({**base, "embedding": [float(x) for x in vec]}).encode(),
+        "base64": json.dumps({**base, "embedding_b64": base64.b64encode(vec.astype("<f4").tobytes()).decode()}).encode(),
+        "binary": vec.astype("<f4").tobytes(),
+    }
+
+def decode_json(body: bytes) -> np.ndarray:
+    # 실제 요청은 매번 다른 문자열이므로 디코딩 캐시를 비우고 측정 (검증 1회 디코딩 + 저장 시 캐시 적중)
+    decode_embedding_b64.cache_clear()
+    return RegisterDesignRequest(**json.loads(body)).embedding_vector()
+
+def decode_binary(body: bytes) -> np.ndarray:
+    return from_float32_bytes(body, EMBEDDING_DIM)
+
+def measure(fn, body: bytes) -> float:
+    """요청 1건당 CPU 시간(us)"""
+    fn(body)  # 첫 호출 워밍업은 측정에서 제외
+    cpu0 = time.process_time()
+    for _ in range(BENCH_REPEAT):
+        fn(body)
+    return (time.process_time() - cpu0) / BENCH_REPEAT * 1e6
+
+
+if __name__ == "__main__":
+    vec = np.random.default_rng(0).uniform(-1, 1, EMBEDDING_DIM).astype(np.float32)
+    bodies = make_bodies(vec)
+
+    # 세 형식 모두 같은 벡터가 나오는지 먼저 확인
+    for name, body in bodies.items():
+        out = decode_binary(body) if name == "binary" else decode_json(body)
+        assert np.array_equal(out, vec), name
+
+    print("=" * 60)
+    print(f"{EMBEDDING_DIM}차원 임베딩 1건, {BENCH_REPEAT}회 반복")
+    print(f"{'형식':<10} {'본문 bytes':>12} {'CPU us/건':>12} {'CPU 배율':>10}")
+    print("-" * 60)
+    baseline = None
+    for name, body in bodies.items():
+        us = measure(decode_binary if name == "binary" else decode_json, body)
+        baseline = baseline or us
+        print(f"{name:<10} {len(body):>12} {us:>12.1f} {baseline / us:>9.1f}x")
@@ -0,0 +1,160 @@
+"""
+design.embedding 저장 형식 (Fast_API.py / Fast_API_async.py / DBMS_SQL.py / schema_migration.py 공용)
+
+float32 vector(1536) 는 행마다 6KB 이고 HNSW 인덱스도 그만큼 커서, 테이블과 인덱스가 메모리에 다 들어가지 않습니다.
+- EMBEDDING_STORAGE=vector   -> VECTOR(dim), float32 (기존, 차원당 4바이트)
+- EMBEDDING_STORAGE=halfvec  -> HALFVEC(dim), float16 (차원당 2바이트 → 테이블/HNSW 인덱스 약 절반)
+    문장 임베딩 값 범위에서는 float16 반올림 오차가 작아 검색 순위가 거의 바뀌지 않음
+    절댓값이 HALFVEC_MAX(65504)를 넘는 값은 float16 으로 표현할 수 없음 → check_range 로 요청 단계에서 거부
+- EMBEDDING_BQ_INDEX=1       -> 벡터 HNSW 인덱스 대신 이진 양자화 인덱스 (차원당 1비트, 인덱스 크기 1/32)
+    binary_quantize(embedding)::bit(dim) 식 인덱스 (별도 컬럼 없이 인덱스만)
+    검색: 해밍 거리로 후보 K x EMBEDDING_BQ_RERANK 개 → 원래 벡터의 코사인 거리로 다시 정렬해 K개
+halfvec / binary_quantize 는 pgvector 0.7.0 이상에서만 사용 가능 (check_support 로 확인)
+
+환경변수:
+  EMBEDDING_STORAGE=vector   -> vector / halfvec
+  EMBEDDING_BQ_INDEX=0       -> 1이면 이진 양자화 인덱스 + 다시 정렬
+  EMBEDDING_BQ_RERANK=4      -> 다시 정렬할 후보 수 = K x 이 값 (클수록 정확, 느림)
+
+사용:
+  f"embedding {column_type(dim)}"        # CREATE TABLE
+  f"VALUES (%s, {vector_param()})"        # INSERT (halfvec 이면 %s::halfvec)
+  cur.execute(search_sql(dim), {"q": q_vec, "k": k, "candidates": candidate_count(k)})
+"""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+EMBEDDING_STORAGE = os.getenv("EMBEDDING_STORAGE", "vector")
+EMBEDDING_BQ_INDEX = os.getenv("EMBEDDING_BQ_INDEX", "0") == "1"
+EMBEDDING_BQ_RERANK = int(os.getenv("EMBEDDING_BQ_RERANK", "4"))
+
+STORAGES = ("vector", "halfvec")
+
+# halfvec, binary_quantize, bit_hamming_ops 가 들어간 버전
+_MIN_PGVECTOR = (0, 7, 0)
+
+# float16 로 표현할 수 있는 가장 큰 절댓값 (넘으면 inf 가 되어 DB 가 거부)
+HALFVEC_MAX = float(np.finfo(np.float16).max)
+
+if EMBEDDING_STORAGE not in STORAGES:
+    raise ValueError(f"EMBEDDING_STORAGE 는 {STORAGES} 중 하나여야 합니다: {EMBEDDING_STORAGE!r}")
+
+
+class StorageNotSupported(Exception):
+    pass
+
+
+# -----------------------------
+# 1) DDL 조각
+# -----------------------------
+def column_type(dim: int, storage: str = EMBEDDING_STORAGE) -> str:
+    """CREATE TABLE / ALTER COLUMN 용 타입 (예: VECTOR(384), HALFVEC(384))"""
+    return f"{storage.upper()}({int(dim)})"
+
+
+def cosine_ops(storage: str = EMBEDDING_STORAGE) -> str:
+    """HNSW 코사인 거리 연산자 클래스"""
+    return f"{storage}_cosine_ops"
+
+
+def bq_expression(dim: int) -> str:
+    """이진 양자화 식 (인덱스 정의와 검색 ORDER BY 가 글자 그대로 같아야 인덱스를 씀)"""
+    return f"(binary_quantize(embedding)::bit({int(dim)}))"
+
+
+def check_support(conn, storage: str = EMBEDDING_STORAGE, bq: bool = EMBEDDING_BQ_INDEX) -> None:
+    """halfvec / 이진 양자화를 쓰는데 pgvector 가 0.7.0 미만이면 StorageNotSupported"""
+    if storage == "vector" and not bq:
+        return
+    row = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector';").fetchone()
+    version = _parse_version(row[0]) if row else None
+    if version is None or version < _MIN_PGVECTOR:
+        wanted = ([storage] if storage != "vector" else []) + (["binary_quantize"] if bq else [])
+        raise StorageNotSupported(
+            f"{' + '.join(wanted)} 는 pgvector 0.7.0 이상이 필요합니다. (설치된 버전: {row[0] if row else '없음'}, "
+            f"EMBEDDING_STORAGE=vector, EMBEDDING_BQ_INDEX=0 으로 실행하거나 ALTER EXTENSION vector UPDATE)"
+        )
+
+
+def _parse_version(text: str) -> Optional[Tuple[int, ...]]:
+    try:
+        return tuple(int(x) for x in text.split(".")[:3])
+    except ValueError:
+        return None
+
+
+def column_storage(cur, table: str = "design") -> str:
+    """이미 있는 테이블의 embedding 컬럼 타입 이름 (COPY BINARY 의 set_types 용: vector / halfvec)"""
+    cur.execute(
+        """
+        SELECT t.typname
+        FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attrelid = to_regclass(%s) AND a.attname = 'embedding' AND NOT a.attisdropped;
+        """,
+        (table,),
+    )
+    row = cur.fetchone()
+    return row[0] if row else "vector"
+
+
+# -----------------------------
+# 2) 벡터 파라미터 / 검색 SQL
+# -----------------------------
+def vector_param(storage: str = EMBEDDING_STORAGE, name: Optional[str] = None) -> str:
+    """
+    벡터 파라미터 자리 + 컬럼 타입 캐스팅 (예: %s::halfvec, %(q)s::halfvec)
+    - numpy 배열은 vector(float32 바이너리)로 전송되므로 halfvec 컬럼이면 SQL 에서 명시적으로 변환
+    """
+    placeholder = f"%({name})s" if name else "%s"
+    return f"{placeholder}::{storage}"
+
+
+def candidate_count(k: int, bq: bool = EMBEDDING_BQ_INDEX) -> int:
+    """인덱스에서 꺼낼 후보 수 (이진 양자화면 다시 정렬할 만큼 넉넉히, hnsw.ef_search 도 이 이상이어야 함)"""
+    return k * max(1, EMBEDDING_BQ_RERANK) if bq else k
+
+
+def search_sql(dim: int, storage: str = EMBEDDING_STORAGE, bq: bool = EMBEDDING_BQ_INDEX,
+               table: str = "design") -> str:
+    """
+    코사인 유사도 Top-K 쿼리 (파라미터: q = 검색 벡터(numpy), k, candidates = candidate_count(k))
+    - 검색 벡터는 vector 로 전송되므로 컬럼 타입으로 캐스팅 (halfvec 컬럼이면 halfvec 끼리 비교)
+    - bq: 이진 양자화 인덱스로 후보를 뽑고, 원래 벡터 거리로 다시 정렬
+    """
+    q = vector_param(storage, "q")
+    if not bq:
+        return f"""
+    SELECT id, title, 1 - (embedding <=> {q}) AS similarity
+    FROM {table}
+    ORDER BY embedding <=> {q}
+    LIMIT %(k)s;
+    """
+    return f"""
+    SELECT id, title, 1 - (embedding <=> {q}) AS similarity
+    FROM (
+        SELECT id, title, embedding
+        FROM {table}
+        ORDER BY {bq_expression(dim)} <~> binary_quantize({q})
+        LIMIT %(candidates)s
+    ) candidates
+    ORDER BY embedding <=> {q}
+    LIMIT %(k)s;
+    """
+
+
+# -----------------------------
+# 3) 입력 값 범위
+# -----------------------------
+def check_range(values, storage: str = EMBEDDING_STORAGE) -> None:
+    """
+    halfvec 저장이면 모든 값의 절댓값이 HALFVEC_MAX 이하인지 확인, 아니면 ValueError (API 에서 422)
+    - 확인하지 않으면 INSERT/검색의 ::halfvec 변환에서 DB 오류(500)가 남
+    """
+    if storage != "halfvec":
+        return
+    arr = np.asarray(values, dtype=np.float32)
+    if not (np.abs(arr) <= HALFVEC_MAX).all():
+        raise ValueError(f"halfvec 저장에서는 embedding 값의 절댓값이 {HALFVEC_MAX:g} 이하여야 합니다.")
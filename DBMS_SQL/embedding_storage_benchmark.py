@@ -0,0 +1,170 @@
+"""
+임베딩 저장 형식 벤치마크: vector / halfvec x HNSW / 이진 양자화 HNSW (embedding_storage.py)
+
+- 군집이 있는 합성 벡터(BENCH_ROWS 행, 문장 임베딩처럼 정규화)를 형식별 측정용 테이블(design_storage_bench)에
+    COPY 바이너리로 적재 → 인덱스 생성 → 인덱스가 있는 상태에서 행마다 INSERT + COMMIT (API 등록과 같은 경로)
+  한 뒤 테이블/인덱스 크기, 적재 속도, 검색 recall@K(numpy 전수 코사인 검색 기준)와 검색 지연을 비교합니다.
+- 이진 양자화는 해밍 거리로 K x EMBEDDING_BQ_RERANK 개 후보를 뽑아 원래 벡터로 다시 정렬합니다.
+- pgvector 가 0.7.0 미만이면 halfvec / 이진 양자화 형식은 건너뜁니다.
+
+실행:
+  python embedding_storage_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_ROWS=20000      -> COPY 로 적재할 행 수
+  BENCH_INSERTS=500     -> 인덱스가 있는 상태에서 INSERT 할 행 수
+  BENCH_DIM=1536        -> 벡터 차원
+  BENCH_QUERIES=200     -> 검색 횟수
+  BENCH_K=10            -> recall@K 의 K
+  HNSW_M=16, HNSW_EF_CONSTRUCTION=64, HNSW_EF_SEARCH=40 -> 인덱스 설정 (Fast_API.py 와 같음)
+  EMBEDDING_BQ_RERANK=4 -> 이진 양자화 후보 배수
+"""
+
+import os
+import time
+
+import numpy as np
+
+from DBMS_SQL import connect_db
+from embedding_storage import (
+    STORAGES, StorageNotSupported, bq_expression, candidate_count, check_support, column_type, cosine_ops,
+    search_sql,
+)
+from pgvector_adapter import register_vector_binary
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+BENCH_INSERTS = int(os.getenv("BENCH_INSERTS", "500"))
+BENCH_DIM = int(os.getenv("BENCH_DIM", "1536"))
+BENCH_QUERIES = int(os.getenv("BENCH_QUERIES", "200"))
+BENCH_K = int(os.getenv("BENCH_K", "10"))
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+
+BENCH_TABLE = "design_storage_bench"
+BENCH_INDEX = f"{BENCH_TABLE}_embedding_idx"
+
+# (저장 형식, 이진 양자화 인덱스 여부)
+CONFIGS = [(storage, bq) for bq in (False, True) for storage in STORAGES]
+
+
+# -----------------------------
+# 1) 합성 데이터 + 정답(전수 검색)
+# -----------------------------
+def make_vectors(rows: int, dim: int, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    """군집 중심 + 잡음, 길이 1로 정규화 (균일 난수보다 실제 임베딩에 가까운 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    mat = centers[rng.integers(0, clusters, size=rows)] + rng.normal(scale=0.6, size=(rows, dim))
+    mat /= np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat.astype(np.float32)
+
+
+def exact_top_k(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """코사인 유사도 상위 K 개의 id (BIGSERIAL 이라 행 번호 + 1)"""
+    scores = queries @ data.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return top + 1
+
+
+# -----------------------------
+# 2) 형식별 측정
+# -----------------------------
+def run(storage: str, bq: bool, data: np.ndarray, queries: np.ndarray, truth: np.ndarray) -> dict:
+    conn = connect_db()
+    try:
+        conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        check_support(conn, storage, bq)
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.execute(f"CREATE TABLE {BENCH_TABLE} "
+                     f"(id BIGSERIAL PRIMARY KEY, title TEXT, embedding {column_type(BENCH_DIM, storage)});")
+        conn.commit()
+        register_vector_binary(conn)
+
+        # 2-1) COPY 바이너리 적재 (인덱스 없음)
+        base, extra = data[:BENCH_ROWS], data[BENCH_ROWS:]
+        t0 = time.perf_counter()
+        with conn.cursor() as cur:
+            with cur.copy(f"COPY {BENCH_TABLE} (title, embedding) FROM STDIN (FORMAT BINARY)") as copy:
+                copy.set_types(["text", storage])
+                for i, v in enumerate(base):
+                    copy.write_row((f"bench-{i}", v))
+        conn.commit()
+        copy_seconds = time.perf_counter() - t0
+
+        # 2-2) 인덱스 생성
+        options = f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+        column = f"{bq_expression(BENCH_DIM)} bit_hamming_ops" if bq else f"embedding {cosine_ops(storage)}"
+        t0 = time.perf_counter()
+        conn.execute(f"CREATE INDEX {BENCH_INDEX} ON {BENCH_TABLE} USING hnsw ({column}) {options};")
+        conn.commit()
+        index_seconds = time.perf_counter() - t0
+
+        # 2-3) 인덱스가 있는 상태에서 1행씩 INSERT + COMMIT (numpy 파라미터는 vector 로 전송 → 컬럼 타입으로 변환)
+        t0 = time.perf_counter()
+        for i, v in enumerate(extra, start=BENCH_ROWS):
+            conn.execute(f"INSERT INTO {BENCH_TABLE} (title, embedding) VALUES (%s, %s);", (f"bench-{i}", v))
+            conn.commit()
+        insert_seconds = time.perf_counter() - t0
+
+        conn.execute(f"ANALYZE {BENCH_TABLE};")
+        table_bytes, index_bytes = conn.execute(
+            "SELECT pg_table_size(%s), pg_relation_size(%s);", (BENCH_TABLE, BENCH_INDEX)
+        ).fetchone()
+        conn.commit()
+
+        # 2-4) 검색: recall@K + 지연
+        sql = search_sql(BENCH_DIM, storage, bq, BENCH_TABLE)
+        params = {"k": BENCH_K, "candidates": candidate_count(BENCH_K, bq)}
+        ef_search = max(HNSW_EF_SEARCH, params["candidates"])
+        latencies, hits = [], 0
+        for q, expected in zip(queries, truth):
+            t0 = time.perf_counter()
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute("SELECT set_config('hnsw.ef_search', %s, true);", (str(ef_search),))
+                cur.execute(sql, {**params, "q": q})
+                found = [row[0] for row in cur.fetchall()]
+            latencies.append(time.perf_counter() - t0)
+            hits += len(set(found) & set(expected.tolist()))
+        conn.commit()
+    finally:
+        conn.rollback()
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+        conn.close()
+
+    return {
+        "copy_rps": len(base) / copy_seconds,
+        "index_seconds": index_seconds,
+        "insert_rps": len(extra) / insert_seconds if len(extra) else 0.0,
+        "table_mb": table_bytes / 1e6,
+        "index_mb": index_bytes / 1e6,
+        "recall": hits / (len(queries) * BENCH_K),
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    data = make_vectors(BENCH_ROWS + BENCH_INSERTS, BENCH_DIM)
+    # 검색 벡터: 같은 분포에서 새로 뽑음 (데이터와 겹치지 않게 다른 seed)
+    queries = make_vectors(BENCH_QUERIES, BENCH_DIM, seed=1)
+    truth = exact_top_k(data, queries, BENCH_K)
+
+    results = {}
+    for storage, bq in CONFIGS:
+        try:
+            results[(storage, bq)] = run(storage, bq, data, queries, truth)
+        except StorageNotSupported as e:
+            print(f"[SKIP] {storage}{' + 이진 양자화' if bq else ''}: {e}")
+
+    print("=" * 112)
+    print(f"{BENCH_ROWS}행 COPY + {BENCH_INSERTS}행 INSERT, {BENCH_DIM}차원, HNSW(m={HNSW_M}, "
+          f"ef_construction={HNSW_EF_CONSTRUCTION}, ef_search={HNSW_EF_SEARCH}), 검색 {BENCH_QUERIES}회, K={BENCH_K}")
+    print(f"{'형식':<10} {'인덱스':<8} | {'테이블 MB':>9} {'인덱스 MB':>9} | {'COPY rows/s':>11} {'인덱스 s':>8} "
+          f"{'INSERT rows/s':>13} | {'recall@K':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    print("-" * 112)
+    for (storage, bq), r in results.items():
+        print(f"{storage:<10} {'bq' if bq else 'hnsw':<8} | {r['table_mb']:>9.1f} {r['index_mb']:>9.1f} | "
+              f"{r['copy_rps']:>11,.0f} {r['index_seconds']:>8.2f} {r['insert_rps']:>13,.0f} | "
+              f"{r['recall']:>8.3f} {r['p50_ms']:>7.2f} {r['p95_ms']:>7.2f}")
@@ -0,0 +1,206 @@
+"""
+디스크 임베딩 캐시 (SQLite 파일 1개)
+
+같은 텍스트를 실행할 때마다 다시 임베딩하지 않도록, (모델 이름 + 차원 + 텍스트 해시) 를 키로
+float32 벡터를 로컬 파일에 저장해 두고 encode/generate_embedding_from_text 전에 먼저 찾아봅니다.
+
+- 공용: Fast_API.py / DBMS_SQL.py (dummy_embedding.py 경유), AI_Design 등록 API,
+        MLOps_Python/sentecnetransformer.py
+- 용량 제한: 전체 벡터 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 항목부터 삭제(LRU)
+    전체 크기는 파일 안의 embedding_meta 1행에 저장하고 쓰기 트랜잭션(BEGIN IMMEDIATE) 안에서 읽고 고치므로,
+    여러 프로세스(uvicorn 워커 등)가 같은 파일을 써도 합계 max_bytes 를 지킴
+- 통계: hits / misses / hit_rate / entries / bytes
+
+환경변수:
+  EMBEDDING_STORE_PATH=               -> SQLite 파일 경로 (비어 있으면 디스크 캐시 사용 안 함)
+  EMBEDDING_STORE_MAX_MB=512          -> 최대 저장 용량(MB)
+
+사용:
+  store = open_default_store()       # 설정이 없으면 None
+  vecs = store.get_or_compute("all-MiniLM-L6-v2", texts, 384, model.encode)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_STORE_PATH = os.getenv("EMBEDDING_STORE_PATH", "")
+EMBEDDING_STORE_MAX_MB = float(os.getenv("EMBEDDING_STORE_MAX_MB", "512"))
+
+# 용량 초과 시 이 비율까지 줄여서, 매 저장마다 삭제가 일어나지 않도록 함
+_EVICT_TARGET_RATIO = 0.9
+
+
+def make_key(model: str, dim: int, text: str) -> bytes:
+    return hashlib.sha256(f"{model}\0{dim}\0{text}".encode("utf-8")).digest()
+
+
+class EmbeddingStore:
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL;")
+        self._db.execute("PRAGMA synchronous=NORMAL;")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key       BLOB PRIMARY KEY,
+                model     TEXT NOT NULL,
+                dim       INTEGER NOT NULL,
+                vec       BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);")
+        # 전체 벡터 크기 (프로세스마다 따로 세지 않고 파일에 1행으로 공유)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_meta (
+                id    INTEGER PRIMARY KEY CHECK (id = 1),
+                bytes INTEGER NOT NULL
+            )
+        """)
+        with self._write():
+            # 메타 테이블이 없던 기존 파일이면 한 번만 합계를 계산해서 채움
+            self._db.execute(
+                "INSERT OR IGNORE INTO embedding_meta "
+                "SELECT 1, COALESCE(SUM(length(vec)), 0) FROM embeddings"
+            )
+            self._bytes = self._total_bytes_locked()
+
+    # -----------------------------
+    # 조회 / 저장
+    # -----------------------------
+    def get_many(self, model: str, texts: Sequence[str], dim: int) -> List[Optional[np.ndarray]]:
+        """텍스트별 벡터 (없으면 None). 찾은 항목은 최근 사용 시각을 갱신."""
+        keys = [make_key(model, dim, t) for t in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):  # SQLite 파라미터 개수 제한 대비
+                part = keys[start:start + 500]
+                marks = ",".join("?" * len(part))
+                for key, vec in self._db.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", part
+                ):
+                    found[key] = np.frombuffer(vec, dtype="<f4")
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, k) for k in found]
+                )
+            hits = sum(1 for k in keys if k in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return [found.get(k) for k in keys]
+
+    def put_many(self, model: str, dim: int, texts: Sequence[str], vectors) -> None:
+        now = time.time()
+        rows = []
+        for text, vec in zip(texts, vectors):
+            blob = np.asarray(vec, dtype="<f4").reshape(-1).tobytes()
+            rows.append((make_key(model, dim, text), model, dim, blob, now))
+        with self._write():
+            delta = 0
+            for row in rows:
+                old = self._db.execute("SELECT length(vec) FROM embeddings WHERE key = ?", (row[0],)).fetchone()
+                self._db.execute("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", row)
+                delta += len(row[3]) - (old[0] if old else 0)
+            self._db.execute("UPDATE embedding_meta SET bytes = bytes + ? WHERE id = 1", (delta,))
+            self._evict_locked()
+            self._bytes = self._total_bytes_locked()
+
+    def get_or_compute(
+        self, model: str, texts: Sequence[str], dim: int, compute: Callable[[List[str]], Sequence]
+    ) -> np.ndarray:
+        """
+        캐시에 있는 것은 그대로, 없는 것만 모아 compute(텍스트 목록) 1번으로 계산 후 저장
+        - 같은 배치 안의 중복 텍스트도 한 번만 계산
+        - 반환: (len(texts), dim) float32 행렬 (입력 순서 그대로)
+        """
+        texts = list(texts)
+        cached = self.get_many(model, texts, dim)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        computed = {}
+        if missing:
+            vectors = np.asarray(compute(missing), dtype=np.float32).reshape(len(missing), dim)
+            self.put_many(model, dim, missing, vectors)
+            computed = dict(zip(missing, vectors))
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        for i, (text, vec) in enumerate(zip(texts, cached)):
+            out[i] = vec if vec is not None else computed[text]
+        return out
+
+    # -----------------------------
+    # 용량 관리 / 통계
+    # -----------------------------
+    @contextmanager
+    def _write(self):
+        """lock + 쓰기 트랜잭션 (BEGIN IMMEDIATE: 시작부터 파일 쓰기 잠금 → 다른 프로세스와 합계가 어긋나지 않음)"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _total_bytes_locked(self) -> int:
+        return self._db.execute("SELECT bytes FROM embedding_meta WHERE id = 1").fetchone()[0]
+
+    def _evict_locked(self) -> None:
+        """용량 초과 시 가장 오래 안 쓴 항목부터 삭제 (호출자가 _write 안에서 호출)"""
+        total = self._total_bytes_locked()
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * _EVICT_TARGET_RATIO
+        victims, freed = [], 0
+        for key, size in self._db.execute("SELECT key, length(vec) FROM embeddings ORDER BY last_used"):
+            if total - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        self._db.execute("UPDATE embedding_meta SET bytes = bytes - ? WHERE id = 1", (freed,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._bytes = self._total_bytes_locked()
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_default_store: Optional[EmbeddingStore] = None
+_default_lock = threading.Lock()
+
+
+def open_default_store() -> Optional[EmbeddingStore]:
+    """EMBEDDING_STORE_PATH 설정 시 프로세스 공용 저장소를 열어 돌려줌 (미설정이면 None)"""
+    global _default_store
+    if not EMBEDDING_STORE_PATH:
+        return None
+    with _default_lock:
+        if _default_store is None:
+            _default_store = EmbeddingStore(EMBEDDING_STORE_PATH, int(EMBEDDING_STORE_MAX_MB * 1024 * 1024))
+    return _default_store
@@ -0,0 +1,185 @@
+"""
+그룹 커밋(write-behind) 버퍼 (Fast_API.py GROUP_COMMIT=1 에서 사용)
+
+동시에 들어온 INSERT 요청을 최대 max_wait_ms 동안(또는 max_rows 개가 찰 때까지) 모아서
+하나의 트랜잭션으로 저장하고 COMMIT(=디스크 fsync)을 한 번만 합니다.
+ - 요청 N건 = COMMIT N번 대신, COMMIT 1번 → 초당 저장 건수 증가
+ - write_many 가 있으면 그룹 전체를 한 번에 실행 (왕복 최소화),
+   실패하면 되돌리고 행마다 SAVEPOINT 로 다시 실행 → 실패한 행만 빠지고 나머지는 저장
+ - 각 요청은 자기 행이 들어간 그룹이 COMMIT 된 뒤에 자기 결과(id) 또는 오류를 받음
+   (COMMIT 자체가 실패하면 그 그룹의 모든 요청이 같은 오류를 받음)
+ - writers: 쓰기 스레드(=연결) 수. 그룹 저장 중에도 다음 그룹을 다른 연결로 저장
+   (인덱스 갱신 등 DB 쪽 CPU 작업이 한 연결에 몰리지 않도록)
+ - close(): 이미 받은 요청은 모두 저장한 뒤 종료, 이후 요청은 바로 실패
+   (닫힘 확인과 큐 넣기를 같은 lock 으로 묶어, 종료 중에 들어온 요청이 결과 없이 남지 않도록)
+
+사용:
+  writer = GroupCommitWriter(pool.connection, insert_row, max_rows=64, max_wait_ms=5)
+  new_id = writer.write(row, timeout=30)   # 여러 스레드에서 동시에 호출 가능
+  writer.close()
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, ContextManager, List, Optional, Tuple
+
+_STOP = object()  # 쓰기 스레드 종료 신호
+
+
+class GroupCommitWriter:
+    def __init__(
+        self,
+        connection: Callable[[], ContextManager],
+        write_one: Callable[[Any, Any], Any],
+        max_rows: int = 64,
+        max_wait_ms: float = 5.0,
+        write_many: Optional[Callable[[Any, List], List]] = None,
+        writers: int = 1,
+    ):
+        """
+        connection: 호출하면 연결을 빌려주는 컨텍스트 매니저 (예: pool.connection)
+        write_one:  write_one(conn, item) → 결과. 그룹 트랜잭션 안에서 행마다 호출
+        write_many: (선택) write_many(conn, items) → 결과 목록. 그룹 전체를 한 번에 저장
+        """
+        self.connection = connection
+        self.write_one = write_one
+        self.write_many = write_many
+        self.max_rows = max(1, int(max_rows))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        # 통계 (모니터링/로그용)
+        self.groups = 0
+        self.rows = 0
+        self.failed_rows = 0
+        self.fallbacks = 0
+        self._stats_lock = threading.Lock()
+
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"group-commit-{i}", daemon=True)
+            for i in range(max(1, int(writers)))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # -----------------------------
+    # 요청 스레드에서 호출
+    # -----------------------------
+    def submit(self, item) -> Future:
+        fut: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            self._queue.put((item, fut))
+        return fut
+
+    def write(self, item, timeout: Optional[float] = None):
+        """
+        item 1건 저장을 맡기고, 그 그룹이 COMMIT 될 때까지 기다렸다가 결과 반환
+        - timeout 초가 지나면 TimeoutError (그 행은 나중에 저장될 수도 있음)
+        """
+        return self.submit(item).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "groups": self.groups,
+            "rows": self.rows,
+            "failed_rows": self.failed_rows,
+            "fallbacks": self.fallbacks,
+            "avg_group_size": self.rows / self.groups if self.groups else 0.0,
+        }
+
+    def close(self, timeout: float = 10.0) -> None:
+        """대기 중인 요청까지 저장(COMMIT)한 뒤 쓰기 스레드 종료"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        # 종료 직전에 들어온 요청은 기다리지 않도록 바로 실패 처리
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("GroupCommitWriter is closed"))
+
+    # -----------------------------
+    # 쓰기 스레드
+    # -----------------------------
+    def _collect(self, first) -> Tuple[List, bool]:
+        """첫 요청을 받은 시점부터 max_wait 동안 / max_rows 개까지 모으기"""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write_group(self, conn, batch) -> List:
+        """그룹 트랜잭션 안에서 batch 저장 → [(future, 성공 여부, 결과 또는 오류)]"""
+        if self.write_many is not None:
+            try:
+                with conn.transaction():  # SAVEPOINT: 실패하면 행 단위로 다시 실행
+                    results = self.write_many(conn, [item for item, _ in batch])
+                return [(fut, True, value) for (_, fut), value in zip(batch, results)]
+            except Exception:
+                with self._stats_lock:
+                    self.fallbacks += 1
+
+        outcomes = []
+        for item, fut in batch:
+            try:
+                with conn.transaction():  # SAVEPOINT: 실패하면 이 행만 되돌림
+                    outcomes.append((fut, True, self.write_one(conn, item)))
+            except Exception as e:
+                outcomes.append((fut, False, e))
+        return outcomes
+
+    def _flush(self, batch) -> None:
+        """batch 전체를 1 트랜잭션으로 저장 → COMMIT 후에 각 요청에 결과 전달"""
+        try:
+            with self.connection() as conn:
+                with conn.transaction():
+                    outcomes = self._write_group(conn, batch)
+        except Exception as e:  # 연결/COMMIT 실패: 그룹 전체 실패
+            with self._stats_lock:
+                self.failed_rows += len(batch)
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.groups += 1
+            self.rows += len(batch)
+            self.failed_rows += sum(1 for _, ok, _ in outcomes if not ok)
+        for fut, ok, value in outcomes:
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            self._flush(batch)
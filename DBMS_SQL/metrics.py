@@ -0,0 +1,236 @@
+"""
+요청/단계별 지연시간 메트릭 (Prometheus 텍스트 형식, 외부 라이브러리 없음)
+
+- MetricsMiddleware: 모든 HTTP 요청의 처리 시간 히스토그램 + 요청 수(라우트/상태코드별)
+- stage("embed"):    라우트 안에서 단계(풀 대기, 임베딩, INSERT, COMMIT ...) 소요 시간 기록
+- count_rollback():  롤백 횟수
+- registry.render(): /metrics 응답 본문 (text/plain; version=0.0.4)
+
+라우트 라벨은 실제 경로가 아니라 라우트 템플릿(예: /register_design)을 씁니다.
+단계 기록은 요청이 끝날 때 그 요청의 라우트 라벨로 한 번에 반영됩니다.
+(라우트가 스레드풀에서 실행되어도 contextvars 가 복사되므로 같은 요청으로 모입니다.)
+
+사용:
+  app.add_middleware(MetricsMiddleware)
+  with stage("insert"):
+      cur.execute(...)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 지연시간 버킷(초): 0.5ms ~ 10s
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 요청 밖(스크립트에서 직접 호출 등)에서 기록된 단계의 라우트 라벨
+NO_ROUTE = "none"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def format_sample(name: str, kind: str, help_text: str, value: float) -> List[str]:
+    """라벨 없는 값 1개 (collector 에서 gauge/counter 를 바로 내보낼 때)"""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_format_value(value)}"]
+
+def format_labeled_samples(name: str, kind: str, help_text: str, labelname: str,
+                           values: Dict[str, float]) -> List[str]:
+    """라벨 1개로 구분되는 값 여러 개 (예: 인덱스별 준비 여부)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for label, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels((labelname,), (label,))} {_format_value(value)}")
+    return lines
+
+
+# -----------------------------
+# 1) 메트릭 타입
+# -----------------------------
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labelvalues)
+            if counts is None:
+                counts = self._counts[labelvalues] = [0] * (len(self.buckets) + 1)
+                self._sums[labelvalues] = 0.0
+            counts[idx] += 1
+            self._sums[labelvalues] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """스크레이프 시점에 값을 읽어 오는 함수 (예: 커넥션 풀 상태) 등록"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# 2) 기본 메트릭
+# -----------------------------
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    "design_api_request_seconds", "HTTP request latency in seconds.", ("route",)))
+REQUESTS_TOTAL = registry.register(Counter(
+    "design_api_requests_total", "HTTP requests by route and status code.", ("route", "status")))
+STAGE_SECONDS = registry.register(Histogram(
+    "design_api_stage_seconds", "Latency of each stage inside a route in seconds.", ("route", "stage")))
+ROLLBACKS_TOTAL = registry.register(Counter(
+    "design_api_rollbacks_total", "Transactions rolled back by route.", ("route",)))
+
+
+# -----------------------------
+# 3) 요청 단위 기록
+# -----------------------------
+class _RequestRecord:
+    __slots__ = ("stages", "rollbacks")
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self.rollbacks = 0
+
+_current: ContextVar[Optional[_RequestRecord]] = ContextVar("design_api_metrics", default=None)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    record = _current.get()
+    if record is None:
+        STAGE_SECONDS.observe(seconds, NO_ROUTE, name)
+    else:
+        record.stages.append((name, seconds))
+
+@contextmanager
+def stage(name: str):
+    """with 블록 소요 시간을 현재 요청의 단계 name 으로 기록 (예외가 나도 기록)"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - t0)
+
+def count_rollback() -> None:
+    record = _current.get()
+    if record is None:
+        ROLLBACKS_TOTAL.inc(NO_ROUTE)
+    else:
+        record.rollbacks += 1
+
+
+class MetricsMiddleware:
+    """
+    순수 ASGI 미들웨어 (BaseHTTPMiddleware 보다 오버헤드가 작음)
+    - 응답 시작(http.response.start)의 상태코드를 잡아 요청 수/지연시간 기록
+    - 처리되지 않은 예외는 500 으로 집계
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = _RequestRecord()
+        token = _current.set(record)
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _current.reset(token)
+            # 라우팅 후 scope["route"] 에 매칭된 라우트가 들어옴 (없으면 404 등)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(elapsed, route)
+            REQUESTS_TOTAL.inc(route, str(status))
+            for name, seconds in record.stages:
+                STAGE_SECONDS.observe(seconds, route, name)
+            if record.rollbacks:
+                ROLLBACKS_TOTAL.inc(route, amount=record.rollbacks)
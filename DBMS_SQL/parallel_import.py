@@ -0,0 +1,294 @@
+"""
+병렬 CSV 적재 (DBMS_SQL.import_csv_with_transaction 의 병렬 버전)
+
+import_csv_with_transaction 은 프로세스 1개가 파싱 → 임베딩 생성 → 적재를 연결 1개로 순서대로 처리합니다.
+여기서는
+- CSV 를 바이트 범위 파티션으로 나누고 (경계는 레코드 끝 줄바꿈, 따옴표 안의 줄바꿈은 건너뜀)
+- 프로세스 풀의 워커가 파티션마다 파싱 + 임베딩 생성 + 적재를 각자의 DB 연결로 처리합니다.
+  (파싱/임베딩은 CPU 작업이라 스레드 대신 프로세스, 적재 방식은 LOAD_METHOD 그대로)
+
+커밋 방식(IMPORT_COMMIT_MODE 또는 commit_mode 인자):
+  staging   -> (기본값) 2단계: 워커는 UNLOGGED 스테이징 테이블에 적재 후 COMMIT,
+               모두 성공하면 한 트랜잭션으로 스테이징 → design 으로 옮기고 스테이징 삭제
+               → 기존과 같이 전체 성공 또는 전체 취소 (design 에는 중간 상태가 보이지 않음)
+  partition -> 워커가 파티션마다 design 에 바로 적재하고 각자 COMMIT
+               → 더 빠르지만 일부 파티션만 실패하면 성공한 파티션은 남음 (파티션별 결과 출력 후 예외)
+
+환경변수:
+  IMPORT_WORKERS=4            -> 워커 프로세스 수
+  IMPORT_PARTITIONS=0         -> 파티션 수 (0이면 워커 수와 같음, 크기가 고르지 않으면 늘려서 부하 분산)
+  IMPORT_COMMIT_MODE=staging  -> staging / partition
+  LOAD_METHOD, IMPORT_CHUNKSIZE, PG*  -> DBMS_SQL.py 와 같음 (워커마다 적용)
+
+실행:
+  IMPORT_WORKERS=4 python parallel_import.py
+  (워커 수별 rows/sec 비교: python parallel_import_benchmark.py)
+"""
+
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from DBMS_SQL import (
+    CSV_PATH, DEFAULT_EMBEDDING_DIM, IMPORT_CHUNKSIZE, LOAD_METHOD, LOAD_METHODS, LOADERS,
+    connect_db, detect_embedding_dim, ensure_table, iter_design_rows,
+)
+from embedding_storage import column_storage, column_type
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "4"))
+IMPORT_PARTITIONS = int(os.getenv("IMPORT_PARTITIONS", "0"))
+IMPORT_COMMIT_MODE = os.getenv("IMPORT_COMMIT_MODE", "staging")
+COMMIT_MODES = ("staging", "partition")
+
+# 차원 감지용으로 앞부분만 읽는 행 수
+DETECT_ROWS = 1000
+# 파티션 경계를 찾을 때 한 번에 읽는 크기
+SCAN_BLOCK_BYTES = 8 * 1024 * 1024
+
+_QUOTE = ord('"')
+_NEWLINE = ord("\n")
+
+
+# -----------------------------
+# 1) 파티션 나누기 (바이트 범위)
+# -----------------------------
+def _record_boundaries(f, data_start: int, targets: List[int]) -> List[int]:
+    """
+    targets(바이트 위치)마다 그 위치 이후 첫 번째 '레코드 끝' 다음 위치를 찾습니다.
+    따옴표 개수의 홀짝으로 따옴표 안/밖을 구분 ("" 이스케이프도 짝이 맞으므로 그대로 동작),
+    따옴표 밖의 줄바꿈만 경계로 씁니다. 파일을 블록 단위로 한 번 훑고, 마지막 target 을 찾으면 멈춥니다.
+    """
+    cuts = []
+    pending = list(targets)
+    in_quote = 0
+    f.seek(data_start)
+    pos = data_start
+    while pending:
+        block = f.read(SCAN_BLOCK_BYTES)
+        if not block:
+            break
+        arr = np.frombuffer(block, dtype=np.uint8)
+        # 각 바이트 위치까지의 따옴표 개수 홀짝 (1이면 따옴표 안)
+        parity = np.bitwise_xor.accumulate((arr == _QUOTE).astype(np.uint8)) ^ in_quote
+        ends = pos + np.flatnonzero((arr == _NEWLINE) & (parity == 0)) + 1
+        while pending:
+            i = np.searchsorted(ends, pending[0], side="left")
+            if i == len(ends):
+                break  # 이 블록에는 없음 → 다음 블록
+            cuts.append(int(ends[i]))
+            pending.pop(0)
+        in_quote = int(parity[-1])
+        pos += len(block)
+    # 남은 target 이후로 레코드 끝이 없으면 파일 끝까지 한 파티션
+    return cuts + [pos] * len(pending)
+
+
+def find_partitions(csv_path: str, parts: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """(헤더 컬럼 이름, [(시작 바이트, 끝 바이트), ...]) — 빈 파티션은 빼고 돌려줌"""
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        targets = [data_start + (size - data_start) * k // parts for k in range(1, parts)]
+        cuts = _record_boundaries(f, data_start, targets)
+    columns = next(csv.reader([header.decode("utf-8-sig")]))
+    bounds = [data_start, *cuts, size]
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return columns, ranges
+
+
+class _RangeFile(io.RawIOBase):
+    """파일의 [start, end) 바이트 범위만 읽는 파일 객체 (pandas 에 그대로 넘김)"""
+
+    def __init__(self, path: str, start: int, end: int):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._left = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buf) -> int:
+        n = min(len(buf), self._left)
+        if n <= 0:
+            return 0
+        got = self._f.readinto(memoryview(buf)[:n])
+        self._left -= got
+        return got
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+def iter_partition_chunks(csv_path: str, start: int, end: int, columns: List[str], chunksize: int = 0):
+    """파티션 1개를 DataFrame 으로 (chunksize 가 있으면 청크 단위 스트리밍, DBMS_SQL.iter_csv_chunks 와 같음)"""
+    with io.TextIOWrapper(io.BufferedReader(_RangeFile(csv_path, start, end)), encoding="utf-8", newline="") as text:
+        if not chunksize:
+            yield pd.read_csv(text, names=columns, header=None)
+            return
+        with pd.read_csv(text, names=columns, header=None, chunksize=chunksize) as reader:
+            yield from reader
+
+
+# -----------------------------
+# 2) 워커: 파티션 1개 = 연결 1개 = 트랜잭션 1개
+# -----------------------------
+def load_partition(task: Dict) -> Dict:
+    """
+    파티션을 읽어 task["table"] 에 적재하고 COMMIT.
+    실패하면 이 파티션만 ROLLBACK 하고 error 에 메시지를 담아 돌려줌 (예외는 부모에서 모아서 처리)
+    """
+    t0 = time.perf_counter()
+    loaded = 0
+    conn = connect_db()
+    try:
+        with conn.cursor() as cur:
+            for chunk in iter_partition_chunks(task["csv_path"], task["start"], task["end"],
+                                               task["columns"], task["chunksize"]):
+                loaded += LOADERS[task["load_method"]](cur, iter_design_rows(chunk, task["dim"]), task["table"])
+        conn.commit()
+        error = None
+    except Exception as e:
+        conn.rollback()
+        loaded = 0
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        conn.close()
+    return {
+        "index": task["index"],
+        "bytes": task["end"] - task["start"],
+        "rows": loaded,
+        "seconds": time.perf_counter() - t0,
+        "error": error,
+    }
+
+
+# -----------------------------
+# 3) 메인 로직: 파티션 → 프로세스 풀 → (staging 이면) 한 번에 옮기기
+# -----------------------------
+def import_csv_parallel(
+    csv_path: str,
+    workers: int = IMPORT_WORKERS,
+    commit_mode: str = IMPORT_COMMIT_MODE,
+    load_method: str = LOAD_METHOD,
+    chunksize: int = IMPORT_CHUNKSIZE,
+    partitions: int = IMPORT_PARTITIONS,
+    table: str = "design",
+) -> Dict:
+    """
+    반환: 적재 행 수, 전체/단계별 소요 시간, rows_per_sec, 파티션별 결과
+    실패 시 staging 은 design 에 아무것도 남기지 않고, partition 은 성공한 파티션이 남은 채로 RuntimeError
+    """
+    if load_method not in LOADERS:
+        raise ValueError(f"load_method는 {LOAD_METHODS} 중 하나여야 합니다: {load_method!r}")
+    if commit_mode not in COMMIT_MODES:
+        raise ValueError(f"commit_mode는 {COMMIT_MODES} 중 하나여야 합니다: {commit_mode!r}")
+    workers = max(1, workers)
+
+    t0 = time.perf_counter()
+    columns, ranges = find_partitions(csv_path, partitions or workers)
+    dim = detect_embedding_dim(pd.read_csv(csv_path, nrows=DETECT_ROWS)) or DEFAULT_EMBEDDING_DIM
+    print(f"[INFO] 감지된 임베딩 차원: {dim}, 적재 방식: {load_method}, "
+          f"워커 {workers}개 / 파티션 {len(ranges)}개, 커밋 방식: {commit_mode}")
+
+    # 3-1) 스키마 보장 (+ staging 이면 인덱스 없는 UNLOGGED 스테이징 테이블)
+    staging = f"{table}_import_staging_{os.getpid()}" if commit_mode == "staging" else None
+    conn = connect_db()
+    try:
+        ensure_table(conn, dim, table)
+        if staging:
+            # 대상 테이블과 같은 embedding 타입 (vector / halfvec)
+            with conn.cursor() as cur:
+                storage = column_storage(cur, table)
+            conn.execute(f"""
+                CREATE UNLOGGED TABLE {staging} (
+                    title       TEXT,
+                    description TEXT,
+                    content_hash BYTEA,
+                    embedding   {column_type(dim, storage)}
+                );
+            """)
+        conn.commit()
+    finally:
+        conn.close()
+
+    # 3-2) 파티션별 병렬 적재
+    tasks = [
+        {"index": i, "csv_path": csv_path, "start": start, "end": end, "columns": columns, "dim": dim,
+         "load_method": load_method, "chunksize": chunksize, "table": staging or table}
+        for i, (start, end) in enumerate(ranges)
+    ]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)) or 1) as ex:
+            results = list(ex.map(load_partition, tasks))
+        load_seconds = time.perf_counter() - t0
+        failed = [r for r in results if r["error"]]
+        for r in results:
+            status = f"실패 ({r['error']})" if r["error"] else "COMMIT"
+            print(f"[INFO] 파티션 {r['index']}: {r['bytes'] / 1e6:.1f}MB, {r['rows']}행, {r['seconds']:.2f}s → {status}")
+
+        # 3-3) staging: 한 트랜잭션으로 스테이징 → design (하나라도 실패했으면 옮기지 않음)
+        swap_seconds = 0.0
+        if staging:
+            if failed:
+                raise RuntimeError(f"파티션 {len(failed)}개 적재 실패 → {table} 에는 아무것도 반영하지 않음")
+            t1 = time.perf_counter()
+            conn = connect_db()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f"""
+                        INSERT INTO {table} (title, description, content_hash, embedding)
+                        SELECT title, description, content_hash, embedding FROM {staging};
+                    """)
+                    cur.execute(f"DROP TABLE {staging};")
+                conn.commit()
+                staging = None
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            swap_seconds = time.perf_counter() - t1
+        elif failed:
+            committed = sum(r["rows"] for r in results)
+            raise RuntimeError(f"파티션 {len(failed)}/{len(results)}개 적재 실패 "
+                               f"(성공한 파티션 {committed}행은 COMMIT 된 상태)")
+    finally:
+        if staging:
+            _drop_table(staging)
+
+    elapsed = time.perf_counter() - t0
+    loaded = sum(r["rows"] for r in results)
+    print(f"[SUCCESS] {loaded}행 적재, {elapsed:.2f}s ({loaded / elapsed:.0f} rows/s"
+          + (f", 스테이징 → {table} {swap_seconds:.2f}s" if commit_mode == "staging" else "") + ")")
+    return {
+        "rows": loaded,
+        "seconds": elapsed,
+        "load_seconds": load_seconds,
+        "swap_seconds": swap_seconds,
+        "rows_per_sec": loaded / elapsed if elapsed else 0.0,
+        "partitions": results,
+    }
+
+
+def _drop_table(name: str) -> None:
+    conn = connect_db()
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {name};")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# 4) 실행부
+# -----------------------------
+if __name__ == "__main__":
+    import_csv_parallel(CSV_PATH)
@@ -0,0 +1,103 @@
+"""
+병렬 CSV 적재 벤치마크: 워커 수별 rows/sec (parallel_import.py)
+
+- 합성 CSV(BENCH_ROWS 행, embedding 문자열 포함 / 일부 행은 비워서 임베딩 생성)를 임시 파일로 만들고
+- 기존 단일 프로세스 적재(import_csv_with_transaction)와
+  워커 수(BENCH_WORKERS)별 병렬 적재를 커밋 방식(staging / partition)마다 실행해 비교합니다.
+- 측정용 테이블(design_parallel_bench)을 따로 쓰고, 실행마다 삭제합니다.
+
+실행:
+  python parallel_import_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_ROWS=20000          -> 합성 CSV 행 수
+  BENCH_DIM=384             -> 벡터 차원
+  BENCH_WORKERS=1,2,4,8     -> 워커 수 목록
+  LOAD_METHOD               -> 적재 방식 (기본 insert, 병렬 효과를 보려면 copy_binary 권장)
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from DBMS_SQL import LOAD_METHOD, connect_db, import_csv_with_transaction
+from parallel_import import COMMIT_MODES, import_csv_parallel
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+BENCH_DIM = int(os.getenv("BENCH_DIM", "384"))
+BENCH_WORKERS = [int(x) for x in os.getenv("BENCH_WORKERS", "1,2,4,8").split(",")]
+
+BENCH_TABLE = "design_parallel_bench"
+
+
+def make_csv(path: str, rows: int, dim: int) -> None:
+    """'[0.123456, ...]' embedding 문자열 + 10행마다 빈 embedding(설명으로 생성), 설명에는 쉼표/따옴표/줄바꿈"""
+    rng = np.random.default_rng(0)
+    mat = rng.uniform(-1, 1, size=(rows, dim))
+    embeddings = ["[" + ", ".join(f"{x:.6f}" for x in row) + "]" for row in mat]
+    for i in range(0, rows, 10):
+        embeddings[i] = ""
+    pd.DataFrame({
+        "title": [f"설계안 {i}" for i in range(rows)],
+        "description": [f'모듈러 구조, "빠른 시공"\n유지보수를 고려한 설계 {i}' for i in range(rows)],
+        "embedding": embeddings,
+    }).to_csv(path, index=False)
+
+
+def drop_bench_table() -> None:
+    conn = connect_db()
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def count_rows() -> int:
+    conn = connect_db()
+    try:
+        return conn.execute(f"SELECT count(*) FROM {BENCH_TABLE};").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run_serial(path: str) -> float:
+    drop_bench_table()
+    t0 = time.perf_counter()
+    import_csv_with_transaction(path, table=BENCH_TABLE)
+    elapsed = time.perf_counter() - t0
+    assert count_rows() == BENCH_ROWS, "적재된 행 수가 다릅니다."
+    return BENCH_ROWS / elapsed
+
+
+def run_parallel(path: str, workers: int, commit_mode: str) -> dict:
+    drop_bench_table()
+    result = import_csv_parallel(path, workers=workers, commit_mode=commit_mode, table=BENCH_TABLE)
+    assert count_rows() == BENCH_ROWS == result["rows"], "적재된 행 수가 다릅니다."
+    return result
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "designs.csv")
+        make_csv(path, BENCH_ROWS, BENCH_DIM)
+        print(f"[BENCH] 합성 CSV {BENCH_ROWS}행, {BENCH_DIM}차원, {os.path.getsize(path) / 1e6:.1f}MB, "
+              f"적재 방식 {LOAD_METHOD}, CPU {os.cpu_count()}개")
+
+        try:
+            serial = run_serial(path)
+            results = {(w, m): run_parallel(path, w, m) for w in BENCH_WORKERS for m in COMMIT_MODES}
+        finally:
+            drop_bench_table()
+
+    print("=" * 78)
+    print(f"단일 프로세스 (import_csv_with_transaction): {serial:,.0f} rows/s")
+    print(f"{'워커':>4} | {'staging rows/s':>14} {'(이동 s)':>9} {'배율':>6} | {'partition rows/s':>16} {'배율':>6}")
+    print("-" * 78)
+    for w in BENCH_WORKERS:
+        s, p = results[(w, "staging")], results[(w, "partition")]
+        print(f"{w:>4} | {s['rows_per_sec']:>14,.0f} {s['swap_seconds']:>9.2f} {s['rows_per_sec'] / serial:>5.2f}x | "
+              f"{p['rows_per_sec']:>16,.0f} {p['rows_per_sec'] / serial:>5.2f}x")
@@ -0,0 +1,130 @@
+"""
+pgvector 공용 어댑터 (Fast_API.py / DBMS_SQL.py / MLOps_Python/sentecnetransformer.py 가 함께 사용)
+
+- 바이너리: numpy float32 버퍼를 pgvector 바이너리 포맷으로 그대로 전송 (권장)
+    register_vector_binary(conn) 한 번 → 이후 numpy 배열을 그냥 파라미터로 넘기면 됨
+    cur.execute("INSERT INTO t (embedding) VALUES (%s)", (np_array,))
+    COPY ... (FORMAT BINARY) 에서는 copy.set_types([..., "vector"])
+- 텍스트: '[0.1,0.2,...]' 문자열 + ::vector 캐스팅 (기존 방식, 비교/호환용)
+- 입력: 클라이언트가 보낸 little-endian float32 바이트 → from_float32_bytes (복사 없이 numpy 배열)
+
+pgvector 바이너리 포맷: [차원 수: int16][예약: int16][float32 x 차원] (모두 big-endian)
+halfvec(pgvector 0.7+) 은 같은 헤더 + float16 x 차원 → COPY ... (FORMAT BINARY) 에서 set_types([..., "halfvec"])
+(INSERT/검색 파라미터는 vector 로 보내고 SQL 에서 ::halfvec 캐스팅, embedding_storage.vector_param)
+"""
+
+import struct
+from typing import Optional, Sequence
+
+import numpy as np
+from psycopg import ProgrammingError
+from psycopg.adapt import Dumper, PyFormat
+from psycopg.pq import Format
+from psycopg.types import TypeInfo
+
+
+def to_float32(values: Sequence[float]) -> np.ndarray:
+    """list/tuple/numpy 무엇이 오든 1차원 float32 배열로 (이미 float32면 복사 없음)"""
+    return np.asarray(values, dtype=np.float32).reshape(-1)
+
+
+def from_float32_bytes(data, dim: Optional[int] = None) -> np.ndarray:
+    """
+    little-endian float32 바이트(base64 디코딩 결과, octet-stream 본문 등) → float32 배열
+    - 바이트 버퍼를 그대로 배열로 보므로 복사 없음 (읽기 전용)
+    - 길이가 4의 배수가 아니거나 dim 과 다르거나, NaN/inf 가 있으면 ValueError
+    """
+    if len(data) % 4:
+        raise ValueError(f"float32 바이트 길이는 4의 배수여야 합니다. (got {len(data)} bytes)")
+    vec = np.frombuffer(data, dtype="<f4")
+    if dim is not None and vec.size != dim:
+        raise ValueError(f"embedding length must be {dim}, got {vec.size}")
+    if not np.isfinite(vec).all():
+        raise ValueError("embedding 에 NaN/inf 값이 있습니다.")
+    return vec
+
+
+def to_sql_vector(values: Sequence[float]) -> str:
+    """
+    텍스트 방식: pgvector는 '[1,2,3]' 같은 문자열을 ::vector 로 캐스팅해 넣을 수 있습니다.
+    숫자 → 글자 → (DB에서) 다시 숫자로 바뀌므로 바이너리 방식보다 느립니다.
+    """
+    return "[" + ",".join(f"{x:.6f}" for x in values) + "]"
+
+
+def to_pgvector_binary(values: Sequence[float]) -> bytes:
+    """
+    바이너리 방식: float32 값을 big-endian 으로만 바꿔 헤더 뒤에 붙입니다.
+    숫자를 글자로 바꿨다가 DB가 다시 숫자로 읽는 과정을 건너뜁니다.
+    """
+    vec = np.asarray(values, dtype=">f4").reshape(-1)
+    return struct.pack(">HH", vec.size, 0) + vec.tobytes()
+
+
+def to_halfvec_binary(values: Sequence[float]) -> bytes:
+    """halfvec 바이너리: vector 와 같은 헤더 + float16(big-endian), 범위를 넘는 값은 ±inf 가 되므로 DB가 거부"""
+    vec = np.asarray(values, dtype=">f2").reshape(-1)
+    return struct.pack(">HH", vec.size, 0) + vec.tobytes()
+
+
+class VectorBinaryDumper(Dumper):
+    """
+    psycopg가 vector 값을 바이너리로 보낼 때 사용하는 변환기.
+    vector 타입의 oid는 DB마다 다르므로 register_vector_binary()에서 채워 넣습니다.
+    """
+    format = Format.BINARY
+
+    def dump(self, obj):
+        return to_pgvector_binary(obj)
+
+
+class HalfvecBinaryDumper(Dumper):
+    """halfvec 컬럼 COPY 용 (oid 로만 등록: numpy 배열 파라미터는 계속 vector 로 전송)"""
+    format = Format.BINARY
+
+    def dump(self, obj):
+        return to_halfvec_binary(obj)
+
+
+def register_vector_binary(context) -> int:
+    """
+    연결(또는 커서)에 vector 타입 정보와 바이너리 Dumper를 등록하고 vector oid 를 돌려줍니다.
+    - numpy 배열 파라미터 → vector 바이너리로 전송
+    - COPY에서 set_types([..., "vector"]) 로 컬럼 타입 지정 가능 (halfvec 타입이 있으면 "halfvec" 도)
+    - 커서는 생성 시점의 설정을 복사해 두므로, 이미 만든 커서라면 커서에 등록해야 합니다.
+    - 조회 쿼리가 실행되므로 autocommit=False 연결은 트랜잭션이 열린 상태가 됩니다.
+    - 이미 등록된 연결/커서면 조회 없이 oid 만 돌려줌 (같은 커서로 여러 번 적재할 때)
+    """
+    oid = _registered_oid(context)
+    if oid is not None:
+        return oid
+    conn = getattr(context, "connection", context)
+    return _register_vector_info(context, TypeInfo.fetch(conn, "vector"), TypeInfo.fetch(conn, "halfvec"))
+
+
+async def register_vector_binary_async(context) -> int:
+    """register_vector_binary 의 비동기 연결(AsyncConnection/AsyncCursor)용 (Fast_API_async.py)"""
+    conn = getattr(context, "connection", context)
+    return _register_vector_info(
+        context, await TypeInfo.fetch(conn, "vector"), await TypeInfo.fetch(conn, "halfvec")
+    )
+
+
+def _registered_oid(context) -> Optional[int]:
+    try:
+        dumper = context.adapters.get_dumper(np.ndarray, PyFormat.BINARY)
+    except ProgrammingError:
+        return None
+    return dumper.oid if issubclass(dumper, VectorBinaryDumper) else None
+
+
+def _register_vector_info(context, info, half_info=None) -> int:
+    if info is None:
+        raise RuntimeError("vector 타입을 찾을 수 없습니다. (CREATE EXTENSION vector 필요)")
+    info.register(context)
+    dumper = type("VectorBinaryDumper", (VectorBinaryDumper,), {"oid": info.oid})
+    context.adapters.register_dumper(np.ndarray, dumper)
+    if half_info is not None:  # pgvector 0.7 미만이면 None
+        half_info.register(context)
+        context.adapters.register_dumper(None, type("HalfvecBinaryDumper", (HalfvecBinaryDumper,), {"oid": half_info.oid}))
+    return info.oid
@@ -0,0 +1,136 @@
+"""
+커넥션 풀 벤치마크: 요청마다 connect/close (기존) vs 커넥션 풀에서 빌려 쓰기 (신규)
+
+- /register_design 과 같은 작업(연결 → INSERT ... RETURNING id → COMMIT)을
+  여러 스레드에서 동시에 반복 실행하여 requests/sec 와 지연시간(p50/p99)을 비교합니다.
+- 측정용 테이블(design_pool_bench)을 따로 만들고, 끝나면 삭제합니다.
+
+실행:
+  python pool_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_REQUESTS=2000   -> 모드별 총 요청 수
+  BENCH_THREADS=16      -> 동시 요청 스레드 수
+"""
+
+import os
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+from psycopg.rows import tuple_row
+from psycopg_pool import ConnectionPool
+
+from Fast_API import (
+    EMBEDDING_DIM,
+    PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD,
+    conninfo,
+    generate_embedding_from_text,
+)
+from pgvector_adapter import to_sql_vector
+
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", "2000"))
+BENCH_THREADS = int(os.getenv("BENCH_THREADS", "16"))
+
+BENCH_TABLE = "design_pool_bench"
+
+INSERT_SQL = f"""
+INSERT INTO {BENCH_TABLE} (title, description, embedding)
+VALUES (%s, %s, %s::vector)
+RETURNING id;
+"""
+
+# -----------------------------
+# 1) 요청 1건 = register_design 과 동일한 DB 작업
+# -----------------------------
+def insert_one(conn, i: int) -> int:
+    desc = f"benchmark design {i}"
+    emb_sql = to_sql_vector(generate_embedding_from_text(desc, EMBEDDING_DIM))
+    with conn.cursor() as cur:
+        cur.execute(INSERT_SQL, (f"bench-{i}", desc, emb_sql))
+        new_id = cur.fetchone()[0]
+    conn.commit()
+    return new_id
+
+def request_without_pool(i: int) -> float:
+    """기존 방식: 매 요청마다 새 연결(TCP + 인증) → 작업 → close"""
+    t0 = time.perf_counter()
+    conn = psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE, user=PGUSER, password=PGPASSWORD,
+        row_factory=tuple_row, autocommit=False,
+    )
+    try:
+        insert_one(conn, i)
+    finally:
+        conn.close()
+    return time.perf_counter() - t0
+
+def make_request_with_pool(pool: ConnectionPool):
+    def request_with_pool(i: int) -> float:
+        """신규 방식: 풀에서 연결을 빌려 작업 후 반납"""
+        t0 = time.perf_counter()
+        with pool.connection() as conn:
+            insert_one(conn, i)
+        return time.perf_counter() - t0
+    return request_with_pool
+
+# -----------------------------
+# 2) 측정 / 출력
+# -----------------------------
+def run(fn) -> dict:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=BENCH_THREADS) as ex:
+        latencies = sorted(ex.map(fn, range(BENCH_REQUESTS)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "rps": BENCH_REQUESTS / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "elapsed": elapsed,
+    }
+
+def print_result(title: str, r: dict):
+    print("-" * 70)
+    print(title)
+    print(f"  처리량 : {r['rps']:.1f} req/s  (총 {r['elapsed']:.2f} sec)")
+    print(f"  지연   : p50 {r['p50_ms']:.2f} ms / p99 {r['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    with psycopg.connect(conninfo(), autocommit=True) as conn:
+        conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.execute(f"""
+            CREATE TABLE {BENCH_TABLE} (
+                id          BIGSERIAL PRIMARY KEY,
+                title       TEXT,
+                description TEXT,
+                embedding   VECTOR({EMBEDDING_DIM})
+            );
+        """)
+
+    try:
+        print("=" * 70)
+        print(f"요청 {BENCH_REQUESTS}건 / 동시 스레드 {BENCH_THREADS}개")
+
+        before = run(request_without_pool)
+        print_result("[before] 요청마다 psycopg.connect()", before)
+
+        # 스레드 수만큼 연결을 미리 열어 두어, 대기 없이 빌려 쓰는 조건으로 측정
+        with ConnectionPool(
+            conninfo(),
+            min_size=BENCH_THREADS,
+            max_size=BENCH_THREADS,
+            kwargs={"row_factory": tuple_row, "autocommit": False},
+            check=ConnectionPool.check_connection,
+        ) as pool:
+            pool.wait()
+            after = run(make_request_with_pool(pool))
+        print_result("[after] ConnectionPool 에서 빌려 쓰기", after)
+
+        print("=" * 70)
+        print(f"처리량 {after['rps'] / before['rps']:.2f}배, "
+              f"p99 {before['p99_ms'] / after['p99_ms']:.2f}배 개선")
+    finally:
+        with psycopg.connect(conninfo(), autocommit=True) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
@@ -0,0 +1,234 @@
+"""
+요청 단위 프로파일링 (opt-in, cProfile)
+
+느린 요청이 프로세스 안에서 어디에 시간을 썼는지(임베딩, 벡터 변환, DB 호출 ...) 보기 위한 도구입니다.
+- ProfilingMiddleware: 요청의 PROFILE_SAMPLE_RATE 비율 또는 디버그 헤더(PROFILE_HEADER: PROFILE_TOKEN)가
+  붙은 요청만 골라 프로파일 대상으로 표시 (순수 ASGI, contextvars)
+- @profiled: 표시된 요청 안에서 호출될 때만 그 함수 실행을 cProfile 로 기록
+  (스레드풀/이벤트 루프 어디서 호출되든 그 스레드에서 기록, 요청 하나의 기록은 합쳐서 저장)
+- 요청이 끝나면 PROFILE_DIR 에 .prof(pstats) 파일로 저장, PROFILE_MAX_FILES 개를 넘으면 오래된 것부터 삭제
+- list_profiles() / profile_summary(): 목록, 상위 함수 요약 (인덱스 엔드포인트용)
+- access_allowed(): 인덱스 엔드포인트 접근 확인 (PROFILE_TOKEN 이 있으면 디버그 헤더, 없으면 로컬 접속만)
+- 다른 프로파일러가 이미 켜져 있어 기록하지 못한 호출은 design_api_profile_skipped_calls_total 로 셈
+
+꺼져 있을 때(기본값) 미들웨어는 등록되지 않고, @profiled 는 contextvar 1번 조회만 합니다.
+
+환경변수:
+  PROFILE_SAMPLE_RATE=0          -> 0~1, 무작위로 프로파일할 요청 비율 (0이면 샘플링 안 함)
+  PROFILE_TOKEN=                 -> 설정하면 헤더 값이 이 토큰과 같은 요청은 항상 프로파일
+  PROFILE_HEADER=X-Debug-Profile -> 디버그 헤더 이름
+  PROFILE_DIR=profiles           -> 저장 디렉터리
+  PROFILE_MAX_FILES=200          -> 보관할 최대 파일 수
+
+사용:
+  if profiling.enabled():
+      app.add_middleware(profiling.ProfilingMiddleware)
+  @profiled
+  def store_design(...): ...
+  snakeviz profiles/<파일명>.prof   # 또는 python -m pstats
+"""
+
+import asyncio
+import cProfile
+import functools
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+import metrics
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Debug-Profile")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# 파일 이름: {시각}_{id}_{상태코드}_{소요ms}ms_{라우트}.prof
+_FILE_RE = re.compile(r"^(\d{8}T\d{6})_([0-9a-f]{8})_(\d{3})_(\d+)ms_(.*)\.prof$")
+
+# PROFILE_TOKEN 이 없을 때 인덱스 엔드포인트를 허용할 접속 주소 (testclient: FastAPI TestClient)
+LOCAL_HOSTS = frozenset({"127.0.0.1", "::1", "localhost", "testclient"})
+
+SKIPPED_CALLS = metrics.registry.register(metrics.Counter(
+    "design_api_profile_skipped_calls_total",
+    "Profiled calls not recorded because another profiler was already active (Python 3.12+)."))
+
+
+def enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+
+# -----------------------------
+# 1) 요청 1건의 프로파일 기록
+# -----------------------------
+class _Session:
+    __slots__ = ("profiles", "_lock")
+
+    def __init__(self):
+        self.profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, prof: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(prof)
+
+_current: ContextVar[Optional[_Session]] = ContextVar("design_api_profile", default=None)
+_thread_state = threading.local()  # 같은 스레드 안의 중첩 호출은 바깥 기록에 포함
+
+
+def profiled(fn):
+    """프로파일 대상 요청 안에서 호출될 때만 fn 실행을 기록 (동기 함수용)"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = _current.get()
+        if session is None or getattr(_thread_state, "active", False):
+            return fn(*args, **kwargs)
+
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # 다른 스레드에서 이미 프로파일 중 (Python 3.12+ 는 프로세스에 1개만)
+            SKIPPED_CALLS.inc()
+            return fn(*args, **kwargs)
+        _thread_state.active = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.disable()
+            _thread_state.active = False
+            session.add(prof)
+
+    return wrapper
+
+
+# -----------------------------
+# 2) 저장 / 정리 / 조회
+# -----------------------------
+def _route_slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+
+def _save(session: _Session, route: str, status: int, elapsed_ms: int, profile_id: str) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    name = f"{stamp}_{profile_id}_{status}_{elapsed_ms}ms_{_route_slug(route)}.prof"
+    stats = pstats.Stats(session.profiles[0])
+    for prof in session.profiles[1:]:
+        stats.add(prof)
+    stats.dump_stats(os.path.join(PROFILE_DIR, name))
+    _rotate()
+
+def _by_age(names: List[str]) -> List[str]:
+    """오래된 순 (같은 초에 저장된 파일도 순서가 맞도록 수정 시각 기준)"""
+    def key(name):
+        try:
+            return os.path.getmtime(os.path.join(PROFILE_DIR, name)), name
+        except FileNotFoundError:
+            return 0.0, name
+    return sorted(names, key=key)
+
+def _rotate() -> None:
+    files = _by_age([f for f in os.listdir(PROFILE_DIR) if _FILE_RE.match(f)])
+    for old in files[:max(0, len(files) - PROFILE_MAX_FILES)]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except FileNotFoundError:
+            pass
+
+def list_profiles() -> List[Dict]:
+    """저장된 프로파일 목록 (최신순)"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    items = []
+    for name in reversed(_by_age([f for f in os.listdir(PROFILE_DIR) if _FILE_RE.match(f)])):
+        m = _FILE_RE.match(name)
+        stamp, profile_id, status, elapsed_ms, route = m.groups()
+        items.append({
+            "file": name,
+            "id": profile_id,
+            "created": stamp,
+            "status": int(status),
+            "elapsed_ms": int(elapsed_ms),
+            "route": route,
+            "bytes": os.path.getsize(os.path.join(PROFILE_DIR, name)),
+        })
+    return items
+
+def profile_path(name: str) -> Optional[str]:
+    """목록에 있는 파일 이름만 허용 (경로 조작 방지)"""
+    if not _FILE_RE.match(name):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+def access_allowed(header_value: Optional[str], client_host: Optional[str]) -> bool:
+    """인덱스 엔드포인트 접근: PROFILE_TOKEN 이 있으면 디버그 헤더 값이 같을 때만, 없으면 로컬 접속만"""
+    if PROFILE_TOKEN:
+        return hmac.compare_digest((header_value or "").encode(), PROFILE_TOKEN.encode())
+    return client_host in LOCAL_HOSTS
+
+def profile_summary(path: str, sort: str = "cumulative", limit: int = 40) -> str:
+    """pstats 상위 limit 개 함수 (텍스트)"""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+# -----------------------------
+# 3) 미들웨어
+# -----------------------------
+class ProfilingMiddleware:
+    """
+    순수 ASGI 미들웨어
+    - 샘플링/디버그 헤더로 고른 요청만 contextvar 에 기록 세션을 걸어 둠
+    - 응답 헤더 X-Profile-Id 로 저장된 파일의 id 를 알려줌 (목록에서 찾기)
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = PROFILE_HEADER.lower().encode("latin-1")
+        self.token = PROFILE_TOKEN.encode("latin-1")
+
+    def _wanted(self, scope) -> bool:
+        if self.token:
+            for name, value in scope.get("headers", ()):
+                if name == self.header and value == self.token:
+                    return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = _Session()
+        token = _current.set(session)
+        profile_id = uuid.uuid4().hex[:8]
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _current.reset(token)
+            if session.profiles:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                elapsed_ms = int((time.perf_counter() - t0) * 1000)
+                # 파일 쓰기는 이벤트 루프를 막지 않도록 스레드에서
+                await asyncio.to_thread(_save, session, route, status, elapsed_ms, profile_id)
@@ -0,0 +1,346 @@
+"""
+이어서 하기가 가능한 CSV 적재 (체크포인트 + 배치별 SAVEPOINT + 불량 행 격리)
+
+import_csv_with_transaction 은 전체가 트랜잭션 1개라, 파일 끝의 행 하나가 잘못돼도 전부 ROLLBACK 되고
+처음부터 다시 해야 합니다. 여기서는
+- IMPORT_BATCH_ROWS 행씩 배치로 나눠 배치마다 SAVEPOINT, IMPORT_COMMIT_BATCHES 배치마다 COMMIT
+- COMMIT 직후 체크포인트(다음에 읽을 파일 위치, 마지막 행 번호, 적재/격리 행 수)를 상태 파일(JSON)에 저장
+- 다시 실행하면 상태 파일의 파일 위치부터 이어서 적재 (이미 끝난 파일이면 아무것도 안 함)
+- 불량 행은 전체를 중단하지 않고 격리 CSV 로 보냄 (원래 컬럼 + _row 행 번호 + _error 사유,
+  컬럼으로 나눌 수 없는 행은 원래 컬럼을 비우고 _raw 에 레코드 원문)
+    · 컬럼 수가 다른 행, 임베딩 길이가 다른 행, DB 가 거부한 행(배치 실패 시 행 단위로 다시 시도해서 골라냄)
+
+정합성:
+- 상태 파일은 임시 파일에 쓴 뒤 교체(os.replace)하므로 중간에 죽어도 깨지지 않음
+- 격리 CSV 는 COMMIT 된 배치의 불량 행만 쓰고, 그 시점의 파일 크기를 체크포인트에 기록
+  → 이어서 할 때 격리 CSV 를 그 크기로 잘라서 같은 행이 두 번 들어가지 않음
+- COMMIT 과 상태 파일 저장 사이에 프로세스가 죽으면 마지막 COMMIT 분량(최대 1회분)이 다시 적재될 수 있음
+- CSV 파일의 크기/수정 시각이 체크포인트와 다르면 이어서 하지 않고 오류 (IMPORT_RESTART=1 로 처음부터)
+
+환경변수:
+  IMPORT_BATCH_ROWS=1000      -> 배치 1개(SAVEPOINT 1개)의 행 수
+  IMPORT_COMMIT_BATCHES=1     -> 몇 배치마다 COMMIT + 체크포인트 할지
+  IMPORT_STATE_PATH=          -> 상태 파일 (기본: <CSV>.import-state.json)
+  IMPORT_QUARANTINE_PATH=     -> 격리 CSV (기본: <CSV>.rejected.csv)
+  IMPORT_RESTART=0            -> 1이면 상태 파일/격리 CSV 를 무시하고 처음부터
+  LOAD_METHOD, PG*            -> DBMS_SQL.py 와 같음
+
+실행:
+  python resumable_import.py      # 중간에 멈추면 같은 명령으로 다시 실행
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from DBMS_SQL import (
+    CSV_PATH, DEFAULT_EMBEDDING_DIM, LOAD_METHOD, LOAD_METHODS, LOADERS,
+    connect_db, detect_embedding_dim, ensure_table, iter_design_rows, load_rows_insert,
+)
+
+IMPORT_BATCH_ROWS = int(os.getenv("IMPORT_BATCH_ROWS", "1000"))
+IMPORT_COMMIT_BATCHES = int(os.getenv("IMPORT_COMMIT_BATCHES", "1"))
+IMPORT_STATE_PATH = os.getenv("IMPORT_STATE_PATH", "")
+IMPORT_QUARANTINE_PATH = os.getenv("IMPORT_QUARANTINE_PATH", "")
+IMPORT_RESTART = os.getenv("IMPORT_RESTART", "0") == "1"
+
+# 차원 감지용으로 앞부분만 읽는 행 수
+DETECT_ROWS = 1000
+
+
+# -----------------------------
+# 1) 상태 파일 (체크포인트)
+# -----------------------------
+def file_signature(csv_path: str) -> Dict:
+    st = os.stat(csv_path)
+    return {"file_size": st.st_size, "file_mtime_ns": st.st_mtime_ns}
+
+
+def load_state(state_path: str) -> Optional[Dict]:
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_path: str, state: Dict) -> None:
+    """임시 파일에 쓰고 fsync 후 교체 → 어느 순간에 죽어도 이전 또는 새 체크포인트 중 하나가 온전히 남음"""
+    state = {**state, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    tmp = state_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, state_path)
+
+
+# -----------------------------
+# 2) CSV 읽기: 레코드 단위 + 바이트 위치
+# -----------------------------
+def iter_records(f, offset: int) -> Iterator[Tuple[bytes, int]]:
+    """
+    offset 부터 (레코드 바이트, 레코드 끝 다음 위치) 를 하나씩 넘겨줍니다.
+    따옴표 안의 줄바꿈은 레코드를 끝내지 않도록 따옴표 개수의 홀짝으로 줄을 이어 붙임
+    """
+    f.seek(offset)
+    parts, quotes = [], 0
+    while True:
+        line = f.readline()
+        if not line:
+            break
+        parts.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            yield b"".join(parts), f.tell()
+            parts, quotes = [], 0
+    if parts:  # 따옴표가 닫히지 않은 채 파일이 끝남 → 그대로 넘겨서 격리
+        yield b"".join(parts), f.tell()
+
+
+def parse_record(record: bytes) -> List[str]:
+    text = record.decode("utf-8")
+    return next(csv.reader(io.StringIO(text)), [])
+
+
+def _to_csv_lines(rows) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
+def _rows_frame(rows: List[List[str]], columns: List[str]) -> pd.DataFrame:
+    """빈 칸은 None (pd.read_csv 가 NaN 으로 읽는 것과 같게 → 임베딩 없음/NULL)"""
+    return pd.DataFrame([[v if v != "" else None for v in r] for r in rows], columns=columns)
+
+
+# -----------------------------
+# 3) 격리 CSV
+# -----------------------------
+class Quarantine:
+    """COMMIT 된 배치의 불량 행만 파일에 씀 (COMMIT 전에는 메모리에 모아 둠)"""
+
+    def __init__(self, path: str, columns: List[str], keep_bytes: int):
+        new = not os.path.exists(path) or keep_bytes == 0
+        self.path = path
+        self._f = open(path, "a+b" if not new else "w+b")
+        if not new:
+            self._f.truncate(keep_bytes)  # 마지막 체크포인트 이후에 쓴 부분은 버림 (다시 처리하므로)
+            self._f.seek(keep_bytes)
+        self.width = len(columns)
+        self._pending: List[List[str]] = []
+        self.added = 0  # 이번 실행에서 격리한 행 수 (COMMIT 전 포함)
+        if new:
+            self._pending.append([*columns, "_row", "_error", "_raw"])
+            self.flush()
+
+    def add(self, fields: List[str], row_no: int, error: str) -> None:
+        self._pending.append([*fields, str(row_no), error, ""])
+        self.added += 1
+
+    def add_raw(self, raw: str, row_no: int, error: str) -> None:
+        """컬럼 수가 맞지 않거나 읽을 수 없는 레코드 → 원문 그대로"""
+        self._pending.append([*([""] * self.width), str(row_no), error, raw])
+        self.added += 1
+
+    def discard(self) -> None:
+        self._pending.clear()
+
+    def flush(self) -> int:
+        """모아 둔 행을 쓰고 현재 파일 크기 반환 (체크포인트에 기록)"""
+        if self._pending:
+            self._f.write("".join(_to_csv_lines(self._pending)).encode("utf-8"))
+            self._pending.clear()
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+# -----------------------------
+# 4) 배치 1개 적재 (SAVEPOINT, 실패 시 행 단위로 골라내기)
+# -----------------------------
+def _prepare(batch, columns: List[str], dim: int, quarantine: Quarantine):
+    """(행 번호, 필드) 목록 → [(행 번호, 필드, (title, description, 임베딩))], 변환 실패 행은 격리"""
+    rows = []
+    good = []
+    for row_no, fields in batch:
+        if len(fields) != len(columns):
+            raw = next(_to_csv_lines([fields])).rstrip("\r\n")
+            quarantine.add_raw(raw, row_no, f"컬럼 수 {len(fields)}개 (기대값: {len(columns)})")
+        else:
+            good.append((row_no, fields))
+    if not good:
+        return rows
+    try:
+        values = list(iter_design_rows(_rows_frame([f for _, f in good], columns), dim))
+        return [(row_no, fields, v) for (row_no, fields), v in zip(good, values)]
+    except ValueError:
+        pass
+    # 배치 전체 변환이 실패하면 (예: 임베딩 길이가 다른 행) 행 단위로 다시 변환해서 골라냄
+    for row_no, fields in good:
+        try:
+            value = next(iter_design_rows(_rows_frame([fields], columns), dim))
+            rows.append((row_no, fields, value))
+        except ValueError as e:
+            quarantine.add(fields, row_no, f"ValueError: {e}")
+    return rows
+
+
+def load_batch(cur, rows, load_method: str, table: str, quarantine: Quarantine) -> int:
+    """배치를 SAVEPOINT 안에서 적재, 실패하면 SAVEPOINT 로 되돌리고 행마다 SAVEPOINT 로 다시 시도"""
+    if not rows:
+        return 0
+    cur.execute("SAVEPOINT import_batch;")
+    try:
+        loaded = LOADERS[load_method](cur, (v for _, _, v in rows), table)
+        cur.execute("RELEASE SAVEPOINT import_batch;")
+        return loaded
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT import_batch;")
+
+    loaded = 0
+    for row_no, fields, value in rows:
+        cur.execute("SAVEPOINT import_row;")
+        try:
+            loaded += load_rows_insert(cur, [value], table)
+            cur.execute("RELEASE SAVEPOINT import_row;")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT import_row;")
+            quarantine.add(fields, row_no, f"{type(e).__name__}: {e}".strip())
+    cur.execute("RELEASE SAVEPOINT import_batch;")
+    return loaded
+
+
+# -----------------------------
+# 5) 메인 로직
+# -----------------------------
+def import_csv_resumable(
+    csv_path: str,
+    load_method: str = LOAD_METHOD,
+    batch_rows: int = IMPORT_BATCH_ROWS,
+    commit_batches: int = IMPORT_COMMIT_BATCHES,
+    state_path: str = IMPORT_STATE_PATH,
+    quarantine_path: str = IMPORT_QUARANTINE_PATH,
+    restart: bool = IMPORT_RESTART,
+    table: str = "design",
+) -> Dict:
+    """반환: 마지막 체크포인트 (rows_loaded, rows_rejected, last_row, offset, done ...)"""
+    if load_method not in LOADERS:
+        raise ValueError(f"load_method는 {LOAD_METHODS} 중 하나여야 합니다: {load_method!r}")
+    batch_rows = max(1, batch_rows)
+    commit_batches = max(1, commit_batches)
+    state_path = state_path or f"{csv_path}.import-state.json"
+    quarantine_path = quarantine_path or f"{csv_path}.rejected.csv"
+
+    # 5-1) 체크포인트 확인 (같은 파일/테이블일 때만 이어서)
+    signature = file_signature(csv_path)
+    state = None if restart else load_state(state_path)
+    if state is not None:
+        if {k: state.get(k) for k in signature} != signature or state.get("table") != table:
+            raise RuntimeError(f"{state_path} 는 다른 CSV/테이블의 체크포인트입니다. "
+                               f"처음부터 하려면 IMPORT_RESTART=1 (또는 상태 파일 삭제)")
+        if state["done"]:
+            print(f"[INFO] 이미 끝난 적재입니다: {state['rows_loaded']}행 적재, {state['rows_rejected']}행 격리")
+            return state
+        print(f"[INFO] 체크포인트에서 이어서 적재: {state['last_row']}번째 행까지 처리됨 "
+              f"({state['rows_loaded']}행 적재, {state['rows_rejected']}행 격리, 위치 {state['offset']}바이트)")
+
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        columns = parse_record(header.lstrip(b"\xef\xbb\xbf"))
+        data_start = f.tell()
+
+    if state is None:
+        dim = detect_embedding_dim(pd.read_csv(csv_path, nrows=DETECT_ROWS)) or DEFAULT_EMBEDDING_DIM
+        state = {
+            "csv_path": os.path.abspath(csv_path), **signature, "table": table, "dim": dim,
+            "offset": data_start, "last_row": 0, "rows_loaded": 0, "rows_rejected": 0,
+            "quarantine_bytes": 0, "done": False,
+        }
+    dim = state["dim"]
+    print(f"[INFO] 임베딩 차원: {dim}, 적재 방식: {load_method}, "
+          f"배치 {batch_rows}행 / {commit_batches}배치마다 COMMIT, 상태 파일: {state_path}")
+
+    quarantine = Quarantine(quarantine_path, columns, state["quarantine_bytes"])
+    conn = connect_db()
+    t0 = time.perf_counter()
+    start_loaded = state["rows_loaded"]
+    try:
+        ensure_table(conn, dim, table)
+        conn.commit()
+
+        pending = dict(state)  # 아직 COMMIT 안 된 진행 상황
+
+        def run_batch(cur, batch) -> None:
+            before = quarantine.added
+            rows = _prepare(batch, columns, dim, quarantine)
+            pending["rows_loaded"] += load_batch(cur, rows, load_method, table, quarantine)
+            pending["rows_rejected"] += quarantine.added - before
+
+        def checkpoint() -> None:
+            nonlocal state
+            conn.commit()
+            pending["quarantine_bytes"] = quarantine.flush()
+            state = dict(pending)
+            save_state(state_path, state)
+
+        with open(csv_path, "rb") as f, conn.cursor() as cur:
+            batch, batch_size, batches = [], 0, 0
+            row_no = state["last_row"]
+            for record, end in iter_records(f, state["offset"]):
+                row_no += 1
+                batch_size += 1
+                try:
+                    batch.append((row_no, parse_record(record)))
+                except (UnicodeDecodeError, csv.Error) as e:
+                    quarantine.add_raw(record.decode("utf-8", "replace"), row_no, f"{type(e).__name__}: {e}")
+                    pending["rows_rejected"] += 1
+                pending["offset"], pending["last_row"] = end, row_no
+                if batch_size < batch_rows:
+                    continue
+
+                run_batch(cur, batch)
+                batch, batch_size = [], 0
+                batches += 1
+                if batches % commit_batches == 0:
+                    checkpoint()
+                    print(f"[INFO] 체크포인트: {row_no}번째 행까지 ({pending['rows_loaded']}행 적재, "
+                          f"{pending['rows_rejected']}행 격리)")
+            run_batch(cur, batch)
+            pending["done"] = True
+            checkpoint()
+
+    except Exception as e:
+        # 마지막 체크포인트 이후 분량만 ROLLBACK (다음 실행에서 그 위치부터 다시)
+        conn.rollback()
+        quarantine.discard()
+        print(f"[ERROR] 예외 발생, 마지막 체크포인트({state['last_row']}번째 행) 이후만 ROLLBACK:", e)
+        raise
+
+    finally:
+        conn.close()
+        quarantine.close()
+
+    elapsed = time.perf_counter() - t0
+    loaded = state["rows_loaded"] - start_loaded
+    print(f"[SUCCESS] 적재 완료: 이번 실행 {loaded}행 ({loaded / elapsed:.0f} rows/s), "
+          f"누적 {state['rows_loaded']}행 적재 / {state['rows_rejected']}행 격리 → {quarantine_path}")
+    return state
+
+
+# -----------------------------
+# 6) 실행부
+# -----------------------------
+if __name__ == "__main__":
+    import_csv_resumable(CSV_PATH)
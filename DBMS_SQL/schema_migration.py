@@ -0,0 +1,301 @@
+"""
+design 테이블 무중단 마이그레이션 + 백그라운드 인덱스 생성 (Fast_API.py 시작 시 사용)
+
+INIT_RESET=1 처럼 테이블을 지우지 않고, 지금 테이블 상태를 보고 필요한 것만 고칩니다.
+- 테이블이 없으면 생성, 빠진 컬럼(title/description/content_hash/embedding)은 추가
+- embedding 컬럼 타입 변경 (한 트랜잭션, 실패 시 아무것도 바뀌지 않음)
+  ALTER COLUMN ... TYPE 은 ACCESS EXCLUSIVE 잠금을 잡은 채 테이블 전체를 다시 쓰므로(그동안 읽기/쓰기 모두 멈춤)
+  명시적으로 요청했을 때만 실행: 점검 시간에 python schema_migration.py [차원] 또는 MIGRATE_EMBEDDING_TYPE=1
+  그 외에는 타입 변경만 거부하고 SchemaMigrationError (컬럼 추가 등 나머지 변경은 적용)
+  목표 타입은 EMBEDDING_STORAGE 에 따라 vector(dim) 또는 halfvec(dim) (embedding_storage.py)
+    vector(N)/halfvec(N) → 목표 타입 : 값이 들어 있는 행이 모두 dim 차원이거나 값이 없을 때만
+                                      (vector ↔ halfvec 는 차원이 같으면 값 변환, float16 로 반올림)
+    real[] / float8[] / text 등 → 목표 타입 : 모든 값이 dim 차원으로 변환될 때만
+  변환할 수 없으면 SchemaMigrationError (데이터는 그대로)
+- 벡터 인덱스는 EMBEDDING_BQ_INDEX 에 따라 HNSW(원래 벡터) 또는 이진 양자화 HNSW 중 하나만 유지
+  (다른 쪽 인덱스가 남아 있으면 삭제)
+- 인덱스는 IndexBuilder 가 별도 스레드에서 CREATE INDEX CONCURRENTLY 로 생성
+  → 만드는 동안에도 INSERT/검색이 막히지 않음
+  → 이전 실행에서 중단되어 INVALID 로 남은 인덱스는 지우고 다시 생성
+  → 요청 처리 전에 꼭 있어야 하는 인덱스(중복 방지용 content_hash 유니크 인덱스)는 build_now 로 먼저 생성
+
+환경변수:
+  MIGRATE_LOCK_TIMEOUT_MS=5000  -> 마이그레이션 DDL 이 테이블 잠금을 기다리는 최대 시간
+  MIGRATE_EMBEDDING_TYPE=0      -> 1이면 서버 시작 시에도 embedding 타입 변경(테이블 전체 재작성)을 실행
+                                   (기본값: 0 → 거부하고 로그만, 변경은 python schema_migration.py 로)
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import psycopg
+
+from embedding_storage import EMBEDDING_BQ_INDEX, EMBEDDING_STORAGE, bq_expression, column_type, cosine_ops
+
+MIGRATE_LOCK_TIMEOUT_MS = int(os.getenv("MIGRATE_LOCK_TIMEOUT_MS", "5000"))
+MIGRATE_EMBEDDING_TYPE = os.getenv("MIGRATE_EMBEDDING_TYPE", "0") == "1"
+
+TABLE = "design"
+EMBEDDING_INDEX = "design_embedding_hnsw"
+EMBEDDING_BQ_INDEX_NAME = "design_embedding_bq_hnsw"
+CONTENT_HASH_INDEX = "design_content_hash_key"
+
+_VECTOR_TYPE = re.compile(r"^(vector|halfvec)(\(\d+\))?$")
+
+
+class SchemaMigrationError(Exception):
+    pass
+
+
+def embedding_index(dim: int, m: int, ef_construction: int,
+                    storage: str = EMBEDDING_STORAGE, bq: bool = EMBEDDING_BQ_INDEX) -> Tuple[str, str]:
+    """(이름, 정의) — 원래 벡터 HNSW 또는 이진 양자화 식 HNSW"""
+    options = f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+    if bq:
+        return EMBEDDING_BQ_INDEX_NAME, f"USING hnsw ({bq_expression(dim)} bit_hamming_ops) {options}"
+    return EMBEDDING_INDEX, f"USING hnsw (embedding {cosine_ops(storage)}) {options}"
+
+
+def design_indexes(dim: int, m: int, ef_construction: int, dedup: bool = True) -> List[Tuple[str, str, bool]]:
+    """(인덱스 이름, ON design 뒤에 붙는 정의, UNIQUE 여부) 목록 (dedup=False 면 content_hash 유니크 인덱스 제외)"""
+    indexes = [
+        (*embedding_index(dim, m, ef_construction), False),
+        ("design_title_idx", "(title)", False),
+    ]
+    if dedup:
+        # 중복 등록 방지: content_hash 가 NULL 인 기존 행끼리는 충돌하지 않음
+        indexes.insert(0, (CONTENT_HASH_INDEX, "(content_hash)", True))
+    return indexes
+
+
+# -----------------------------
+# 1) 테이블 점검 / 마이그레이션
+# -----------------------------
+def inspect_design_table(conn) -> Optional[Dict[str, str]]:
+    """{컬럼명: 타입(format_type)} (테이블이 없으면 None)"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL;", (TABLE,))
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute(
+            """
+            SELECT attname, format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum;
+            """,
+            (TABLE,),
+        )
+        return dict(cur.fetchall())
+
+def _alter_embedding_type(cur, current: str, target: str, dim: int) -> None:
+    """embedding 컬럼 타입 변경 (ACCESS EXCLUSIVE 잠금 + 테이블 전체 재작성, migrate_design_table 트랜잭션 안에서)"""
+    if _VECTOR_TYPE.match(current):
+        # 차원만 다른 경우: 다른 차원 값이 하나라도 있으면 변환 불가 (다시 임베딩해야 함)
+        cur.execute(
+            f"SELECT count(*) FROM {TABLE} WHERE embedding IS NOT NULL AND vector_dims(embedding) <> %s;",
+            (dim,),
+        )
+        bad = cur.fetchone()[0]
+        if bad:
+            raise SchemaMigrationError(
+                f"embedding 컬럼이 {current} 이고 {bad}개 행의 차원이 {dim} 과 달라 "
+                f"{target.lower()} 로 바꿀 수 없습니다. (데이터는 변경하지 않음)"
+            )
+
+    # 컬럼 타입이 바뀌면 기존 벡터 인덱스는 잠금 안에서 재생성되므로,
+    # 먼저 지우고 IndexBuilder 가 CONCURRENTLY 로 다시 만들게 함
+    cur.execute(f"DROP INDEX IF EXISTS {EMBEDDING_INDEX};")
+    cur.execute(f"DROP INDEX IF EXISTS {EMBEDDING_BQ_INDEX_NAME};")
+    try:
+        cur.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN embedding TYPE {target} USING embedding::{target.lower()};"
+        )
+    except psycopg.Error as e:
+        raise SchemaMigrationError(
+            f"embedding 컬럼({current}) → {target.lower()} 변환 실패: {type(e).__name__}: {e}"
+        ) from e
+
+def migrate_design_table(conn, dim: int, rewrite: bool = MIGRATE_EMBEDDING_TYPE) -> List[str]:
+    """
+    design 테이블을 embedding VECTOR(dim)/HALFVEC(dim) 스키마로 맞춤 (기존 행은 보존)
+    - 반환: 실행한 변경 내용 (로그용, 바꿀 것이 없으면 빈 목록)
+    - rewrite=False 인데 embedding 타입이 다르면 나머지 변경만 COMMIT 하고 SchemaMigrationError
+    """
+    dim = int(dim)
+    target = column_type(dim)
+    actions: List[str] = []
+    refused: Optional[str] = None
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute(f"SET LOCAL lock_timeout = {int(MIGRATE_LOCK_TIMEOUT_MS)};")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+
+        columns = inspect_design_table(conn)
+        if columns is None:
+            cur.execute(f"""
+            CREATE TABLE {TABLE} (
+                id          BIGSERIAL PRIMARY KEY,
+                title       TEXT,
+                description TEXT,
+                content_hash BYTEA,
+                embedding   {target}
+            );
+            """)
+            return [f"create table {TABLE} (embedding {target.lower()})"]
+
+        for name, col_type in (("title", "TEXT"), ("description", "TEXT"), ("content_hash", "BYTEA")):
+            if name not in columns:
+                cur.execute(f"ALTER TABLE {TABLE} ADD COLUMN {name} {col_type};")
+                actions.append(f"add column {name} {col_type.lower()}")
+
+        # 쓰지 않는 쪽 벡터 인덱스 정리 (EMBEDDING_BQ_INDEX 를 바꾼 경우)
+        unused = EMBEDDING_INDEX if EMBEDDING_BQ_INDEX else EMBEDDING_BQ_INDEX_NAME
+        if cur.execute("SELECT to_regclass(%s) IS NOT NULL;", (unused,)).fetchone()[0]:
+            cur.execute(f"DROP INDEX {unused};")
+            actions.append(f"drop index {unused}")
+
+        current = columns.get("embedding")
+        if current is None:
+            cur.execute(f"ALTER TABLE {TABLE} ADD COLUMN embedding {target};")
+            actions.append(f"add column embedding {target.lower()}")
+            return actions
+        if current == target.lower():
+            return actions
+        if not rewrite:
+            # 테이블 전체 재작성(ACCESS EXCLUSIVE) → 인덱스도 건드리지 않고, 나머지 변경만 COMMIT 한 뒤 거부
+            refused = f"{current} -> {target.lower()}"
+        else:
+            _alter_embedding_type(cur, current, target, dim)
+            actions.append(f"alter column embedding {current} -> {target.lower()}")
+    if refused is not None:
+        raise SchemaMigrationError(
+            f"embedding 컬럼 타입 변경({refused})은 테이블 전체를 잠그고 다시 쓰므로 시작 시 실행하지 않습니다. "
+            f"점검 시간에 python schema_migration.py {dim} 를 실행하거나 MIGRATE_EMBEDDING_TYPE=1 로 시작하세요."
+            + (f" (적용된 변경: {', '.join(actions)})" if actions else "")
+        )
+    return actions
+
+
+# -----------------------------
+# 2) 백그라운드 인덱스 생성
+# -----------------------------
+class IndexBuilder:
+    """
+    별도 스레드 + autocommit 전용 연결로 CREATE INDEX CONCURRENTLY 를 순서대로 실행
+    - status: {인덱스 이름: pending / building / ready / failed: ...}
+    - build_now(name): start() 전에 인덱스 1개를 호출한 스레드에서 바로 생성 (스레드는 이미 끝난 것을 건너뜀)
+    - stop(): 진행 중인 생성을 취소 (남은 INVALID 인덱스는 다음 시작 때 정리)
+    """
+
+    def __init__(self, conninfo: str, indexes: List[Tuple[str, str, bool]]):
+        self.conninfo = conninfo
+        self.indexes = list(indexes)
+        self.status: Dict[str, str] = {name: "pending" for name, _, _ in self.indexes}
+        self._stop = threading.Event()
+        self._conn: Optional[psycopg.Connection] = None
+        self._thread = threading.Thread(target=self._run, name="index-builder", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        conn = self._conn
+        if conn is not None and not conn.closed:
+            conn.cancel_safe()
+        self._thread.join(timeout=timeout)
+
+    def is_ready(self, name: str) -> bool:
+        return self.status.get(name) == "ready"
+
+    def failed(self) -> Dict[str, str]:
+        """{인덱스 이름: 실패 이유} (실패한 인덱스만)"""
+        return {name: state for name, state in self.status.items() if state.startswith("failed")}
+
+    def build_now(self, name: str) -> bool:
+        """인덱스 1개를 지금 스레드에서 생성 (start 전에 호출), 성공 여부 반환"""
+        for index_name, definition, unique in self.indexes:
+            if index_name != name:
+                continue
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    self._build(conn, name, definition, unique)
+            except psycopg.Error as e:
+                self._fail(name, f"{type(e).__name__}: {e}", unique)
+        return self.is_ready(name)
+
+    def _fail(self, name: str, reason: str, unique: bool) -> None:
+        self.status[name] = f"failed: {reason}"
+        print(f"[INDEX] [ERROR] {name} 생성 실패: {reason}")
+        if unique:
+            print(f"[INDEX] [ERROR] {name} 은 UNIQUE 인덱스입니다. 중복 행이 있으면 만들 수 없으니 정리 후 재시작하세요.")
+
+    def _run(self):
+        try:
+            with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                self._conn = conn
+                if conn.execute("SELECT to_regclass(%s) IS NULL;", (TABLE,)).fetchone()[0]:
+                    for name, state in self.status.items():
+                        if state == "pending":
+                            self.status[name] = f"failed: table {TABLE} does not exist"
+                    return
+                for name, definition, unique in self.indexes:
+                    if self._stop.is_set():
+                        break
+                    if self.status[name] == "pending":  # build_now 로 이미 처리한 인덱스는 건너뜀
+                        self._build(conn, name, definition, unique)
+        except Exception as e:
+            for name, state in self.status.items():
+                if state in ("pending", "building"):
+                    self.status[name] = f"failed: {type(e).__name__}: {e}"
+            print(f"[INDEX] 인덱스 생성 중단: {type(e).__name__}: {e}")
+        finally:
+            self._conn = None
+
+    def _build(self, conn, name: str, definition: str, unique: bool):
+        row = conn.execute(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s);", (name,)
+        ).fetchone()
+        if row is not None and row[0]:
+            self.status[name] = "ready"
+            return
+        if row is not None:
+            # 이전 CONCURRENTLY 생성이 중간에 끊겨 INVALID 로 남은 인덱스
+            conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+
+        self.status[name] = "building"
+        t0 = time.perf_counter()
+        try:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            conn.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {TABLE} {definition};")
+        except psycopg.Error as e:
+            self._fail(name, f"{type(e).__name__}: {e}", unique)
+            return
+        self.status[name] = "ready"
+        print(f"[INDEX] {name} 생성 완료 ({time.perf_counter() - t0:.1f}초, CONCURRENTLY)")
+
+
+# -----------------------------
+# 3) 실행부: embedding 타입 변경 (점검 시간에 수동 실행)
+# -----------------------------
+if __name__ == "__main__":
+    # python schema_migration.py [차원, 기본 384]
+    # 연결: PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD (Fast_API.py 와 같은 .env)
+    # 끝나면 서버를 다시 시작 → 지운 벡터 인덱스는 IndexBuilder 가 CONCURRENTLY 로 다시 생성
+    import sys
+
+    from dotenv import load_dotenv
+
+    from embedding_storage import check_support
+
+    load_dotenv()
+    target_dim = int(sys.argv[1]) if len(sys.argv) > 1 else 384
+    with psycopg.connect(autocommit=True) as conn:
+        check_support(conn)
+        t0 = time.perf_counter()
+        for action in migrate_design_table(conn, target_dim, rewrite=True) or ["변경 없음"]:
+            print(f"[MIGRATE] - {action}")
+        print(f"[MIGRATE] 완료 ({time.perf_counter() - t0:.1f}초)")
@@ -0,0 +1,109 @@
+"""
+벡터 전송 방식 벤치마크: 텍스트('[...]'::vector) vs pgvector 바이너리(float32 그대로)
+
+- INSERT(executemany) 와 COPY 각각에 대해 두 방식을 비교합니다.
+- 처리량(rows/sec) 과 클라이언트 CPU 시간/행(process_time 기준)을 출력합니다.
+- 측정용 테이블(design_vector_bench)을 따로 만들고, 끝나면 삭제합니다.
+
+실행:
+  python vector_adapter_benchmark.py
+환경변수(.env):
+  PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
+  BENCH_ROWS=5000   -> 방식별 적재 행 수
+  BENCH_DIM=1536    -> 벡터 차원
+"""
+
+import os
+import time
+
+import numpy as np
+import psycopg
+
+from Fast_API import conninfo
+from pgvector_adapter import register_vector_binary, to_sql_vector
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "5000"))
+BENCH_DIM = int(os.getenv("BENCH_DIM", "1536"))
+
+BENCH_TABLE = "design_vector_bench"
+
+
+# -----------------------------
+# 1) 방식별 적재 함수 (모두 1 트랜잭션)
+# -----------------------------
+def insert_text(conn, titles, matrix):
+    with conn.cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {BENCH_TABLE} (title, embedding) VALUES (%s, %s::vector)",
+            [(t, to_sql_vector(v)) for t, v in zip(titles, matrix)],
+        )
+
+def insert_binary(conn, titles, matrix):
+    with conn.cursor() as cur:
+        register_vector_binary(cur)
+        cur.executemany(
+            f"INSERT INTO {BENCH_TABLE} (title, embedding) VALUES (%s, %s)",
+            list(zip(titles, matrix)),
+        )
+
+def copy_text(conn, titles, matrix):
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {BENCH_TABLE} (title, embedding) FROM STDIN") as copy:
+            for t, v in zip(titles, matrix):
+                copy.write_row((t, to_sql_vector(v)))
+
+def copy_binary(conn, titles, matrix):
+    with conn.cursor() as cur:
+        register_vector_binary(cur)
+        with cur.copy(f"COPY {BENCH_TABLE} (title, embedding) FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types(["text", "vector"])
+            for t, v in zip(titles, matrix):
+                copy.write_row((t, v))
+
+
+# -----------------------------
+# 2) 측정 / 출력
+# -----------------------------
+def measure(conn, fn, titles, matrix) -> dict:
+    conn.execute(f"TRUNCATE {BENCH_TABLE};")
+    conn.commit()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    fn(conn, titles, matrix)
+    conn.commit()
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    return {"rps": len(titles) / wall, "cpu_us": cpu / len(titles) * 1e6, "wall": wall}
+
+def print_result(title: str, r: dict):
+    print(f"  {title:<22} {r['rps']:>10.0f} rows/s   CPU {r['cpu_us']:>8.1f} us/row   ({r['wall']:.2f} sec)")
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(-1, 1, size=(BENCH_ROWS, BENCH_DIM)).astype(np.float32)
+    titles = [f"bench-{i}" for i in range(BENCH_ROWS)]
+
+    with psycopg.connect(conninfo(), autocommit=False) as conn:
+        conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.execute(f"CREATE TABLE {BENCH_TABLE} (id BIGSERIAL PRIMARY KEY, title TEXT, embedding VECTOR({BENCH_DIM}));")
+        conn.commit()
+
+        try:
+            print("=" * 70)
+            print(f"{BENCH_ROWS}행 x {BENCH_DIM}차원 적재")
+            for group, text_fn, bin_fn in (
+                ("INSERT (executemany)", insert_text, insert_binary),
+                ("COPY", copy_text, copy_binary),
+            ):
+                text_r = measure(conn, text_fn, titles, matrix)
+                bin_r = measure(conn, bin_fn, titles, matrix)
+                print("-" * 70)
+                print(group)
+                print_result("텍스트 '[...]'::vector", text_r)
+                print_result("바이너리 float32", bin_r)
+                print(f"  → 처리량 {bin_r['rps'] / text_r['rps']:.2f}배, "
+                      f"CPU/행 {text_r['cpu_us'] / bin_r['cpu_us']:.2f}배 감소")
+        finally:
+            conn.rollback()
+            conn.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+            conn.commit()
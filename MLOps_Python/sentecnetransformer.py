@@ -23,11 +23,23 @@
 #   - PostgreSQL 데이터베이스에 벡터를 저장하고 유사도 검색
 #   - pgvector 확장을 사용하여 벡터 데이터를 저장
 #   - 리뷰 데이터는 한국어로 작성된 예시 리뷰들 
+#   - 벡터는 DBMS_SQL/pgvector_adapter.py 를 통해 pgvector 바이너리 포맷으로 전송
+#     (바이너리 파라미터 전송을 위해 psycopg2 → psycopg(3) 사용)
+# 필요 패키지:
+#   - psycopg[binary], numpy, python-dotenv 등은 DBMS_SQL 과 공유 → pip install -r ../DBMS_SQL/requirements.txt
+#   - 추가로 sentence-transformers (pgvector 파이썬 패키지는 필요 없음, 어댑터가 DBMS_SQL 에 있음)
 # ------------------------------------------------------------
 
+import sys
+from pathlib import Path
+
 from sentence_transformers import SentenceTransformer
-import psycopg2
-from psycopg2.extras import execute_values
+import psycopg
+
+# DBMS_SQL 폴더의 공용 pgvector 어댑터 / 디스크 임베딩 캐시 사용 (Fast_API.py, DBMS_SQL.py 와 동일한 모듈)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "DBMS_SQL"))
+from pgvector_adapter import register_vector_binary  # noqa: E402
+from embedding_store import open_default_store  # noqa: E402
 
 # ===================== 설정 ===================== #
 # ▶ 본인 환경에 맞게 DB 연결 정보 수정
@@ -55,9 +67,18 @@ REVIEWS = [
 QUERY_TEXT = "배송이 느렸어요"
 
 # ===================== 유틸 ===================== #
-def vec_to_pgvector_str(vec) -> str:
-    """파이썬 list[float] → pgvector 텍스트 표현('[1,2,...]')"""
-    return "[" + ",".join(str(float(x)) for x in vec) + "]"
+def encode_cached(model, texts):
+    """
+    EMBEDDING_STORE_PATH 가 설정되어 있으면 디스크 캐시를 먼저 찾고, 없는 문장만 encode
+    (같은 문장이 여러 번 나와도 한 번만 계산). 정규화 여부가 다르면 벡터가 다르므로 키에 포함.
+    """
+    store = open_default_store()
+    if store is None:
+        return model.encode(texts, normalize_embeddings=True)
+    return store.get_or_compute(
+        f"{MODEL_NAME}:normalized", texts, EMBED_DIM,
+        lambda missing: model.encode(missing, normalize_embeddings=True),
+    )
 
 # ===================== 메인 로직 ===================== #
 def main():
@@ -66,12 +87,12 @@ def main():
     model = SentenceTransformer(MODEL_NAME)
 
     print("[INFO] Encoding sentences (L2 normalize for cosine search)...")
-    embeddings = model.encode(REVIEWS, normalize_embeddings=True)
+    embeddings = encode_cached(model, REVIEWS)
     assert embeddings.shape[1] == EMBED_DIM, f"임베딩 차원({embeddings.shape[1]})이 {EMBED_DIM}와 다릅니다."
 
     # 2) DB 접속
     print("[INFO] Connecting to PostgreSQL ...")
-    with psycopg2.connect(DSN) as conn, conn.cursor() as cur:#cur: 커서 생성 -> cursor는 SQL문을 실행하고 결과를 가져오는 객체
+    with psycopg.connect(DSN) as conn, conn.cursor() as cur:#cur: 커서 생성 -> cursor는 SQL문을 실행하고 결과를 가져오는 객체
         # 세션 스키마 고정(혼동 방지)
         cur.execute("SET search_path TO public;")
 
@@ -92,10 +113,9 @@ def main():
             CREATE TABLE IF NOT EXISTS public.review_vectors (
                 id SERIAL PRIMARY KEY,
                 review TEXT,
-                embedding VECTOR(%s)
+                embedding VECTOR({EMBED_DIM})
             );
-            """,
-            (EMBED_DIM,),
+            """.format(EMBED_DIM=int(EMBED_DIM))  # DDL은 서버측 파라미터 바인딩이 안 되므로 정수 상수를 직접 삽입
         )
 
         # 2-3) HNSW 인덱스 생성 (pgvector 0.5+) : HNSW(Hierarchical Navigable Small World) 알고리즘
@@ -118,19 +138,18 @@ def main():
         )
         conn.commit()
 
+        # 2-4) numpy 벡터를 pgvector 바이너리로 보내도록 어댑터 등록 (문자열 변환 없음)
+        register_vector_binary(cur)
+        conn.commit()
+
         # 3) 데이터 INSERT (기존 데이터 초기화 원하면 주석 해제)
         # cur.execute("TRUNCATE TABLE public.review_vectors;")
 
         print("[INFO] Inserting rows ...") 
-        rows = []
-        for text, emb in zip(REVIEWS, embeddings):
-            rows.append((text, vec_to_pgvector_str(emb)))
-
-        execute_values(
-            cur,
-            "INSERT INTO public.review_vectors (review, embedding) VALUES %s",
-            rows,
-            template="(%s, %s)",
+        # model.encode 결과(float32 numpy 행)를 그대로 파라미터로 전달
+        cur.executemany(
+            "INSERT INTO public.review_vectors (review, embedding) VALUES (%s, %s)",
+            list(zip(REVIEWS, embeddings)),
         )
         conn.commit()
 
@@ -141,8 +160,7 @@ def main():
 
         # 4) 유사도 검색
         print(f'[INFO] Searching similar to: "{QUERY_TEXT}"')
-        q_vec = model.encode([QUERY_TEXT], normalize_embeddings=True)[0]
-        q_vec_str = vec_to_pgvector_str(q_vec)
+        q_vec = encode_cached(model, [QUERY_TEXT])[0]
 
         # HNSW 탐색 파라미터(선택)
         cur.execute("SET hnsw.ef_search = 40;")
@@ -153,7 +171,7 @@ def main():
         ORDER BY embedding <=> %s
         LIMIT %s;
         """
-        cur.execute(sql, (q_vec_str, q_vec_str, K))
+        cur.execute(sql, (q_vec, q_vec, K))
         rows = cur.fetchall()
 
         print("\n[RESULT]")